@@ -16,7 +16,7 @@ import sys
 import uvicorn
 import pipmaster as pm
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from pathlib import Path
 import configparser
 from ascii_colors import ASCIIColors
@@ -54,6 +54,7 @@ from lightrag.api.routers.graph_routes import create_graph_routes
 from lightrag.api.routers.ollama_api import OllamaAPI
 
 from lightrag.utils import logger, set_verbose_debug
+from lightrag.metrics import pipeline_metrics
 from lightrag.kg.shared_storage import (
     get_namespace_data,
     get_default_workspace,
@@ -1194,6 +1195,19 @@ def create_app(args):
             "webui_description": webui_description,
         }
 
+    @app.get(
+        "/metrics",
+        dependencies=[Depends(combined_auth)],
+        response_class=PlainTextResponse,
+        summary="Ingestion pipeline metrics in Prometheus text format",
+        description="Per-stage latency histograms, item and error counters, and LLM cache hit/miss counters of the worker serving the request",
+    )
+    async def get_metrics():
+        return PlainTextResponse(
+            pipeline_metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
     @app.get(
         "/health",
         dependencies=[Depends(combined_auth)],
@@ -1291,6 +1305,7 @@ def create_app(args):
                 "auth_mode": auth_mode,
                 "pipeline_busy": pipeline_status.get("busy", False),
                 "keyed_locks": keyed_lock_info,
+                "concurrency": rag.get_concurrency_status(),
                 "core_version": core_version,
                 "api_version": api_version_display,
                 "webui_title": webui_title,
@@ -105,6 +105,11 @@ class QueryRequest(BaseModel):
         description="If True, includes actual chunk text content in references. Only applies when include_references=True. Useful for evaluation and debugging.",
     )
 
+    trace: Optional[bool] = Field(
+        default=None,
+        description="If True, returns per-stage timings and storage round-trip counts as OpenTelemetry-style spans in metadata.trace.",
+    )
+
     stream: Optional[bool] = Field(
         default=True,
         description="If True, enables streaming output for real-time responses. Only affects /query/stream endpoint.",
@@ -859,6 +864,11 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
                                                 },
                                             },
                                         },
+                                        "stage_timings_ms": {
+                                            "type": "object",
+                                            "description": "Wall-clock time of each retrieval stage in milliseconds (local_search, global_search, vector_search and query_embedding run concurrently within kg_search)",
+                                            "additionalProperties": {"type": "number"},
+                                        },
                                     },
                                     "description": "Query metadata including mode, keywords, and processing information",
                                 },
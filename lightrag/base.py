@@ -5,6 +5,7 @@ from enum import Enum
 import os
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
+import numpy as np
 from typing import (
     Any,
     Literal,
@@ -168,6 +169,11 @@ class QueryParam:
     containing citation information for the retrieved content.
     """
 
+    trace: bool = False
+    """If True, records wall time and storage round trips of every query stage as
+    OpenTelemetry-style spans, returned in raw_data["metadata"]["trace"].
+    """
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -351,6 +357,27 @@ class BaseVectorStorage(StorageNameSpace, ABC):
         """
         pass
 
+    async def get_vectors_array_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one float32 matrix for batched scoring
+
+        Backends that keep vectors in numpy form should override this to skip the
+        round trip through Python lists.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            (found_ids, matrix): IDs that have a vector (each once, in backend
+            order) and the matrix whose row i is the vector of found_ids[i]
+        """
+        vectors = await self.get_vectors_by_ids(ids)
+        found_ids = [id for id in dict.fromkeys(ids) if id in vectors]
+        if not found_ids:
+            return [], np.empty((0, self.embedding_func.embedding_dim), np.float32)
+        return found_ids, np.asarray([vectors[id] for id in found_ids], np.float32)
+
 
 @dataclass
 class BaseKVStorage(StorageNameSpace, ABC):
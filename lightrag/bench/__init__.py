@@ -0,0 +1,35 @@
+"""
+LightRAG Benchmark Module
+
+Offline throughput and latency benchmarks: ingestion of a synthetic corpus and queries
+in every mode, driven by deterministic fake LLM and embedding functions with configurable
+artificial latency, against the local storage backends.
+
+Usage:
+    lightrag-bench --docs 50 --llm-latency-ms 200
+
+    from lightrag.bench import BenchmarkConfig, run_benchmark
+
+    report = await run_benchmark(BenchmarkConfig(num_docs=50, llm_latency=0.2))
+"""
+
+from lightrag.bench.corpus import SyntheticCorpus, generate_corpus
+from lightrag.bench.fakes import FakeEmbedding, FakeLLM, WordTokenizer
+from lightrag.bench.runner import (
+    QUERY_MODES,
+    BenchmarkConfig,
+    format_report,
+    run_benchmark,
+)
+
+__all__ = [
+    "QUERY_MODES",
+    "BenchmarkConfig",
+    "FakeEmbedding",
+    "FakeLLM",
+    "SyntheticCorpus",
+    "WordTokenizer",
+    "format_report",
+    "generate_corpus",
+    "run_benchmark",
+]
@@ -0,0 +1,3 @@
+from lightrag.bench.cli import main
+
+main()
@@ -0,0 +1,173 @@
+"""
+Command line entry point of the benchmark harness (`lightrag-bench`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+
+from lightrag.bench.runner import QUERY_MODES, BenchmarkConfig, format_report
+
+LOCAL_VECTOR_STORAGES = [
+    "NanoVectorDBStorage",
+    "NumpyVectorDBStorage",
+    "FaissVectorDBStorage",
+]
+
+
+async def run_all(config: BenchmarkConfig, vector_storages: list[str]) -> list[dict]:
+    """Run the benchmark once per vector storage; unavailable backends are reported as
+    skipped instead of failing the whole run"""
+    from dataclasses import replace
+
+    from lightrag.bench.runner import run_benchmark
+
+    reports = []
+    for vector_storage in vector_storages:
+        run_config = replace(config, vector_storage=vector_storage)
+        if config.working_dir:
+            run_config.working_dir = f"{config.working_dir}/{vector_storage}"
+        try:
+            reports.append(await run_benchmark(run_config))
+        except ImportError as e:
+            reports.append(
+                {"config": {"vector_storage": vector_storage}, "skipped": str(e)}
+            )
+    return reports
+
+
+def main():
+    """Main entry point for the CLI command"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="lightrag-bench",
+        description="Offline ingestion and query benchmark for LightRAG",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Quick run with instantaneous fake providers
+  lightrag-bench
+
+  # 100 documents, 300ms LLM and 50ms embedding latency, JSON report
+  lightrag-bench --docs 100 --llm-latency-ms 300 --embedding-latency-ms 50 --output bench.json
+
+  # Only naive and mix queries against NanoVectorDB
+  lightrag-bench --modes naive mix --vector-storage NanoVectorDBStorage
+        """,
+    )
+    parser.add_argument("--docs", type=int, default=20, help="Documents (default: 20)")
+    parser.add_argument(
+        "--paragraphs", type=int, default=8, help="Paragraphs per document (default: 8)"
+    )
+    parser.add_argument(
+        "--sentences",
+        type=int,
+        default=6,
+        help="Sentences per paragraph (default: 6)",
+    )
+    parser.add_argument(
+        "--entities",
+        type=int,
+        default=200,
+        help="Distinct entity names in the corpus (default: 200)",
+    )
+    parser.add_argument(
+        "--queries", type=int, default=20, help="Queries per mode (default: 20)"
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=QUERY_MODES,
+        default=list(QUERY_MODES),
+        help="Query modes to time (default: all)",
+    )
+    parser.add_argument(
+        "--vector-storage",
+        nargs="+",
+        choices=LOCAL_VECTOR_STORAGES,
+        default=LOCAL_VECTOR_STORAGES,
+        help="Vector storages to benchmark, one run each (default: all local ones)",
+    )
+    parser.add_argument(
+        "--llm-latency-ms",
+        type=float,
+        default=0.0,
+        help="Artificial latency of each LLM call (default: 0)",
+    )
+    parser.add_argument(
+        "--embedding-latency-ms",
+        type=float,
+        default=0.0,
+        help="Artificial latency of each embedding call (default: 0)",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.2,
+        help="Relative spread of the artificial latency (default: 0.2)",
+    )
+    parser.add_argument(
+        "--llm-max-async",
+        type=int,
+        default=None,
+        help="Override llm_model_max_async (default: MAX_ASYNC or 4)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument(
+        "--working-dir",
+        default=None,
+        help="Keep storage files here instead of a temporary directory",
+    )
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+
+    args = parser.parse_args()
+    if args.docs < 1 or args.queries < 1:
+        parser.error("--docs and --queries must be at least 1")
+
+    lightrag_kwargs = {}
+    if args.llm_max_async is not None:
+        lightrag_kwargs["llm_model_max_async"] = args.llm_max_async
+    config = BenchmarkConfig(
+        num_docs=args.docs,
+        paragraphs_per_doc=args.paragraphs,
+        sentences_per_paragraph=args.sentences,
+        num_entities=args.entities,
+        num_queries=args.queries,
+        modes=tuple(args.modes),
+        llm_latency=args.llm_latency_ms / 1000,
+        embedding_latency=args.embedding_latency_ms / 1000,
+        latency_jitter=args.jitter,
+        seed=args.seed,
+        working_dir=args.working_dir,
+        lightrag_kwargs=lightrag_kwargs,
+    )
+
+    try:
+        reports = asyncio.run(run_all(config, args.vector_storage))
+    except KeyboardInterrupt:
+        print("\n✗ Benchmark interrupted by user")
+        sys.exit(130)
+
+    for report in reports:
+        print("=" * 70)
+        if "skipped" in report:
+            vector_storage = report["config"]["vector_storage"]
+            print(f"{vector_storage}: skipped ({report['skipped']})")
+        else:
+            print(format_report(report))
+    print("=" * 70)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if all("skipped" in report for report in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Deterministic stand-ins for the LLM, embedding model and tokenizer.
+
+`FakeLLM` answers every prompt LightRAG sends (entity extraction, packed extraction,
+gleaning, description summaries, keyword extraction, answers) from the prompt text alone,
+and both fakes sleep for a configurable latency with jitter to stand in for a provider.
+No network access or model download is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import zlib
+from typing import Any
+
+import numpy as np
+
+from lightrag.prompt import PROMPTS
+
+_ENTITY_TYPES = ["organization", "location", "concept", "artifact"]
+_WORD = re.compile(r"\w+")
+
+
+class _Latency:
+    def __init__(self, seconds: float, jitter: float, seed: int):
+        self.seconds = seconds
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    async def wait(self) -> None:
+        if self.seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        spread = self.seconds * self.jitter
+        await asyncio.sleep(max(0.0, self._rng.uniform(-spread, spread) + self.seconds))
+
+
+class WordTokenizer:
+    """Lossless tokenizer mapping each word (with trailing whitespace) to one id"""
+
+    _PIECE = re.compile(r"\s+|\S+\s*")
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._pieces: list[str] = []
+
+    def encode(self, content: str) -> list[int]:
+        tokens = []
+        for piece in self._PIECE.findall(content):
+            token = self._ids.get(piece)
+            if token is None:
+                token = self._ids[piece] = len(self._pieces)
+                self._pieces.append(piece)
+            tokens.append(token)
+        return tokens
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(self._pieces[t] for t in tokens)
+
+
+class FakeLLM:
+    """Deterministic `llm_model_func` that extracts the corpus vocabulary from text"""
+
+    def __init__(
+        self,
+        entity_names: list[str],
+        latency: float = 0.0,
+        jitter: float = 0.2,
+        seed: int = 0,
+    ):
+        # Longest first so no name matches as a prefix of another
+        self._names = re.compile(
+            "|".join(re.escape(n) for n in sorted(entity_names, key=len, reverse=True))
+        )
+        self._latency = _Latency(latency, jitter, seed)
+        self.tuple_delimiter = PROMPTS["DEFAULT_TUPLE_DELIMITER"]
+        self.completion_delimiter = PROMPTS["DEFAULT_COMPLETION_DELIMITER"]
+        self.calls = 0
+
+    async def __call__(
+        self, prompt: str, system_prompt: str | None = None, history_messages=None, **kw
+    ) -> str:
+        self.calls += 1
+        await self._latency.wait()
+        if "<Input Text id=" in prompt:
+            return self._packed_extraction(prompt)
+        if "<Input Text>" in prompt:
+            text = prompt.split("<Input Text>", 1)[1].split("<Output>", 1)[0]
+            return self._extraction(text) + self.completion_delimiter
+        if "Based on the last extraction task" in prompt:
+            return self.completion_delimiter
+        if "high_level_keywords" in f"{system_prompt or ''}\n{prompt}":
+            return self._keywords(prompt)
+        if "Description List" in prompt:
+            return self._summary(prompt)
+        return self._answer(prompt)
+
+    def _extraction(self, text: str) -> str:
+        d = self.tuple_delimiter
+        lines = []
+        seen: set[str] = set()
+        for sentence in re.split(r"(?<=[.!?])\s+", text):
+            names = list(dict.fromkeys(self._names.findall(sentence)))
+            for name in names:
+                if name not in seen:
+                    seen.add(name)
+                    entity_type = _ENTITY_TYPES[zlib.crc32(name.encode()) % 4]
+                    lines.append(
+                        f"entity{d}{name}{d}{entity_type}{d}{name} is mentioned: "
+                        f"{sentence.strip()}"
+                    )
+            for source, target in zip(names, names[1:]):
+                lines.append(
+                    f"relation{d}{source}{d}{target}{d}related{d}{sentence.strip()}"
+                )
+        return "".join(f"{line}\n" for line in lines)
+
+    def _packed_extraction(self, prompt: str) -> str:
+        sections = re.findall(r'<Input Text id="(\d+)">\n```\n(.*?)\n```', prompt, re.S)
+        return (
+            "".join(
+                f"text{self.tuple_delimiter}{text_id}\n{self._extraction(text)}"
+                for text_id, text in sections
+            )
+            + self.completion_delimiter
+        )
+
+    def _keywords(self, prompt: str) -> str:
+        query = prompt.rsplit("User Query:", 1)[-1].split("---Output---", 1)[0]
+        low_level = (
+            list(dict.fromkeys(self._names.findall(query)))
+            or [w for w in _WORD.findall(query) if len(w) > 5][:3]
+        )
+        return json.dumps(
+            {"high_level_keywords": ["collaboration"], "low_level_keywords": low_level}
+        )
+
+    def _summary(self, prompt: str) -> str:
+        descriptions = re.findall(r'"Description": "((?:[^"\\]|\\.)*)"', prompt)
+        return " ".join(dict.fromkeys(descriptions))[:2000] or "Summary."
+
+    def _answer(self, prompt: str) -> str:
+        mentioned = list(dict.fromkeys(self._names.findall(prompt)))[:5]
+        return "Based on the context: " + (
+            ", ".join(mentioned) if mentioned else "no matching entities."
+        )
+
+
+class FakeEmbedding:
+    """Deterministic `embedding_func` body: unit-length hashed bag of words"""
+
+    def __init__(
+        self, embedding_dim: int = 64, latency: float = 0.0, jitter: float = 0.2, seed=0
+    ):
+        self.embedding_dim = embedding_dim
+        self._latency = _Latency(latency, jitter, seed)
+        self.calls = 0
+
+    async def __call__(self, texts: list[str], **kwargs: Any) -> np.ndarray:
+        self.calls += 1
+        await self._latency.wait()
+        vectors = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        vectors[:, 0] = 1.0
+        for row, text in enumerate(texts):
+            for word in _WORD.findall(text.lower()):
+                column = 1 + zlib.crc32(word.encode()) % (self.embedding_dim - 1)
+                vectors[row, column] += 1.0
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
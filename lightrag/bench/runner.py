@@ -0,0 +1,270 @@
+"""
+Benchmark runner: ingest a synthetic corpus and time queries in every mode.
+
+Each run uses a fresh working directory and the fakes from `lightrag.bench.fakes`, so
+results reflect LightRAG's own pipeline, storage and scheduling overhead plus the
+configured artificial provider latency.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+
+from lightrag.bench.corpus import SyntheticCorpus, generate_corpus
+from lightrag.bench.fakes import FakeEmbedding, FakeLLM, WordTokenizer
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+QUERY_MODES = ("naive", "local", "global", "hybrid", "mix", "bypass")
+
+# Storages flushed by index_done_callback, by LightRAG attribute
+_FLUSHED_STORAGES = (
+    "full_docs",
+    "text_chunks",
+    "full_entities",
+    "full_relations",
+    "entity_chunks",
+    "relation_chunks",
+    "entities_vdb",
+    "relationships_vdb",
+    "chunks_vdb",
+    "chunk_entity_relation_graph",
+    "llm_response_cache",
+    "doc_status",
+)
+
+
+@dataclass
+class BenchmarkConfig:
+    num_docs: int = 20
+    paragraphs_per_doc: int = 8
+    sentences_per_paragraph: int = 6
+    num_entities: int = 200
+    num_queries: int = 20
+    """Queries timed per mode"""
+    modes: tuple[str, ...] = QUERY_MODES
+    llm_latency: float = 0.0
+    """Seconds each fake LLM call sleeps"""
+    embedding_latency: float = 0.0
+    """Seconds each fake embedding call sleeps"""
+    latency_jitter: float = 0.2
+    """Relative spread of the artificial latency"""
+    embedding_dim: int = 64
+    seed: int = 0
+    kv_storage: str = "JsonKVStorage"
+    vector_storage: str = "NanoVectorDBStorage"
+    graph_storage: str = "NetworkXStorage"
+    doc_status_storage: str = "JsonDocStatusStorage"
+    working_dir: str | None = None
+    """Kept after the run when set; a temporary directory otherwise"""
+    lightrag_kwargs: dict[str, Any] = field(default_factory=dict)
+    """Extra LightRAG arguments, e.g. {"llm_model_max_async": 8}"""
+
+
+class _FlushTimer:
+    """Times index_done_callback of each storage of a LightRAG instance"""
+
+    def __init__(self, rag):
+        self.timings: dict[str, list[float]] = {}
+        for attr in _FLUSHED_STORAGES:
+            storage = getattr(rag, attr, None)
+            if storage is not None:
+                self._wrap(attr, storage)
+
+    def _wrap(self, name: str, storage) -> None:
+        flush = storage.index_done_callback
+
+        async def timed_flush():
+            start = time.perf_counter()
+            try:
+                return await flush()
+            finally:
+                self.timings.setdefault(name, []).append(time.perf_counter() - start)
+
+        storage.index_done_callback = timed_flush
+
+    def collect(self) -> dict[str, dict[str, float]]:
+        report = {
+            name: {
+                "calls": len(durations),
+                "total_ms": round(sum(durations) * 1000, 2),
+                "max_ms": round(max(durations) * 1000, 2),
+            }
+            for name, durations in sorted(self.timings.items())
+        }
+        self.timings.clear()
+        return report
+
+
+def _latency_stats(latencies: list[float]) -> dict[str, float]:
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "count": len(latencies),
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+
+            return round(psutil.Process().memory_info().peak_wset / 2**20, 1)
+        except Exception:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+async def run_benchmark(
+    config: BenchmarkConfig, corpus: SyntheticCorpus | None = None
+) -> dict[str, Any]:
+    """Ingest the corpus, time queries in each mode and return the report
+
+    Shared storage data is finalized at the end, so runs must not overlap with other
+    LightRAG instances in the same process.
+    """
+    from lightrag import LightRAG, QueryParam
+    from lightrag.kg.shared_storage import finalize_share_data
+
+    if corpus is None:
+        corpus = generate_corpus(
+            num_docs=config.num_docs,
+            paragraphs_per_doc=config.paragraphs_per_doc,
+            sentences_per_paragraph=config.sentences_per_paragraph,
+            num_entities=config.num_entities,
+            num_queries=config.num_queries,
+            seed=config.seed,
+        )
+    llm = FakeLLM(
+        corpus.entity_names,
+        latency=config.llm_latency,
+        jitter=config.latency_jitter,
+        seed=config.seed,
+    )
+    embedding = FakeEmbedding(
+        config.embedding_dim,
+        latency=config.embedding_latency,
+        jitter=config.latency_jitter,
+        seed=config.seed,
+    )
+
+    temp_dir = None
+    working_dir = config.working_dir
+    if working_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="lightrag-bench-")
+        working_dir = temp_dir.name
+    os.makedirs(working_dir, exist_ok=True)
+
+    rag = None
+    try:
+        rag = LightRAG(
+            working_dir=working_dir,
+            kv_storage=config.kv_storage,
+            vector_storage=config.vector_storage,
+            graph_storage=config.graph_storage,
+            doc_status_storage=config.doc_status_storage,
+            llm_model_func=llm,
+            embedding_func=EmbeddingFunc(
+                embedding_dim=config.embedding_dim, func=embedding
+            ),
+            tokenizer=Tokenizer("bench-word", WordTokenizer()),
+            **config.lightrag_kwargs,
+        )
+        await rag.initialize_storages()
+        flush_timer = _FlushTimer(rag)
+
+        start = time.perf_counter()
+        await rag.ainsert(corpus.documents, ids=corpus.doc_ids)
+        ingest_seconds = time.perf_counter() - start
+        statuses = await rag.doc_status.get_by_ids(corpus.doc_ids)
+        processed = [s for s in statuses if s and s.get("status") == "processed"]
+        chunks = sum(s.get("chunks_count") or 0 for s in processed)
+        ingestion = {
+            "docs": len(corpus.documents),
+            "processed_docs": len(processed),
+            "chunks": chunks,
+            "seconds": round(ingest_seconds, 3),
+            "docs_per_sec": round(len(processed) / ingest_seconds, 3),
+            "chunks_per_sec": round(chunks / ingest_seconds, 3),
+            "llm_calls": llm.calls,
+            "embedding_calls": embedding.calls,
+            "nodes": len(await rag.chunk_entity_relation_graph.get_all_labels()),
+            "flush": flush_timer.collect(),
+        }
+
+        llm_calls, embedding_calls = llm.calls, embedding.calls
+        queries: dict[str, Any] = {}
+        for mode in config.modes:
+            latencies = []
+            for query in corpus.queries:
+                start = time.perf_counter()
+                # No rerank model is configured for the fakes
+                await rag.aquery(query, QueryParam(mode=mode, enable_rerank=False))
+                latencies.append(time.perf_counter() - start)
+            queries[mode] = _latency_stats(latencies)
+        query_report = {
+            "modes": queries,
+            "llm_calls": llm.calls - llm_calls,
+            "embedding_calls": embedding.calls - embedding_calls,
+            "flush": flush_timer.collect(),
+        }
+    finally:
+        if rag is not None:
+            await rag.finalize_storages()
+        finalize_share_data()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    config_report = asdict(config)
+    config_report["lightrag_kwargs"] = {
+        k: repr(v) for k, v in config.lightrag_kwargs.items()
+    }
+    return {
+        "config": config_report,
+        "ingestion": ingestion,
+        "queries": query_report,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Human-readable summary of a run_benchmark report"""
+    config = report["config"]
+    ingestion = report["ingestion"]
+    lines = [
+        f"Backends: {config['kv_storage']} / {config['vector_storage']} / "
+        f"{config['graph_storage']} / {config['doc_status_storage']}",
+        f"Ingestion: {ingestion['processed_docs']}/{ingestion['docs']} docs, "
+        f"{ingestion['chunks']} chunks, {ingestion['nodes']} nodes in "
+        f"{ingestion['seconds']}s -> {ingestion['docs_per_sec']} docs/s, "
+        f"{ingestion['chunks_per_sec']} chunks/s "
+        f"({ingestion['llm_calls']} LLM / {ingestion['embedding_calls']} embedding calls)",
+        "Query latency (ms):",
+        f"  {'mode':<8}{'p50':>10}{'p95':>10}{'p99':>10}{'mean':>10}",
+    ]
+    for mode, stats in report["queries"]["modes"].items():
+        lines.append(
+            f"  {mode:<8}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+            f"{stats['p99_ms']:>10}{stats['mean_ms']:>10}"
+        )
+    lines.append("Flush time during ingestion (ms total / calls):")
+    for name, stats in ingestion["flush"].items():
+        lines.append(f"  {name:<28}{stats['total_ms']:>10} / {stats['calls']}")
+    lines.append(f"Peak RSS: {report['peak_rss_mb']} MiB")
+    return "\n".join(lines)
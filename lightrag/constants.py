@@ -25,6 +25,21 @@ DEFAULT_SUMMARY_LENGTH_RECOMMENDED = 600
 DEFAULT_SUMMARY_CONTEXT_SIZE = 12000
 # Maximum token size allowed for entity extraction input context
 DEFAULT_MAX_EXTRACT_INPUT_TOKENS = 20480
+# Pack small chunks into one extraction call up to this many tokens (0 disables packing)
+DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS = 0
+# Maximum number of chunks packed into one extraction call
+DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS = 8
+
+# In-process cache of complete query results, invalidated by the workspace data version
+DEFAULT_ENABLE_QUERY_RESPONSE_CACHE = False
+DEFAULT_QUERY_RESPONSE_CACHE_MAX_ENTRIES = 1000
+# Queries kept by the in-process semantic query cache (embedding_cache_config["max_entries"])
+DEFAULT_SEMANTIC_QUERY_CACHE_MAX_ENTRIES = 1000
+
+# In-process LRU in front of the listed KV storage namespaces (e.g. llm_response_cache)
+DEFAULT_KV_LRU_CACHE_NAMESPACES: list[str] = []
+DEFAULT_KV_LRU_CACHE_MAX_ENTRIES = 10000
+DEFAULT_KV_LRU_CACHE_TTL = 300
 # Default entities to extract if ENTITY_TYPES is not specified in .env
 DEFAULT_ENTITY_TYPES = [
     "Person",
@@ -88,10 +103,38 @@ DEFAULT_TEMPERATURE = 1.0
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
+DEFAULT_CALL_PRIORITY = 10  # Queue priority of LLM/embedding calls, lower runs first
+DEFAULT_DELETION_BATCH_SIZE = 100  # Documents deleted per graph/VDB rebuild pass
+DEFAULT_CHUNKING_EXECUTOR = (
+    "none"  # Run chunking on: none (event loop), thread, process
+)
+# AIMD concurrency for LLM/embedding queues: back off on 429s/timeouts, grow while healthy
+DEFAULT_ADAPTIVE_CONCURRENCY = False
+DEFAULT_ADAPTIVE_CONCURRENCY_MIN = 1
+# Upper bound of the adaptive limit as a multiple of MAX_ASYNC / EMBEDDING_FUNC_MAX_ASYNC
+DEFAULT_ADAPTIVE_CONCURRENCY_MAX_FACTOR = 2.0
+
+# Provider quotas enforced before dispatch, 0 means unlimited
+DEFAULT_LLM_REQUESTS_PER_MINUTE = 0
+DEFAULT_LLM_TOKENS_PER_MINUTE = 0
+DEFAULT_EMBEDDING_REQUESTS_PER_MINUTE = 0
+DEFAULT_EMBEDDING_TOKENS_PER_MINUTE = 0
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
+# Window for coalescing concurrent small embedding requests into one batch (0 disables)
+DEFAULT_EMBEDDING_MICRO_BATCH_WAIT_MS = 10
+# Persist embeddings keyed by (model, dimension, text hash) to skip re-embedding identical text
+DEFAULT_ENABLE_EMBEDDING_CACHE = False
+# Vectors kept in memory by the embedding cache, least recently used evicted first (0 = unbounded)
+DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES = 100000
+
+# Multi-process shared state: "manager" (multiprocessing.Manager proxies) or
+# "shm" (shared-memory update flags and fcntl file locks)
+DEFAULT_SHARED_STATE_BACKEND = "manager"
+# Number of update flag slots in the shm backend (storage namespaces x workspaces x workers)
+DEFAULT_SHARED_STATE_FLAG_CAPACITY = 4096
 
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
@@ -111,3 +154,29 @@ DEFAULT_OLLAMA_MODEL_TAG = "latest"
 DEFAULT_OLLAMA_MODEL_SIZE = 7365960935
 DEFAULT_OLLAMA_CREATED_AT = "2024-01-15T00:00:00Z"
 DEFAULT_OLLAMA_DIGEST = "sha256:lightrag"
+
+# JsonKVStorage write-ahead log (WAL) configuration defaults
+DEFAULT_JSON_KV_WAL_ENABLED = False
+# Compact WAL into the JSON snapshot once it grows larger than ratio * snapshot size
+DEFAULT_JSON_KV_WAL_COMPACT_RATIO = 1.0
+# Never compact WAL segments smaller than this (in bytes)
+DEFAULT_JSON_KV_WAL_COMPACT_MIN_BYTES = 16 * 1024 * 1024  # Default 16MB
+
+# NetworkXStorage persistence format: graphml (default) or binary (columnar npz snapshot + delta log)
+DEFAULT_NETWORKX_GRAPH_FORMAT = "graphml"
+# Rewrite the binary snapshot once the delta log grows larger than ratio * snapshot size
+DEFAULT_NETWORKX_DELTA_COMPACT_RATIO = 0.5
+
+# Shared HTTP client pool for LLM and embedding bindings
+# Maximum number of distinct cached clients (one per endpoint/credential/config combination)
+DEFAULT_HTTP_CLIENT_CACHE_SIZE = 16
+# Connection pool bounds of each cached client
+DEFAULT_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Max number of memoized token counts per Tokenizer (LRU keyed by content hash), 0 disables
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 65536
+
+# Streaming chunker: characters of text tokenized at once, per token of chunk size
+# (1200-token chunks tokenize ~38K characters at a time instead of the whole document)
+CHUNKING_WINDOW_CHARS_PER_TOKEN = 32
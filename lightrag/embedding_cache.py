@@ -0,0 +1,296 @@
+"""
+Persistent content-addressed embedding cache.
+
+Vectors are keyed by a digest of (model_name, embedding_dim, text), so identical strings
+sent to the embedding model again (re-merged entities with unchanged descriptions,
+rebuilds after document deletion, re-ingested documents) are served from disk instead
+of calling out. Each (model, dimension) pair is persisted to its own append-only record
+file in the workspace directory: a flush appends only the vectors added since the last
+one, and the file is rewritten only when it holds many more records than the in-memory
+cache (evicted or duplicate entries). Appends and rewrites hold the namespace lock from
+`shared_storage`, since every worker on the same working directory shares the file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Sequence
+
+import numpy as np
+
+from lightrag.constants import DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES
+from lightrag.kg.shared_storage import get_namespace_lock
+from lightrag.utils import logger
+
+EMBEDDING_CACHE_DIGEST_SIZE = 16
+# Rewrite the record file once it holds more than this many records per cached vector
+EMBEDDING_CACHE_COMPACT_RATIO = 2
+EMBEDDING_CACHE_COMPACT_MIN_RECORDS = 4096
+
+
+class EmbeddingCache:
+    """Bounded LRU map of text digest -> float32 vector with append-only persistence
+
+    `max_entries` bounds the number of vectors kept in memory (0 means unbounded); the
+    least recently used ones are evicted first.
+    """
+
+    def __init__(
+        self,
+        working_dir: str,
+        model_name: str,
+        embedding_dim: int,
+        workspace: str = "",
+        max_entries: int = DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        self.model_name = model_name
+        self.embedding_dim = embedding_dim
+        self.workspace = workspace
+        self.max_entries = max(0, max_entries)
+        workspace_dir = (
+            os.path.join(working_dir, workspace) if workspace else working_dir
+        )
+        safe_model = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+        file_namespace = f"embedding_cache_{safe_model}_{embedding_dim}"
+        self._file_name = os.path.join(workspace_dir, f"{file_namespace}.bin")
+        # Serializes file writes across processes sharing the workspace directory
+        self._file_lock = get_namespace_lock(file_namespace, workspace=workspace)
+        self._key_prefix = f"{model_name}\x00{embedding_dim}\x00".encode("utf-8")
+        self._record_dtype = np.dtype(
+            [
+                ("key", f"V{EMBEDDING_CACHE_DIGEST_SIZE}"),
+                ("vector", "<f4", (embedding_dim,)),
+            ]
+        )
+        self._vectors: OrderedDict[bytes, np.ndarray] | None = None
+        # Vectors stored since the last flush, appended by index_done_callback
+        self._unsaved: dict[bytes, np.ndarray] = {}
+        # (inode, byte offset) of the record file content already merged into memory
+        self._file_state: tuple[int, int] | None = None
+        self._file_records = 0
+        self._save_lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __deepcopy__(self, memo):
+        # Shared by every copy of the EmbeddingFunc (e.g. asdict(LightRAG))
+        return self
+
+    def _key(self, text: str) -> bytes:
+        return blake2b(
+            self._key_prefix + text.encode("utf-8", "surrogatepass"),
+            digest_size=EMBEDDING_CACHE_DIGEST_SIZE,
+        ).digest()
+
+    def _read_records(
+        self, state: tuple[int, int] | None
+    ) -> tuple[np.ndarray, tuple[int, int] | None, bool]:
+        """Read whole records written after `state`
+
+        Returns the records, the new file state and whether reading restarted from the
+        beginning (no state yet, or the file was replaced by a compaction or drop).
+        """
+        try:
+            with open(self._file_name, "rb") as f:
+                stat = os.fstat(f.fileno())
+                restarted = not (
+                    state and state[0] == stat.st_ino and state[1] <= stat.st_size
+                )
+                offset = 0 if restarted else state[1]
+                # A torn record at the tail (crash during append) is left out
+                count = (stat.st_size - offset) // self._record_dtype.itemsize
+                records = np.fromfile(
+                    f, dtype=self._record_dtype, count=count, offset=offset
+                )
+        except FileNotFoundError:
+            return np.empty(0, dtype=self._record_dtype), None, True
+        except Exception as e:
+            logger.warning(
+                f"[{self.workspace}] Ignoring unreadable embedding cache {self._file_name}: {e}"
+            )
+            return np.empty(0, dtype=self._record_dtype), state, False
+        return records, (stat.st_ino, offset + records.nbytes), restarted
+
+    def _put(self, key: bytes, vector: np.ndarray) -> None:
+        self._vectors[key] = vector
+        if self.max_entries and len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+            self.evictions += 1
+
+    def _merge_records(self, records: np.ndarray) -> None:
+        """Add vectors read from disk, keeping entries already in memory"""
+        keys = records["key"].tobytes()
+        size = EMBEDDING_CACHE_DIGEST_SIZE
+        for i, vector in enumerate(records["vector"]):
+            key = keys[i * size : (i + 1) * size]
+            if key not in self._vectors:
+                self._put(key, vector)
+
+    def _apply_read(self, records, state, restarted) -> None:
+        if self._vectors is None:
+            self._vectors = OrderedDict()
+        self._merge_records(records)
+        self._file_state = state
+        self._file_records = (
+            len(records) if restarted else self._file_records + len(records)
+        )
+
+    def _ensure_loaded(self) -> OrderedDict[bytes, np.ndarray]:
+        if self._vectors is None:
+            self._apply_read(*self._read_records(None))
+        return self._vectors
+
+    async def initialize(self):
+        """Load the cache file off the event loop"""
+        if self._vectors is None:
+            loaded = await asyncio.to_thread(self._read_records, None)
+            if self._vectors is None:
+                self._apply_read(*loaded)
+                logger.info(
+                    f"[{self.workspace}] Loaded embedding cache with {len(self._vectors)} vectors"
+                )
+
+    def lookup(
+        self, texts: Sequence[str]
+    ) -> tuple[list[np.ndarray | None], list[bytes]]:
+        """Return the cached vector (or None) and the cache key for each text"""
+        vectors = self._ensure_loaded()
+        keys = [self._key(text) for text in texts]
+        found = []
+        for key in keys:
+            vector = vectors.get(key)
+            if vector is not None:
+                vectors.move_to_end(key)
+            found.append(vector)
+        hits = sum(vector is not None for vector in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found, keys
+
+    def store(self, keys: Sequence[bytes], vectors: np.ndarray) -> None:
+        self._ensure_loaded()
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.embedding_dim)
+        for key, vector in zip(keys, vectors):
+            self._put(key, vector)
+            self._unsaved[key] = vector
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._vectors) if self._vectors is not None else 0,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def _to_records(self, items) -> np.ndarray:
+        records = np.empty(len(items), dtype=self._record_dtype)
+        if items:
+            records["key"] = np.frombuffer(
+                b"".join(key for key, _ in items), dtype=records["key"].dtype
+            )
+            records["vector"] = np.stack([vector for _, vector in items])
+        return records
+
+    def _append_file(
+        self, unsaved: dict[bytes, np.ndarray]
+    ) -> tuple[np.ndarray, tuple[int, int] | None, bool, int]:
+        """Pick up records appended by other processes, then append `unsaved`"""
+        records, state, restarted = self._read_records(self._file_state)
+        os.makedirs(os.path.dirname(self._file_name) or ".", exist_ok=True)
+        payload = self._to_records(list(unsaved.items())).tobytes()
+        with open(self._file_name, "ab") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end % self._record_dtype.itemsize:
+                # Drop a torn record so later records stay aligned
+                end -= end % self._record_dtype.itemsize
+                f.truncate(end)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            inode = os.fstat(f.fileno()).st_ino
+        if state is None or (state[0] == inode and state[1] == end):
+            # Nothing was appended by others in between, skip over our own records
+            state = (inode, end + len(payload))
+        return records, state, restarted, len(unsaved)
+
+    def _rewrite_file(
+        self, snapshot: list[tuple[bytes, np.ndarray]]
+    ) -> tuple[np.ndarray, tuple[int, int], bool, int]:
+        """Replace the record file with the in-memory vectors plus unseen records"""
+        records, _, _ = self._read_records(self._file_state)
+        known = {key for key, _ in snapshot}
+        size = EMBEDDING_CACHE_DIGEST_SIZE
+        keys = records["key"].tobytes()
+        snapshot = snapshot + [
+            (keys[i * size : (i + 1) * size], vector)
+            for i, vector in enumerate(records["vector"])
+            if keys[i * size : (i + 1) * size] not in known
+        ]
+        if self.max_entries:
+            snapshot = snapshot[-self.max_entries :]
+        payload = self._to_records(snapshot).tobytes()
+        os.makedirs(os.path.dirname(self._file_name) or ".", exist_ok=True)
+        tmp_file = f"{self._file_name}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._file_name)
+        state = (os.stat(self._file_name).st_ino, len(payload))
+        return records, state, True, len(snapshot)
+
+    async def index_done_callback(self) -> None:
+        """Append vectors added since the last flush, compacting the file when needed"""
+        async with self._save_lock:
+            if not self._unsaved or self._vectors is None:
+                return
+            unsaved, self._unsaved = self._unsaved, {}
+            compact = self._file_records + len(unsaved) > max(
+                EMBEDDING_CACHE_COMPACT_RATIO * len(self._vectors),
+                EMBEDDING_CACHE_COMPACT_MIN_RECORDS,
+            )
+            try:
+                async with self._file_lock:
+                    if compact:
+                        records, state, _, file_records = await asyncio.to_thread(
+                            self._rewrite_file, list(self._vectors.items())
+                        )
+                    else:
+                        records, state, restarted, appended = await asyncio.to_thread(
+                            self._append_file, unsaved
+                        )
+                        file_records = (
+                            len(records)
+                            if restarted
+                            else self._file_records + len(records)
+                        ) + appended
+            except Exception:
+                for key, vector in unsaved.items():
+                    self._unsaved.setdefault(key, vector)
+                raise
+            self._merge_records(records)
+            self._file_state = state
+            self._file_records = file_records
+            logger.debug(
+                f"[{self.workspace}] Persisted {len(unsaved)} new embeddings "
+                f"({file_records} records on disk{', compacted' if compact else ''})"
+            )
+
+    async def drop(self) -> None:
+        """Clear the cache and remove its file"""
+        async with self._save_lock:
+            self._vectors = OrderedDict()
+            self._unsaved = {}
+            self._file_state = None
+            self._file_records = 0
+            async with self._file_lock:
+                if os.path.exists(self._file_name):
+                    os.remove(self._file_name)
@@ -1,3 +1,5 @@
+import asyncio
+import json
 import os
 from dataclasses import dataclass
 from typing import Any, final
@@ -5,7 +7,14 @@ from typing import Any, final
 from lightrag.base import (
     BaseKVStorage,
 )
+from lightrag.constants import (
+    DEFAULT_JSON_KV_WAL_ENABLED,
+    DEFAULT_JSON_KV_WAL_COMPACT_RATIO,
+    DEFAULT_JSON_KV_WAL_COMPACT_MIN_BYTES,
+)
 from lightrag.utils import (
+    SanitizingJSONEncoder,
+    get_env_value,
     load_json,
     logger,
     write_json,
@@ -38,7 +47,26 @@ class JsonKVStorage(BaseKVStorage):
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
 
+        # Write-ahead log mode: changed keys are appended to a log segment on each
+        # index_done_callback, and the JSON snapshot is only rewritten on compaction
+        self._wal_enabled = get_env_value(
+            "JSON_KV_WAL_ENABLED", DEFAULT_JSON_KV_WAL_ENABLED, bool
+        )
+        self._wal_compact_ratio = get_env_value(
+            "JSON_KV_WAL_COMPACT_RATIO", DEFAULT_JSON_KV_WAL_COMPACT_RATIO, float
+        )
+        self._wal_compact_min_bytes = get_env_value(
+            "JSON_KV_WAL_COMPACT_MIN_BYTES", DEFAULT_JSON_KV_WAL_COMPACT_MIN_BYTES, int
+        )
+        self._wal_file_name = os.path.join(
+            workspace_dir, f"kv_store_{self.namespace}.wal"
+        )
+        # Segment being folded into the snapshot by a background compaction
+        self._wal_compacting_file_name = self._wal_file_name + ".compacting"
+
         self._data = None
+        self._wal_dirty = None
+        self._compaction_task = None
         self._storage_lock = None
         self.storage_updated = None
 
@@ -58,6 +86,11 @@ class JsonKVStorage(BaseKVStorage):
             self._data = await get_namespace_data(
                 self.namespace, workspace=self.workspace
             )
+            if self._wal_enabled:
+                # Keys changed since the last flush, shared by all processes (used as a set)
+                self._wal_dirty = await get_namespace_data(
+                    f"{self.namespace}_wal_dirty", workspace=self.workspace
+                )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
@@ -67,6 +100,20 @@ class JsonKVStorage(BaseKVStorage):
                             loaded_data
                         )
 
+                    # Replay WAL segments on top of the snapshot
+                    replayed_count = self._replay_wal(loaded_data)
+                    if replayed_count:
+                        logger.info(
+                            f"[{self.workspace}] Process {os.getpid()} KV replayed {replayed_count} WAL records for {self.namespace}"
+                        )
+                    # Fold leftovers of an interrupted compaction (or WAL segments
+                    # written before WAL mode was disabled) into the snapshot
+                    if os.path.exists(self._wal_compacting_file_name) or (
+                        replayed_count and not self._wal_enabled
+                    ):
+                        self._write_snapshot(loaded_data)
+                        self._remove_wal_files()
+
                     self._data.update(loaded_data)
                     data_count = len(loaded_data)
 
@@ -75,6 +122,10 @@ class JsonKVStorage(BaseKVStorage):
                     )
 
     async def index_done_callback(self) -> None:
+        if self._wal_enabled:
+            await self._wal_index_done_callback()
+            return
+
         async with self._storage_lock:
             if self.storage_updated.value:
                 data_dict = (
@@ -174,6 +225,8 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            if self._wal_dirty is not None:
+                self._wal_dirty.update(dict.fromkeys(data, True))
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -195,6 +248,8 @@ class JsonKVStorage(BaseKVStorage):
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    if self._wal_dirty is not None:
+                        self._wal_dirty[doc_id] = True
 
             if any_deleted:
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -223,8 +278,15 @@ class JsonKVStorage(BaseKVStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
+            # Let a running compaction finish so it cannot resurrect dropped data
+            await self._wait_for_compaction()
             async with self._storage_lock:
                 self._data.clear()
+                if self._wal_dirty is not None:
+                    self._wal_dirty.clear()
+                    # WAL mode only persists changed keys, so write the empty snapshot here
+                    write_json({}, self._file_name)
+                self._remove_wal_files()
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
             await self.index_done_callback()
@@ -300,3 +362,160 @@ class JsonKVStorage(BaseKVStorage):
         """
         if self.namespace.endswith("_cache"):
             await self.index_done_callback()
+        await self._wait_for_compaction()
+
+    async def _wal_index_done_callback(self) -> None:
+        """Append changed keys to the WAL segment and compact it when it grows too large"""
+        async with self._storage_lock:
+            if self.storage_updated.value:
+                record_count = self._append_wal()
+                logger.debug(
+                    f"[{self.workspace}] Process {os.getpid()} KV appended {record_count} WAL records to {self.namespace}"
+                )
+                await clear_all_update_flags(self.namespace, workspace=self.workspace)
+
+            # Skip if a compaction is in progress (in this or another process)
+            if (
+                self._compaction_task is not None and not self._compaction_task.done()
+            ) or os.path.exists(self._wal_compacting_file_name):
+                return
+            if not os.path.exists(self._wal_file_name):
+                return
+            wal_size = os.path.getsize(self._wal_file_name)
+            snapshot_size = (
+                os.path.getsize(self._file_name)
+                if os.path.exists(self._file_name)
+                else 0
+            )
+            if wal_size < max(
+                self._wal_compact_min_bytes, snapshot_size * self._wal_compact_ratio
+            ):
+                return
+
+            # Rotate the active segment so new changes keep appending while the
+            # snapshot is written in the background
+            os.replace(self._wal_file_name, self._wal_compacting_file_name)
+            snapshot = (
+                dict(self._data)
+                if hasattr(self._data, "_getvalue")
+                else self._data.copy()
+            )
+
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} KV compacting {wal_size} bytes of WAL into {self.namespace} snapshot"
+        )
+        self._compaction_task = asyncio.create_task(self._compact_wal(snapshot))
+
+    def _append_wal(self) -> int:
+        """Write one record per dirty key to the active WAL segment (caller holds the lock)
+
+        Returns:
+            int: Number of records written
+        """
+        dirty_keys = list(self._wal_dirty.keys())
+        if not dirty_keys:
+            return 0
+
+        lines = []
+        sanitized = {}
+        for key in dirty_keys:
+            value = self._data.get(key)
+            record = {"k": key, "d": 1} if value is None else {"k": key, "v": value}
+            line = json.dumps(record, ensure_ascii=False)
+            try:
+                line.encode("utf-8")
+            except UnicodeEncodeError:
+                # Same sanitization strategy as write_json, applied per record
+                line = json.dumps(record, ensure_ascii=False, cls=SanitizingJSONEncoder)
+                if value is not None:
+                    sanitized[key] = json.loads(line)["v"]
+            lines.append(line)
+
+        with open(self._wal_file_name, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Keep shared memory consistent with what was persisted
+        if sanitized:
+            self._data.update(sanitized)
+        self._wal_dirty.clear()
+        return len(lines)
+
+    def _replay_wal(self, data: dict) -> int:
+        """Apply WAL segments on top of a loaded snapshot, oldest segment first
+
+        Records hold the full value of a key, so replaying a segment that is already
+        part of the snapshot (interrupted compaction) is harmless.
+
+        Returns:
+            int: Number of records applied
+        """
+        replayed_count = 0
+        for wal_file in (self._wal_compacting_file_name, self._wal_file_name):
+            if not os.path.exists(wal_file):
+                continue
+            with open(wal_file, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write at the tail of the log after a crash
+                        logger.warning(
+                            f"[{self.workspace}] Skipping corrupted WAL record {wal_file}:{line_no}"
+                        )
+                        continue
+                    if "d" in record:
+                        data.pop(record["k"], None)
+                    else:
+                        data[record["k"]] = record["v"]
+                    replayed_count += 1
+        return replayed_count
+
+    def _write_snapshot(self, data: dict) -> None:
+        """Atomically replace the JSON snapshot file"""
+        tmp_file_name = self._file_name + ".tmp"
+        write_json(data, tmp_file_name)
+        os.replace(tmp_file_name, self._file_name)
+
+    def _remove_wal_files(self) -> None:
+        for wal_file in (self._wal_file_name, self._wal_compacting_file_name):
+            if os.path.exists(wal_file):
+                os.remove(wal_file)
+
+    async def _compact_wal(self, snapshot: dict) -> None:
+        """Write the snapshot in a worker thread, then discard the rotated segment"""
+        try:
+            await asyncio.to_thread(self._write_snapshot, snapshot)
+            os.remove(self._wal_compacting_file_name)
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} KV compaction of {self.namespace} finished with {len(snapshot)} records"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error compacting WAL for {self.namespace}: {e}"
+            )
+            # Put the rotated records back in front of the active segment
+            async with self._storage_lock:
+                self._restore_compacting_wal()
+
+    def _restore_compacting_wal(self) -> None:
+        if not os.path.exists(self._wal_compacting_file_name):
+            return
+        with open(self._wal_compacting_file_name, encoding="utf-8") as f:
+            content = f.read()
+        if os.path.exists(self._wal_file_name):
+            with open(self._wal_file_name, encoding="utf-8") as f:
+                content += f.read()
+        tmp_file_name = self._wal_file_name + ".tmp"
+        with open(tmp_file_name, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file_name, self._wal_file_name)
+        os.remove(self._wal_compacting_file_name)
+
+    async def _wait_for_compaction(self) -> None:
+        if self._compaction_task is not None and not self._compaction_task.done():
+            await self._compaction_task
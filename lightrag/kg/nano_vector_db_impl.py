@@ -21,6 +21,12 @@ from .shared_storage import (
 )
 
 
+def _decode_vector(encoded: str) -> np.ndarray:
+    """Decompress a stored vector (Base64 + zlib + Float16) to float32"""
+    decompressed = zlib.decompress(base64.b64decode(encoded))
+    return np.frombuffer(decompressed, dtype=np.float16).astype(np.float32)
+
+
 @final
 @dataclass
 class NanoVectorDBStorage(BaseVectorStorage):
@@ -373,20 +379,32 @@ class NanoVectorDBStorage(BaseVectorStorage):
             return {}
 
         client = await self._get_client()
-        results = client.get(ids)
+        # NanoVectorDB tests membership for every stored record, so pass a set
+        results = client.get(set(ids))
 
         vectors_dict = {}
         for result in results:
             if result and "vector" in result and "__id__" in result:
-                # Decompress vector data (Base64 + zlib + Float16 compressed)
-                decoded = base64.b64decode(result["vector"])
-                decompressed = zlib.decompress(decoded)
-                vector_f16 = np.frombuffer(decompressed, dtype=np.float16)
-                vector_f32 = vector_f16.astype(np.float32).tolist()
-                vectors_dict[result["__id__"]] = vector_f32
+                vectors_dict[result["__id__"]] = _decode_vector(
+                    result["vector"]
+                ).tolist()
 
         return vectors_dict
 
+    async def get_vectors_array_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        client = await self._get_client()
+        found = [
+            result
+            for result in client.get(set(ids))
+            if result and "vector" in result and "__id__" in result
+        ]
+        matrix = np.empty((len(found), self.embedding_func.embedding_dim), np.float32)
+        for row, result in enumerate(found):
+            matrix[row] = _decode_vector(result["vector"])
+        return [result["__id__"] for result in found], matrix
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
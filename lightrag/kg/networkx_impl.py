@@ -1,9 +1,16 @@
+import json
 import os
 from dataclasses import dataclass
-from typing import final
+from typing import Any, final
 
+import numpy as np
+
+from lightrag.constants import (
+    DEFAULT_NETWORKX_GRAPH_FORMAT,
+    DEFAULT_NETWORKX_DELTA_COMPACT_RATIO,
+)
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from lightrag.utils import logger
+from lightrag.utils import get_env_value, logger
 from lightrag.base import BaseGraphStorage
 import networkx as nx
 from .shared_storage import (
@@ -19,6 +26,106 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+GRAPH_SNAPSHOT_VERSION = 1
+
+
+def _encode_str_column(values: list[str]) -> dict[str, np.ndarray]:
+    """Encode strings as one UTF-8 blob plus character offsets"""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in values], out=offsets[1:])
+    blob = "".join(values).encode("utf-8", "surrogatepass")
+    return {"data": np.frombuffer(blob, dtype=np.uint8), "offsets": offsets}
+
+
+def _decode_str_column(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    text = data.tobytes().decode("utf-8", "surrogatepass")
+    bounds = offsets.tolist()
+    return [text[bounds[i] : bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _encode_column(values: list[Any]) -> tuple[str, dict[str, np.ndarray]]:
+    """Encode an attribute column into typed, pickle-free numpy arrays
+
+    Returns:
+        tuple: (column kind, arrays) where missing values are tracked by a `mask` array
+    """
+    mask = np.array([v is not None for v in values], dtype=bool)
+    kinds = {type(v) for v in values if v is not None}
+
+    if kinds <= {str}:
+        arrays = _encode_str_column([v if v is not None else "" for v in values])
+        return "str", {**arrays, "mask": mask}
+    if kinds == {bool}:
+        values = [bool(v) for v in values]
+        return "bool", {"values": np.array(values, dtype=bool), "mask": mask}
+    if kinds <= {int, float}:
+        kind = "int" if kinds == {int} else "float"
+        try:
+            array = np.array(
+                [v if v is not None else 0 for v in values],
+                dtype=np.int64 if kind == "int" else np.float64,
+            )
+            return kind, {"values": array, "mask": mask}
+        except OverflowError:
+            pass
+
+    # Anything else is stored as JSON text
+    encoded = [
+        json.dumps(v, ensure_ascii=False) if v is not None else "" for v in values
+    ]
+    return "json", {**_encode_str_column(encoded), "mask": mask}
+
+
+def _decode_column(kind: str, arrays: dict[str, np.ndarray]) -> list[Any]:
+    mask = arrays["mask"].tolist()
+    if kind in ("str", "json"):
+        values = _decode_str_column(arrays["data"], arrays["offsets"])
+        if kind == "json":
+            values = [
+                json.loads(v) if present else None for v, present in zip(values, mask)
+            ]
+    else:
+        values = arrays["values"].tolist()
+    return [v if present else None for v, present in zip(values, mask)]
+
+
+def _encode_attr_table(
+    prefix: str, attrs_list: list[dict[str, Any]], arrays: dict[str, np.ndarray]
+) -> dict[str, str]:
+    """Encode a list of attribute dicts column by column, returns {column: kind}"""
+    columns: dict[str, None] = {}
+    for attrs in attrs_list:
+        columns.update(dict.fromkeys(attrs))
+
+    column_kinds = {}
+    for i, column in enumerate(columns):
+        kind, column_arrays = _encode_column(
+            [attrs.get(column) for attrs in attrs_list]
+        )
+        column_kinds[column] = kind
+        for name, array in column_arrays.items():
+            arrays[f"{prefix}{i}.{name}"] = array
+    return column_kinds
+
+
+def _decode_attr_table(
+    prefix: str, column_kinds: dict[str, str], npz, size: int
+) -> list[dict[str, Any]]:
+    attrs_list: list[dict[str, Any]] = [{} for _ in range(size)]
+    for i, (column, kind) in enumerate(column_kinds.items()):
+        names = (
+            ("data", "offsets", "mask")
+            if kind in ("str", "json")
+            else ("values", "mask")
+        )
+        values = _decode_column(
+            kind, {name: npz[f"{prefix}{i}.{name}"] for name in names}
+        )
+        for attrs, value in zip(attrs_list, values):
+            if value is not None:
+                attrs[column] = value
+    return attrs_list
+
 
 @final
 @dataclass
@@ -36,6 +143,74 @@ class NetworkXStorage(BaseGraphStorage):
         )
         nx.write_graphml(graph, file_name)
 
+    @staticmethod
+    def load_nx_graph_binary(file_name) -> nx.Graph:
+        """Load a graph from a columnar npz snapshot (no pickle involved)"""
+        if not os.path.exists(file_name):
+            return None
+
+        with np.load(file_name, allow_pickle=False) as npz:
+            header = json.loads(npz["header"].tobytes().decode("utf-8"))
+            if header.get("version") != GRAPH_SNAPSHOT_VERSION:
+                raise ValueError(
+                    f"Unsupported graph snapshot version {header.get('version')} in {file_name}"
+                )
+            node_ids = _decode_str_column(npz["node_ids.data"], npz["node_ids.offsets"])
+            node_attrs = _decode_attr_table(
+                "node_col", header["node_columns"], npz, len(node_ids)
+            )
+            edge_src = npz["edge_src"].tolist()
+            edge_tgt = npz["edge_tgt"].tolist()
+            edge_attrs = _decode_attr_table(
+                "edge_col", header["edge_columns"], npz, len(edge_src)
+            )
+
+        graph = nx.Graph()
+        graph.add_nodes_from(zip(node_ids, node_attrs))
+        graph.add_edges_from(
+            (node_ids[src], node_ids[tgt], attrs)
+            for src, tgt, attrs in zip(edge_src, edge_tgt, edge_attrs)
+        )
+        return graph
+
+    @staticmethod
+    def write_nx_graph_binary(graph: nx.Graph, file_name, workspace="_"):
+        """Atomically write a graph as columnar node and edge tables in an npz file"""
+        logger.info(
+            f"[{workspace}] Writing binary graph snapshot with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+        )
+        node_ids = list(graph.nodes)
+        node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        edges = list(graph.edges(data=True))
+
+        arrays = {}
+        node_id_arrays = _encode_str_column([str(node_id) for node_id in node_ids])
+        arrays["node_ids.data"] = node_id_arrays["data"]
+        arrays["node_ids.offsets"] = node_id_arrays["offsets"]
+        arrays["edge_src"] = np.array(
+            [node_index[u] for u, _, _ in edges], dtype=np.int64
+        )
+        arrays["edge_tgt"] = np.array(
+            [node_index[v] for _, v, _ in edges], dtype=np.int64
+        )
+        header = {
+            "version": GRAPH_SNAPSHOT_VERSION,
+            "node_columns": _encode_attr_table(
+                "node_col", [attrs for _, attrs in graph.nodes(data=True)], arrays
+            ),
+            "edge_columns": _encode_attr_table(
+                "edge_col", [attrs for _, _, attrs in edges], arrays
+            ),
+        }
+        arrays["header"] = np.frombuffer(
+            json.dumps(header).encode("utf-8"), dtype=np.uint8
+        )
+
+        tmp_file_name = file_name + ".tmp"
+        with open(tmp_file_name, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file_name, file_name)
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -50,21 +225,35 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        # Binary format: columnar snapshot plus an append-only delta log of graph changes
+        self._binary_file = os.path.join(workspace_dir, f"graph_{self.namespace}.npz")
+        self._delta_file = os.path.join(workspace_dir, f"graph_{self.namespace}.delta")
+        self._graph_format = get_env_value(
+            "NETWORKX_GRAPH_FORMAT", DEFAULT_NETWORKX_GRAPH_FORMAT, str
+        ).lower()
+        if self._graph_format not in ("graphml", "binary"):
+            logger.warning(
+                f"[{self.workspace}] Unknown NETWORKX_GRAPH_FORMAT '{self._graph_format}', falling back to graphml"
+            )
+            self._graph_format = "graphml"
+        self._delta_compact_ratio = get_env_value(
+            "NETWORKX_DELTA_COMPACT_RATIO", DEFAULT_NETWORKX_DELTA_COMPACT_RATIO, float
+        )
+        # Graph changes not yet persisted (binary format only)
+        self._pending_ops: list[list] = []
+        self._needs_snapshot = False
+        # Files of the other format the graph was migrated from, retired after the next save
+        self._migrated_files: list[str] = []
+        # Identity of the loaded snapshot file and how far the delta log was replayed
+        self._snapshot_token = None
+        self._delta_offset = 0
+
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
-        if preloaded_graph is not None:
-            logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
-            )
-        else:
-            logger.info(
-                f"[{self.workspace}] Created new empty graph file: {self._graphml_xml_file}"
-            )
-        self._graph = preloaded_graph or nx.Graph()
+        self._graph = self._load_graph()
 
     async def initialize(self):
         """Initialize storage data"""
@@ -87,14 +276,183 @@ class NetworkXStorage(BaseGraphStorage):
                     f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
                 )
                 # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
 
             return self._graph
 
+    def _load_graph(self) -> nx.Graph:
+        """Load the graph from disk in the configured format"""
+        self._pending_ops = []
+        self._needs_snapshot = False
+        self._migrated_files = []
+        self._snapshot_token = None
+        self._delta_offset = 0
+
+        # graphml mode still reads a binary snapshot left by a previous binary-mode run
+        if os.path.exists(self._binary_file) and (
+            self._graph_format == "binary" or not os.path.exists(self._graphml_xml_file)
+        ):
+            graph = NetworkXStorage.load_nx_graph_binary(self._binary_file)
+            self._snapshot_token = self._file_token(self._binary_file)
+            self._delta_offset = self._replay_delta(graph, 0)
+            logger.info(
+                f"[{self.workspace}] Loaded graph from {self._binary_file} with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+            )
+            if self._graph_format == "graphml":
+                # Migrate back to graphml on the next index_done_callback
+                self._migrated_files = [self._binary_file, self._delta_file]
+            return graph
+
+        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        if preloaded_graph is not None:
+            logger.info(
+                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+            )
+            if self._graph_format == "binary":
+                # Migrate to the binary snapshot on the next index_done_callback
+                self._needs_snapshot = True
+                self._migrated_files = [self._graphml_xml_file]
+        else:
+            graph_file = (
+                self._binary_file
+                if self._graph_format == "binary"
+                else self._graphml_xml_file
+            )
+            logger.info(
+                f"[{self.workspace}] Created new empty graph file: {graph_file}"
+            )
+        return preloaded_graph or nx.Graph()
+
+    def _retire_migrated_files(self):
+        """Rename files of the previous format once the graph was saved in the new one
+
+        Left in place, they would be loaded as a stale graph after switching
+        NETWORKX_GRAPH_FORMAT back. The renamed copies are kept as a backup.
+        """
+        for file_name in self._migrated_files:
+            if os.path.exists(file_name):
+                os.replace(file_name, file_name + ".migrated")
+                logger.info(
+                    f"[{self.workspace}] Graph migrated to {self._graph_format}, renamed {file_name} to {file_name}.migrated"
+                )
+        self._migrated_files = []
+
+    def _reload_graph(self):
+        """Reload the graph after another process persisted its changes"""
+        if (
+            self._graph_format == "binary"
+            and not self._pending_ops
+            and not self._needs_snapshot
+            and self._snapshot_token is not None
+            and self._file_token(self._binary_file) == self._snapshot_token
+        ):
+            # Snapshot unchanged: only apply delta records appended since the last load
+            self._delta_offset = self._replay_delta(self._graph, self._delta_offset)
+            return
+        self._graph = self._load_graph()
+
+    @staticmethod
+    def _file_token(file_name) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(file_name)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _apply_op(graph: nx.Graph, op: list):
+        kind = op[0]
+        if kind == "n":
+            graph.add_node(op[1], **op[2])
+        elif kind == "e":
+            graph.add_edge(op[1], op[2], **op[3])
+        elif kind == "dn":
+            if graph.has_node(op[1]):
+                graph.remove_node(op[1])
+        elif kind == "de":
+            if graph.has_edge(op[1], op[2]):
+                graph.remove_edge(op[1], op[2])
+
+    def _replay_delta(self, graph: nx.Graph, offset: int) -> int:
+        """Apply delta log records starting at byte offset, returns the new offset"""
+        if not os.path.exists(self._delta_file):
+            return 0
+        with open(self._delta_file, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # Torn write at the tail of the log after a crash
+                    logger.warning(
+                        f"[{self.workspace}] Ignoring incomplete record at the end of {self._delta_file}"
+                    )
+                    break
+                offset += len(raw)
+                self._apply_op(graph, json.loads(raw.decode("utf-8", "surrogatepass")))
+        return offset
+
+    def _record_op(self, op: list):
+        if self._graph_format == "binary":
+            self._pending_ops.append(op)
+
+    def _persist_binary(self) -> bool:
+        """Append pending changes to the delta log, or rewrite the snapshot when the log grew too large
+
+        Returns:
+            bool: True if anything was written
+        """
+        snapshot_size = (
+            os.path.getsize(self._binary_file)
+            if os.path.exists(self._binary_file)
+            else 0
+        )
+        delta_size = (
+            os.path.getsize(self._delta_file) if os.path.exists(self._delta_file) else 0
+        )
+
+        if (
+            self._needs_snapshot
+            or (self._pending_ops and snapshot_size == 0)
+            or (delta_size and delta_size > snapshot_size * self._delta_compact_ratio)
+        ):
+            NetworkXStorage.write_nx_graph_binary(
+                self._graph, self._binary_file, self.workspace
+            )
+            if os.path.exists(self._delta_file):
+                os.remove(self._delta_file)
+            self._snapshot_token = self._file_token(self._binary_file)
+            self._delta_offset = 0
+        elif self._pending_ops:
+            payload = "".join(
+                json.dumps(op, ensure_ascii=False) + "\n" for op in self._pending_ops
+            ).encode("utf-8", "surrogatepass")
+            with open(self._delta_file, "ab") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self._delta_offset = delta_size + len(payload)
+        else:
+            return False
+
+        self._pending_ops = []
+        self._needs_snapshot = False
+        return True
+
+    async def export_graphml(self, file_name: str | None = None) -> str:
+        """Export the current graph as GraphML
+
+        Args:
+            file_name: Target file, defaults to graph_<namespace>.graphml in the workspace directory
+
+        Returns:
+            str: Path of the written file
+        """
+        graph = await self._get_graph()
+        file_name = file_name or self._graphml_xml_file
+        NetworkXStorage.write_nx_graph(graph, file_name, self.workspace)
+        return file_name
+
     async def has_node(self, node_id: str) -> bool:
         graph = await self._get_graph()
         return graph.has_node(node_id)
@@ -129,6 +487,64 @@ class NetworkXStorage(BaseGraphStorage):
             return list(graph.edges(source_node_id))
         return None
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        """Get nodes as a batch with a single graph lock round-trip"""
+        graph = await self._get_graph()
+        result = {}
+        for node_id in node_ids:
+            node = graph.nodes.get(node_id)
+            if node is not None:
+                result[node_id] = node
+        return result
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        """Node degrees as a batch with a single graph lock round-trip
+
+        Nodes missing from the graph get a degree of 0.
+        """
+        graph = await self._get_graph()
+        return {
+            node_id: graph.degree(node_id) if graph.has_node(node_id) else 0
+            for node_id in node_ids
+        }
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Edge degrees as a batch with a single graph lock round-trip"""
+        graph = await self._get_graph()
+        degrees: dict[str, int] = {}
+        for node_id in {node_id for pair in edge_pairs for node_id in pair}:
+            degrees[node_id] = graph.degree(node_id) if graph.has_node(node_id) else 0
+        return {
+            (src_id, tgt_id): degrees[src_id] + degrees[tgt_id]
+            for src_id, tgt_id in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """Get edges as a batch with a single graph lock round-trip"""
+        graph = await self._get_graph()
+        result = {}
+        for pair in pairs:
+            src_id = pair["src"]
+            tgt_id = pair["tgt"]
+            edge = graph.edges.get((src_id, tgt_id))
+            if edge is not None:
+                result[(src_id, tgt_id)] = edge
+        return result
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Get nodes edges as a batch with a single graph lock round-trip"""
+        graph = await self._get_graph()
+        return {
+            node_id: list(graph.edges(node_id)) if graph.has_node(node_id) else []
+            for node_id in node_ids
+        }
+
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """
         Importance notes:
@@ -138,6 +554,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        self._record_op(["n", node_id, dict(node_data)])
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -150,6 +567,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._record_op(["e", source_node_id, target_node_id, dict(edge_data)])
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -161,6 +579,7 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         if graph.has_node(node_id):
             graph.remove_node(node_id)
+            self._record_op(["dn", node_id])
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -182,6 +601,7 @@ class NetworkXStorage(BaseGraphStorage):
         for node in nodes:
             if graph.has_node(node):
                 graph.remove_node(node)
+                self._record_op(["dn", node])
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -198,6 +618,7 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+                self._record_op(["de", source, target])
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -509,9 +930,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -520,9 +939,15 @@ class NetworkXStorage(BaseGraphStorage):
         async with self._storage_lock:
             try:
                 # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
+                if self._graph_format == "binary":
+                    if not self._persist_binary():
+                        # Nothing changed, no need to notify other processes
+                        return True
+                else:
+                    NetworkXStorage.write_nx_graph(
+                        self._graph, self._graphml_xml_file, self.workspace
+                    )
+                self._retire_migrated_files()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -550,10 +975,16 @@ class NetworkXStorage(BaseGraphStorage):
         """
         try:
             async with self._storage_lock:
-                # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
-                self._graph = nx.Graph()
+                # delete graph files of all formats, including migration backups
+                for file_name in (
+                    self._graphml_xml_file,
+                    self._binary_file,
+                    self._delta_file,
+                ):
+                    for path in (file_name, file_name + ".migrated"):
+                        if os.path.exists(path):
+                            os.remove(path)
+                self._graph = self._load_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
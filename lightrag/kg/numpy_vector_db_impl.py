@@ -0,0 +1,562 @@
+import asyncio
+import glob
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, final
+
+import numpy as np
+
+from lightrag.utils import (
+    SanitizingJSONEncoder,
+    logger,
+    compute_mdhash_id,
+)
+from lightrag.base import BaseVectorStorage
+from .shared_storage import (
+    get_namespace_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+
+@final
+@dataclass
+class NumpyVectorDBStorage(BaseVectorStorage):
+    """
+    A local vector storage backed by a memory-mapped numpy matrix.
+
+    Normalized float32 vectors are kept in a contiguous `vdb_<namespace>.<generation>.npy`
+    file which is memory-mapped (copy-on-write) on load, and row-aligned ids and meta fields
+    are kept in a compact `vdb_<namespace>.meta.json` sidecar. Queries run as a single matmul
+    over the mapped matrix, and other processes re-map the file instead of decoding vectors
+    from JSON.
+
+    The sidecar names the generation of the matrix file it belongs to. A save writes the new
+    matrix under a new generation first and then atomically replaces the sidecar, so a crash
+    at any point leaves a consistent matrix/sidecar pair on disk.
+    """
+
+    def __post_init__(self):
+        self._validate_embedding_func()
+        # Use global config value if specified, otherwise use default
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+        else:
+            # Default behavior when workspace is empty
+            workspace_dir = working_dir
+            self.workspace = ""
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._workspace_dir = workspace_dir
+        self._meta_file = os.path.join(workspace_dir, f"vdb_{self.namespace}.meta.json")
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._storage_lock = None
+        self.storage_updated = None
+
+        self._load()
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(
+            self.namespace, workspace=self.workspace
+        )
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_namespace_lock(
+            self.namespace, workspace=self.workspace
+        )
+
+    # --------------------------------------------------------------------------------
+    # Internal helper methods
+    # --------------------------------------------------------------------------------
+
+    def _reset(self):
+        """Reset in-memory structures to an empty storage"""
+        # Rows [0, _size) of _matrix are in use, deleted rows are tombstoned in _alive
+        self._matrix = np.empty((0, self._dim), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0
+        self._ids: list[str | None] = []
+        self._meta: list[dict[str, Any] | None] = []
+        self._id_to_row: dict[str, int] = {}
+        self._dirty = False
+
+    def _matrix_path(self, generation: int) -> str:
+        return os.path.join(
+            self._workspace_dir, f"vdb_{self.namespace}.{generation}.npy"
+        )
+
+    def _matrix_files(self) -> list[str]:
+        pattern = os.path.join(
+            glob.escape(self._workspace_dir),
+            f"vdb_{glob.escape(self.namespace)}.[0-9]*.npy",
+        )
+        return glob.glob(pattern)
+
+    def _load(self):
+        """Load the metadata sidecar and map the matrix file of its generation"""
+        self._reset()
+        self._generation = 0
+        self._matrix_file = None
+        if not os.path.exists(self._meta_file):
+            logger.info(
+                f"[{self.workspace}] No existing vector matrix found for {self.namespace}"
+            )
+            return
+
+        with open(self._meta_file, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self._generation = meta.get("generation", 0)
+        ids = meta.get("ids", [])
+        if not ids:
+            return
+
+        self._matrix_file = self._matrix_path(self._generation)
+        if not os.path.exists(self._matrix_file):
+            error_msg = (
+                f"[{self.workspace}] Vector matrix {self._matrix_file} referenced by "
+                f"{self._meta_file} is missing"
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # Copy-on-write mapping: loading is O(1) and in-place row updates never touch the file
+        matrix = np.load(self._matrix_file, mmap_mode="c")
+        if matrix.ndim != 2 or matrix.shape[1] != self._dim:
+            error_msg = (
+                f"Dimension mismatch: vector matrix {self._matrix_file} has shape {matrix.shape}, "
+                f"but embedding function expects dimension {self._dim}. "
+                f"Please ensure the embedding model matches the stored vectors or rebuild the storage."
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        if matrix.shape[0] != len(ids):
+            # Never fall back to an empty storage: the next save would overwrite the files
+            error_msg = (
+                f"[{self.workspace}] Vector matrix and metadata of {self.namespace} are out of sync "
+                f"({matrix.shape[0]} != {len(ids)} rows in generation {self._generation})"
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self._matrix = matrix
+        self._size = len(ids)
+        self._alive = np.ones(self._size, dtype=bool)
+        self._ids = ids
+        self._meta = meta["data"]
+        self._id_to_row = {id: row for row, id in enumerate(ids)}
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} mapped {self._size} vectors for {self.namespace}"
+        )
+
+    def _reload_if_updated(self):
+        """Re-map storage files if another process updated them (caller holds the lock)"""
+        if self.storage_updated.value:
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+            )
+            self._load()
+            self.storage_updated.value = False
+
+    def _ensure_capacity(self, extra_rows: int):
+        """Grow the matrix geometrically so appends are amortized O(1)"""
+        needed = self._size + extra_rows
+        if needed <= self._matrix.shape[0]:
+            return
+        capacity = max(needed, 2 * self._matrix.shape[0], 64)
+        matrix = np.empty((capacity, self._dim), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        self._matrix = matrix
+        self._alive = alive
+
+    def _delete_rows(self, ids: list[str]) -> int:
+        deleted_count = 0
+        for id in ids:
+            row = self._id_to_row.pop(id, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._ids[row] = None
+            self._meta[row] = None
+            deleted_count += 1
+        if deleted_count:
+            self._dirty = True
+        return deleted_count
+
+    @staticmethod
+    def _format_record(meta: dict[str, Any]) -> dict[str, Any]:
+        return {
+            **meta,
+            "id": meta.get("__id__"),
+            "created_at": meta.get("__created_at__"),
+        }
+
+    def _save(self):
+        """Write live rows as a new generation, commit it and re-map the new matrix file"""
+        live_rows = np.flatnonzero(self._alive[: self._size])
+        matrix = np.ascontiguousarray(self._matrix[live_rows], dtype=np.float32)
+        generation = self._generation + 1
+        meta = {
+            "embedding_dim": self._dim,
+            "generation": generation,
+            "ids": [self._ids[row] for row in live_rows],
+            "data": [self._meta[row] for row in live_rows],
+        }
+
+        # The previous generation stays in place until the sidecar points at the new one
+        matrix_file = self._matrix_path(generation)
+        with open(matrix_file, "wb") as f:
+            np.save(f, matrix)
+            f.flush()
+            os.fsync(f.fileno())
+
+        tmp_meta_file = self._meta_file + ".tmp"
+        try:
+            with open(tmp_meta_file, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, separators=(",", ":"))
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            with open(tmp_meta_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    meta,
+                    f,
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                    cls=SanitizingJSONEncoder,
+                )
+
+        os.replace(tmp_meta_file, self._meta_file)
+        self._load()
+        self._remove_stale_matrix_files()
+
+    def _remove_stale_matrix_files(self):
+        """Remove matrix files of other generations (older or never committed)"""
+        for file_name in self._matrix_files():
+            if file_name == self._matrix_file:
+                continue
+            try:
+                os.remove(file_name)
+            except OSError as e:
+                # e.g. still mapped by another process on Windows, retried on the next save
+                logger.debug(f"[{self.workspace}] Could not remove {file_name}: {e}")
+
+    # --------------------------------------------------------------------------------
+    # BaseVectorStorage interface
+    # --------------------------------------------------------------------------------
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+        list_data = [
+            {
+                "__id__": k,
+                "__created_at__": current_time,
+                **{k1: v1 for k1, v1 in v.items() if k1 in self.meta_fields},
+            }
+            for k, v in data.items()
+        ]
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+        if len(embeddings) != len(list_data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(list_data)}"
+            )
+            return
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-12)
+
+        async with self._storage_lock:
+            self._reload_if_updated()
+            new_count = sum(1 for d in list_data if d["__id__"] not in self._id_to_row)
+            self._ensure_capacity(new_count)
+            for i, d in enumerate(list_data):
+                row = self._id_to_row.get(d["__id__"])
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._ids.append(d["__id__"])
+                    self._meta.append(d)
+                    self._id_to_row[d["__id__"]] = row
+                    self._alive[row] = True
+                else:
+                    self._meta[row] = d
+                self._matrix[row] = embeddings[i]
+            self._dirty = True
+
+    async def query(
+        self, query: str, top_k: int, query_embedding: list[float] = None
+    ) -> list[dict[str, Any]]:
+        # Use provided embedding or compute it
+        if query_embedding is not None:
+            embedding = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        else:
+            # Execute embedding outside of lock to avoid improve cocurrent
+            embedding = await self.embedding_func(
+                [query], _priority=5
+            )  # higher priority for query
+            embedding = np.asarray(embedding[0], dtype=np.float32).reshape(-1)
+        embedding = embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+
+        # Only the reload and a snapshot run under the cross-process lock: rows of the
+        # matrix are never rewritten in place on disk (_save writes a new generation)
+        async with self._storage_lock:
+            self._reload_if_updated()
+            size, matrix, alive, meta = (
+                self._size,
+                self._matrix,
+                self._alive,
+                self._meta,
+            )
+        if size == 0 or top_k <= 0:
+            return []
+
+        scores = matrix[:size] @ embedding
+        scores[~alive[:size]] = -np.inf
+        candidates = np.flatnonzero(scores >= self.cosine_better_than_threshold)
+        if len(candidates) > top_k:
+            top = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            {**self._format_record(meta[row]), "distance": float(scores[row])}
+            for row in candidates
+        ]
+
+    @property
+    async def client_storage(self):
+        async with self._storage_lock:
+            self._reload_if_updated()
+            return {"data": [meta for meta in self._meta[: self._size] if meta]}
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        try:
+            async with self._storage_lock:
+                self._reload_if_updated()
+                deleted_count = self._delete_rows(ids)
+            logger.debug(
+                f"[{self.workspace}] Successfully deleted {deleted_count} vectors from {self.namespace}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error while deleting vectors from {self.namespace}: {e}"
+            )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+        logger.debug(
+            f"[{self.workspace}] Attempting to delete entity {entity_name} with ID {entity_id}"
+        )
+        await self.delete([entity_id])
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        try:
+            async with self._storage_lock:
+                self._reload_if_updated()
+                ids_to_delete = [
+                    meta["__id__"]
+                    for meta in self._meta[: self._size]
+                    if meta
+                    and (
+                        meta.get("src_id") == entity_name
+                        or meta.get("tgt_id") == entity_name
+                    )
+                ]
+                deleted_count = self._delete_rows(ids_to_delete)
+            logger.debug(
+                f"[{self.workspace}] Deleted {deleted_count} relations for {entity_name}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error deleting relations for {entity_name}: {e}"
+            )
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._load()
+                self.storage_updated.value = False
+                return False  # Return error
+
+            if not self._dirty:
+                return True
+
+            try:
+                self._save()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace, workspace=self.workspace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error saving data for {self.namespace}: {e}"
+                )
+                return False  # Return error
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        async with self._storage_lock:
+            self._reload_if_updated()
+            row = self._id_to_row.get(id)
+            return self._format_record(self._meta[row]) if row is not None else None
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        async with self._storage_lock:
+            self._reload_if_updated()
+            results: list[dict[str, Any] | None] = []
+            for id in ids:
+                row = self._id_to_row.get(id)
+                results.append(
+                    self._format_record(self._meta[row]) if row is not None else None
+                )
+            return results
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """Get vectors by their IDs, returning only ID and vector data for efficiency
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Dictionary mapping IDs to their vector embeddings
+            Format: {id: [vector_values], ...}
+        """
+        if not ids:
+            return {}
+
+        async with self._storage_lock:
+            self._reload_if_updated()
+            found = [(id, self._id_to_row[id]) for id in ids if id in self._id_to_row]
+            if not found:
+                return {}
+            vectors = self._matrix[[row for _, row in found]]
+            return {id: vector.tolist() for (id, _), vector in zip(found, vectors)}
+
+    async def get_vectors_array_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        async with self._storage_lock:
+            self._reload_if_updated()
+            found_ids = [id for id in dict.fromkeys(ids) if id in self._id_to_row]
+            # Fancy indexing copies, so the result is detached from a memory-mapped file
+            rows = [self._id_to_row[id] for id in found_ids]
+            return found_ids, self._matrix[rows]
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove the matrix and metadata files if they exist
+        2. Reset the in-memory matrix
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                self._reset()
+                if os.path.exists(self._meta_file):
+                    os.remove(self._meta_file)
+                for file_name in self._matrix_files():
+                    os.remove(file_name)
+                self._matrix_file = None
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace, workspace=self.workspace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}(file:{self._meta_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
@@ -1,6 +1,10 @@
 import os
 import sys
 import asyncio
+import hashlib
+import shutil
+import tempfile
+import threading
 import multiprocessing as mp
 from multiprocessing.synchronize import Lock as ProcessLock
 from multiprocessing import Manager
@@ -9,8 +13,17 @@ import logging
 from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
 
+from lightrag.constants import (
+    DEFAULT_SHARED_STATE_BACKEND,
+    DEFAULT_SHARED_STATE_FLAG_CAPACITY,
+)
 from lightrag.exceptions import PipelineNotInitializedError
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 DEBUG_LOCKS = False
 
 
@@ -58,6 +71,19 @@ _is_multiprocess = None
 _workers = None
 _manager = None
 
+# Multi-process shared-state backend:
+#   "manager": locks and update flags are multiprocessing.Manager proxies (IPC per access)
+#   "shm": update flags live in a shared-memory byte array and locks are fcntl file locks,
+#          so flag reads and lock acquisition need no round-trip to the manager process.
+#          Namespace data (pipeline_status, init flags) stays in Manager dicts.
+SHARED_STATE_BACKENDS = ("manager", "shm")
+_backend: Optional[str] = None
+_flag_array = None  # mp.RawArray of update flag bytes (shm backend)
+_flag_next_slot = None  # mp.RawValue, next free slot in _flag_array (shm backend)
+_lock_dir: Optional[str] = None  # directory of lock files (shm backend)
+_lock_dir_owner_pid: Optional[int] = None
+_file_locks: Optional[Dict[str, List[Any]]] = None  # combined key -> [FileLock, count]
+
 # Global singleton data for multi-process keyed locks
 _lock_registry: Optional[Dict[str, mp.synchronize.Lock]] = None
 _lock_registry_count: Optional[Dict[str, int]] = None
@@ -134,6 +160,85 @@ def get_debug_n_locks_acquired():
     return _debug_n_locks_acquired
 
 
+class SharedFlag:
+    """Update flag stored in one byte of the shared-memory flag array (shm backend)
+
+    Exposes the same `.value` attribute as manager.Value("b"), but reads and writes go
+    straight to memory shared by the forked workers instead of through the manager.
+    Pickles to its slot index, so it can be kept in Manager lists.
+    """
+
+    __slots__ = ("_slot",)
+
+    def __init__(self, slot: int):
+        self._slot = slot
+
+    @property
+    def value(self) -> bool:
+        return bool(_flag_array[self._slot])
+
+    @value.setter
+    def value(self, value: bool) -> None:
+        _flag_array[self._slot] = 1 if value else 0
+
+    def __reduce__(self):
+        return (SharedFlag, (self._slot,))
+
+
+class FileLock:
+    """Cross-process mutex backed by fcntl.flock on a lock file (shm backend)
+
+    A thread lock serializes users within the process, and the flock excludes other
+    processes. Each process opens its own descriptor, because descriptors inherited
+    across fork share a single flock.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._fd: Optional[int] = None
+        self._fd_pid: Optional[int] = None
+        self._thread_lock = threading.Lock()
+
+    def _get_fd(self) -> int:
+        pid = os.getpid()
+        if self._fd is None or self._fd_pid != pid:
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._fd_pid = pid
+        return self._fd
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(self._get_fd(), flags)
+        except BlockingIOError:
+            self._thread_lock.release()
+            return False
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return True
+
+    def release(self) -> None:
+        fcntl.flock(self._get_fd(), fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def locked(self) -> bool:
+        return self._thread_lock.locked()
+
+    def close(self) -> None:
+        if self._fd is not None and self._fd_pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+        self._fd_pid = None
+
+
+def _lock_file_path(name: str) -> str:
+    digest = hashlib.sha1(name.encode("utf-8", "surrogatepass")).hexdigest()
+    return os.path.join(_lock_dir, f"{digest}.lock")
+
+
 class UnifiedLock(Generic[T]):
     """Provide a unified lock interface type for asyncio.Lock and multiprocessing.Lock"""
 
@@ -449,6 +554,16 @@ def _get_or_create_shared_raw_mp_lock(
     if not _is_multiprocess:
         return None
 
+    if _backend == "shm":
+        # Process-local reference counting, the lock file itself is the shared state
+        combined_key = _get_combined_key(factory_name, key)
+        entry = _file_locks.get(combined_key)
+        if entry is None:
+            entry = [FileLock(_lock_file_path(combined_key)), 0]
+            _file_locks[combined_key] = entry
+        entry[1] += 1
+        return entry[0]
+
     with _registry_guard:
         combined_key = _get_combined_key(factory_name, key)
         raw = _lock_registry.get(combined_key)
@@ -476,6 +591,18 @@ def _release_shared_raw_mp_lock(factory_name: str, key: str):
     if not _is_multiprocess:
         return
 
+    if _backend == "shm":
+        combined_key = _get_combined_key(factory_name, key)
+        entry = _file_locks.get(combined_key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            # Close the descriptor; the lock file is reopened on next use
+            _file_locks.pop(combined_key)
+            entry[0].close()
+        return
+
     global _earliest_mp_cleanup_time, _last_mp_cleanup_time
 
     with _registry_guard:
@@ -800,6 +927,9 @@ class KeyedUnifiedLock:
                         if _lock_cleanup_data is not None:
                             status["pending_mp_cleanup"] = len(_lock_cleanup_data)
 
+            elif _is_multiprocess and _file_locks is not None:
+                status["total_mp_locks"] = len(_file_locks)
+
             # Count async locks
             status["total_async_locks"] = len(self._async_lock_count)
             status["pending_async_cleanup"] = len(self._async_lock_cleanup_data)
@@ -1173,7 +1303,7 @@ def get_keyed_lock_status() -> Dict[str, Any]:
     return status
 
 
-def initialize_share_data(workers: int = 1):
+def initialize_share_data(workers: int = 1, backend: str | None = None):
     """
     Initialize shared storage data for single or multi-process mode.
 
@@ -1190,9 +1320,18 @@ def initialize_share_data(workers: int = 1):
     Args:
         workers (int): Number of worker processes. If 1, single-process mode is used.
                       If > 1, multi-process mode with shared memory is used.
+        backend (str | None): Multi-process shared-state backend, "manager" or "shm".
+                      Defaults to the SHARED_STATE_BACKEND environment variable. The "shm"
+                      backend needs fork-started workers (e.g. Gunicorn with preload) and fcntl.
     """
     global \
         _manager, \
+        _backend, \
+        _flag_array, \
+        _flag_next_slot, \
+        _lock_dir, \
+        _lock_dir_owner_pid, \
+        _file_locks, \
         _workers, \
         _is_multiprocess, \
         _lock_registry, \
@@ -1221,13 +1360,44 @@ def initialize_share_data(workers: int = 1):
 
     if workers > 1:
         _is_multiprocess = True
+        _backend = (
+            backend or os.getenv("SHARED_STATE_BACKEND", DEFAULT_SHARED_STATE_BACKEND)
+        ).lower()
+        if _backend not in SHARED_STATE_BACKENDS:
+            raise ValueError(
+                f"Invalid shared-state backend '{_backend}', expected one of {SHARED_STATE_BACKENDS}"
+            )
+        if _backend == "shm" and fcntl is None:
+            direct_log(
+                "Shared-state backend 'shm' requires fcntl, falling back to 'manager'",
+                level="WARNING",
+            )
+            _backend = "manager"
+
+        if _backend == "shm":
+            # Allocate shared memory before the Manager process and workers are forked
+            capacity = int(
+                os.getenv(
+                    "SHARED_STATE_FLAG_CAPACITY", DEFAULT_SHARED_STATE_FLAG_CAPACITY
+                )
+            )
+            _flag_array = mp.RawArray("b", capacity)
+            _flag_next_slot = mp.RawValue("i", 0)
+            _lock_dir = tempfile.mkdtemp(prefix="lightrag-locks-")
+            _lock_dir_owner_pid = os.getpid()
+            _file_locks = {}
+
         _manager = Manager()
-        _lock_registry = _manager.dict()
-        _lock_registry_count = _manager.dict()
-        _lock_cleanup_data = _manager.dict()
-        _registry_guard = _manager.RLock()
-        _internal_lock = _manager.Lock()
-        _data_init_lock = _manager.Lock()
+        if _backend == "shm":
+            _internal_lock = FileLock(_lock_file_path("internal_lock"))
+            _data_init_lock = FileLock(_lock_file_path("data_init_lock"))
+        else:
+            _lock_registry = _manager.dict()
+            _lock_registry_count = _manager.dict()
+            _lock_cleanup_data = _manager.dict()
+            _registry_guard = _manager.RLock()
+            _internal_lock = _manager.Lock()
+            _data_init_lock = _manager.Lock()
         _shared_dicts = _manager.dict()
         _init_flags = _manager.dict()
         _update_flags = _manager.dict()
@@ -1242,7 +1412,7 @@ def initialize_share_data(workers: int = 1):
         }
 
         direct_log(
-            f"Process {os.getpid()} Shared-Data created for Multiple Process (workers={workers})"
+            f"Process {os.getpid()} Shared-Data created for Multiple Process (workers={workers}, backend={_backend})"
         )
     else:
         _is_multiprocess = False
@@ -1327,7 +1497,17 @@ async def get_update_flag(namespace: str, workspace: str | None = None):
                 f"Process {os.getpid()} initialized updated flags for namespace: [{final_namespace}]"
             )
 
-        if _is_multiprocess and _manager is not None:
+        if _is_multiprocess and _backend == "shm":
+            slot = _flag_next_slot.value
+            if slot >= len(_flag_array):
+                raise RuntimeError(
+                    f"Shared update flag capacity ({len(_flag_array)}) exhausted, "
+                    "increase SHARED_STATE_FLAG_CAPACITY"
+                )
+            _flag_next_slot.value = slot + 1
+            new_update_flag = SharedFlag(slot)
+            new_update_flag.value = False
+        elif _is_multiprocess and _manager is not None:
             new_update_flag = _manager.Value("b", False)
         else:
             # Create a simple mutable object to store boolean value for compatibility with mutiprocess
@@ -1483,6 +1663,34 @@ async def get_namespace_data(
     return _shared_dicts[final_namespace]
 
 
+async def get_data_version(workspace: str | None = None) -> str:
+    """
+    Get the data version of a workspace, shared by all workers.
+
+    The version changes whenever bump_data_version() is called after an insert, delete or
+    graph edit, so results derived from the indexed data can be cached under it. It
+    includes a random epoch chosen when shared data is first initialized, so versions
+    never repeat across restarts.
+    """
+    version_namespace = await get_namespace_data("data_version", workspace=workspace)
+    epoch = version_namespace.get("epoch")
+    if epoch is None:
+        async with get_internal_lock():
+            if "epoch" not in version_namespace:
+                version_namespace.update({"epoch": os.urandom(8).hex(), "version": 0})
+            epoch = version_namespace["epoch"]
+    return f"{epoch}:{version_namespace.get('version', 0)}"
+
+
+async def bump_data_version(workspace: str | None = None) -> None:
+    """Mark the indexed data of a workspace as changed, see get_data_version()"""
+    version_namespace = await get_namespace_data("data_version", workspace=workspace)
+    async with get_internal_lock():
+        if "epoch" not in version_namespace:
+            version_namespace["epoch"] = os.urandom(8).hex()
+        version_namespace["version"] = version_namespace.get("version", 0) + 1
+
+
 class NamespaceLock:
     """
     Reusable namespace lock wrapper that creates a fresh context on each use.
@@ -1595,6 +1803,12 @@ def finalize_share_data():
     """
     global \
         _manager, \
+        _backend, \
+        _flag_array, \
+        _flag_next_slot, \
+        _lock_dir, \
+        _lock_dir_owner_pid, \
+        _file_locks, \
         _is_multiprocess, \
         _internal_lock, \
         _data_init_lock, \
@@ -1656,8 +1870,23 @@ def finalize_share_data():
                 f"Process {os.getpid()} Error shutting down Manager: {e}", level="ERROR"
             )
 
+    if _backend == "shm":
+        for lock in [_internal_lock, _data_init_lock] + [
+            entry[0] for entry in (_file_locks or {}).values()
+        ]:
+            if isinstance(lock, FileLock):
+                lock.close()
+        if _lock_dir is not None and _lock_dir_owner_pid == os.getpid():
+            shutil.rmtree(_lock_dir, ignore_errors=True)
+
     # Reset global variables
     _manager = None
+    _backend = None
+    _flag_array = None
+    _flag_next_slot = None
+    _lock_dir = None
+    _lock_dir_owner_pid = None
+    _file_locks = None
     _initialized = None
     _is_multiprocess = None
     _shared_dicts = None
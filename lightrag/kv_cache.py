@@ -0,0 +1,211 @@
+"""
+In-process hot-key cache in front of any BaseKVStorage.
+
+With networked KV backends (Redis, PostgreSQL, MongoDB) every LLM call pays two round
+trips to `llm_response_cache`: the lookup in `handle_cache` and the duplicate check in
+`save_to_cache`. `LRUCachedKVStorage` keeps recently read records (and known-missing
+keys) in a size- and TTL-bounded LRU: reads are served from it or filled from the
+backend, while `upsert`, `delete` and `drop` go to the backend and invalidate it. Written
+records are not cached as sent, since backends may add fields on write (PostgreSQL sets
+create_time/update_time in SQL); the next read fetches the stored record. Writes made by
+other processes become visible once the TTL expires.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from typing import Any
+
+from lightrag.base import BaseKVStorage
+
+# Cached value of a key the backend does not hold
+_MISSING = object()
+
+
+class LRUCachedKVStorage(BaseKVStorage):
+    """Read-through LRU wrapper around a BaseKVStorage, invalidated on writes
+
+    Attributes not defined here (backend-specific helpers, locks, clients) are looked up
+    on the wrapped storage.
+    """
+
+    def __init__(
+        self, storage: BaseKVStorage, max_entries: int = 10000, ttl: float = 0
+    ):
+        self.storage = storage
+        self.namespace = storage.namespace
+        self.workspace = storage.workspace
+        self.global_config = storage.global_config
+        self.embedding_func = storage.embedding_func
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        # key -> (expires_at, record or _MISSING)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # In-flight backend reads per key; a write during the read marks it stale
+        self._pending_reads: dict[str, int] = {}
+        self._stale_reads: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes missing on the wrapper itself
+        if name == "storage":
+            raise AttributeError(name)
+        return getattr(self.storage, name)
+
+    def _lookup(self, key: str) -> Any:
+        """Cached record, _MISSING for a known-missing key, or None if not cached"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at and expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else 0.0
+        if value is not None and value is not _MISSING:
+            value = copy.deepcopy(value)
+        self._entries[key] = (expires_at, _MISSING if value is None else value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _invalidate(self, keys) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+            if key in self._pending_reads:
+                self._stale_reads.add(key)
+
+    def _begin_reads(self, keys: list[str]) -> None:
+        for key in keys:
+            self._pending_reads[key] = self._pending_reads.get(key, 0) + 1
+
+    def _end_reads(self, keys: list[str], values: list[Any] | None) -> None:
+        for i, key in enumerate(keys):
+            if values is not None and key not in self._stale_reads:
+                self._store(key, values[i])
+            remaining = self._pending_reads[key] - 1
+            if remaining:
+                self._pending_reads[key] = remaining
+            else:
+                del self._pending_reads[key]
+                self._stale_reads.discard(key)
+
+    @staticmethod
+    def _copy(value: Any) -> dict[str, Any] | None:
+        return None if value is _MISSING else copy.deepcopy(value)
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        cached = self._lookup(id)
+        if cached is not None:
+            self.hits += 1
+            return self._copy(cached)
+        self.misses += 1
+        self._begin_reads([id])
+        try:
+            result = await self.storage.get_by_id(id)
+        except BaseException:
+            self._end_reads([id], None)
+            raise
+        self._end_reads([id], [result])
+        return result
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        results: list[Any] = [None] * len(ids)
+        missing: dict[str, list[int]] = {}
+        for i, key in enumerate(ids):
+            cached = self._lookup(key)
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                results[i] = self._copy(cached)
+        self.hits += len(ids) - sum(len(positions) for positions in missing.values())
+        self.misses += len(missing)
+        if missing:
+            keys = list(missing)
+            self._begin_reads(keys)
+            try:
+                fetched = await self.storage.get_by_ids(keys)
+            except BaseException:
+                self._end_reads(keys, None)
+                raise
+            self._end_reads(keys, fetched)
+            for key, value in zip(keys, fetched):
+                for position in missing[key]:
+                    results[position] = value
+        return results
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        unknown = set()
+        absent = set()
+        for key in keys:
+            cached = self._lookup(key)
+            if cached is None:
+                unknown.add(key)
+            elif cached is _MISSING:
+                absent.add(key)
+        if unknown:
+            absent |= await self.storage.filter_keys(unknown)
+        return absent
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        if not data:
+            return
+        # Invalidate after the write so reads that overlapped it are not cached
+        try:
+            await self.storage.upsert(data)
+        finally:
+            self._invalidate(data)
+
+    async def delete(self, ids: list[str]) -> None:
+        try:
+            await self.storage.delete(ids)
+        finally:
+            self._invalidate(ids)
+
+    async def is_empty(self) -> bool:
+        return await self.storage.is_empty()
+
+    async def index_done_callback(self) -> None:
+        await self.storage.index_done_callback()
+
+    async def drop(self) -> dict[str, str]:
+        try:
+            return await self.storage.drop()
+        finally:
+            self.clear()
+
+    async def initialize(self):
+        await self.storage.initialize()
+
+    async def finalize(self):
+        self.clear()
+        await self.storage.finalize()
+
+    def clear(self) -> None:
+        self._stale_reads.update(self._pending_reads)
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
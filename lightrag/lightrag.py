@@ -5,9 +5,11 @@ import asyncio
 import configparser
 import inspect
 import os
+import pickle
 import time
 import warnings
 from dataclasses import asdict, dataclass, field, replace
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timezone
 from functools import partial
 from typing import (
@@ -15,6 +17,7 @@ from typing import (
     AsyncIterator,
     Awaitable,
     Callable,
+    Iterable,
     Iterator,
     cast,
     final,
@@ -44,6 +47,22 @@ from lightrag.constants import (
     DEFAULT_MAX_EXTRACT_INPUT_TOKENS,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_CHUNKING_EXECUTOR,
+    DEFAULT_ADAPTIVE_CONCURRENCY,
+    DEFAULT_ADAPTIVE_CONCURRENCY_MIN,
+    DEFAULT_ADAPTIVE_CONCURRENCY_MAX_FACTOR,
+    DEFAULT_LLM_REQUESTS_PER_MINUTE,
+    DEFAULT_LLM_TOKENS_PER_MINUTE,
+    DEFAULT_EMBEDDING_REQUESTS_PER_MINUTE,
+    DEFAULT_EMBEDDING_TOKENS_PER_MINUTE,
+    DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS,
+    DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS,
+    DEFAULT_ENABLE_QUERY_RESPONSE_CACHE,
+    DEFAULT_QUERY_RESPONSE_CACHE_MAX_ENTRIES,
+    DEFAULT_SEMANTIC_QUERY_CACHE_MAX_ENTRIES,
+    DEFAULT_KV_LRU_CACHE_NAMESPACES,
+    DEFAULT_KV_LRU_CACHE_MAX_ENTRIES,
+    DEFAULT_KV_LRU_CACHE_TTL,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
     DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
@@ -51,6 +70,9 @@ from lightrag.constants import (
     DEFAULT_SUMMARY_LANGUAGE,
     DEFAULT_LLM_TIMEOUT,
     DEFAULT_EMBEDDING_TIMEOUT,
+    DEFAULT_EMBEDDING_MICRO_BATCH_WAIT_MS,
+    DEFAULT_ENABLE_EMBEDDING_CACHE,
+    DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES,
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
@@ -69,6 +91,8 @@ from lightrag.kg.shared_storage import (
     get_default_workspace,
     set_default_workspace,
     get_namespace_lock,
+    get_data_version,
+    bump_data_version,
 )
 
 from lightrag.base import (
@@ -85,9 +109,11 @@ from lightrag.base import (
     OllamaServerInfos,
     QueryResult,
 )
+from lightrag.metrics import pipeline_metrics
+from lightrag.tracing import start_query_trace
 from lightrag.namespace import NameSpace
 from lightrag.operate import (
-    chunking_by_token_size,
+    iter_chunks_by_token_size,
     extract_entities,
     merge_nodes_and_edges,
     kg_query,
@@ -103,6 +129,9 @@ from lightrag.utils import (
     compute_mdhash_id,
     lazy_external_import,
     priority_limit_async_func_call,
+    EmbeddingMicroBatcher,
+    create_chunking_executor,
+    run_chunking_job,
     get_content_summary,
     sanitize_text_for_encoding,
     check_storage_env_vars,
@@ -114,6 +143,15 @@ from lightrag.utils import (
     normalize_source_ids_limit_method,
 )
 from lightrag.types import KnowledgeGraph
+from lightrag.llm.client_cache import close_cached_clients
+from lightrag.embedding_cache import EmbeddingCache
+from lightrag.kv_cache import LRUCachedKVStorage
+from lightrag.query_cache import (
+    QueryResponseCache,
+    SemanticQueryCache,
+    query_cache_scope,
+    scoped_query_cache_key,
+)
 from dotenv import load_dotenv
 
 # use the .env that is inside the current folder
@@ -219,6 +257,24 @@ class LightRAG:
     )
     """Maximum tokens allowed for entity extraction input context."""
 
+    entity_extract_pack_max_tokens: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_PACK_MAX_TOKENS",
+            DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS,
+            int,
+        )
+    )
+    """Combine consecutive small chunks into one extraction LLM call while their total tokens fit this budget; 0 disables packing."""
+
+    entity_extract_pack_max_chunks: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_PACK_MAX_CHUNKS",
+            DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS,
+            int,
+        )
+    )
+    """Maximum number of chunks combined into one packed extraction call."""
+
     force_llm_summary_on_merge: int = field(
         default=get_env_value(
             "FORCE_LLM_SUMMARY_ON_MERGE", DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE, int
@@ -255,8 +311,12 @@ class LightRAG:
             int,
             int,
         ],
-        Union[List[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]],
-    ] = field(default_factory=lambda: chunking_by_token_size)
+        Union[
+            List[Dict[str, Any]],
+            Iterable[Dict[str, Any]],
+            Awaitable[List[Dict[str, Any]]],
+        ],
+    ] = field(default_factory=lambda: iter_chunks_by_token_size)
     """
     Custom chunking function for splitting text into chunks before processing.
 
@@ -273,12 +333,12 @@ class LightRAG:
 
 
     The function should return a list of dictionaries (or an awaitable that resolves to a list),
-    where each dictionary contains the following keys:
+    or an iterator/generator yielding them lazily, where each dictionary contains the following keys:
         - `tokens` (int): The number of tokens in the chunk.
         - `content` (str): The text content of the chunk.
         - `chunk_order_index` (int): Zero-based index indicating the chunk's order in the document.
 
-    Defaults to `chunking_by_token_size` if not specified.
+    Defaults to `iter_chunks_by_token_size` (the streaming variant of `chunking_by_token_size`) if not specified.
     """
 
     # Embedding
@@ -298,17 +358,47 @@ class LightRAG:
     )
     """Maximum number of concurrent embedding function calls."""
 
+    embedding_micro_batch_wait_ms: float = field(
+        default=get_env_value(
+            "EMBEDDING_MICRO_BATCH_WAIT_MS",
+            DEFAULT_EMBEDDING_MICRO_BATCH_WAIT_MS,
+            float,
+        )
+    )
+    """Time window (ms) for coalescing concurrent small embedding requests into a single
+    call of up to `embedding_batch_num` texts. Set to 0 to disable coalescing."""
+
+    enable_embedding_cache: bool = field(
+        default=get_env_value(
+            "ENABLE_EMBEDDING_CACHE", DEFAULT_ENABLE_EMBEDDING_CACHE, bool
+        )
+    )
+    """Persist embeddings keyed by (model_name, embedding_dim, text hash) in the workspace
+    directory so identical text is never sent to the embedding model twice. Requires
+    `embedding_func.model_name` to be set."""
+
+    embedding_cache_max_entries: int = field(
+        default=get_env_value(
+            "EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES, int
+        )
+    )
+    """Maximum number of vectors the embedding cache keeps in memory, least recently used
+    ones are evicted first. Set to 0 for no bound."""
+
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
             "enabled": False,
             "similarity_threshold": 0.95,
             "use_llm_check": False,
+            "max_entries": DEFAULT_SEMANTIC_QUERY_CACHE_MAX_ENTRIES,
         }
     )
-    """Configuration for embedding cache.
-    - enabled: If True, enables caching to avoid redundant computations.
-    - similarity_threshold: Minimum similarity score to use cached embeddings.
-    - use_llm_check: If True, validates cached embeddings using an LLM.
+    """Configuration for the in-process semantic query cache, which answers near-duplicate
+    phrasings of an earlier query.
+    - enabled: If True, store query results and look up similar earlier queries.
+    - similarity_threshold: Minimum cosine similarity between the two queries' embeddings.
+    - use_llm_check: If True, an LLM confirms the two queries ask the same thing.
+    - max_entries: Number of queries kept, least recently used ones are evicted first.
     """
 
     default_embedding_timeout: int = field(
@@ -353,6 +443,59 @@ class LightRAG:
         default=int(os.getenv("LLM_TIMEOUT", DEFAULT_LLM_TIMEOUT))
     )
 
+    adaptive_concurrency: bool = field(
+        default=get_env_value(
+            "ADAPTIVE_CONCURRENCY", DEFAULT_ADAPTIVE_CONCURRENCY, bool
+        )
+    )
+    """Adjust LLM and embedding concurrency with AIMD: back off on rate limits (429),
+    timeouts and rising latency, grow while calls are healthy. `llm_model_max_async` and
+    `embedding_func_max_async` become the starting limits."""
+
+    adaptive_concurrency_min: int = field(
+        default=get_env_value(
+            "ADAPTIVE_CONCURRENCY_MIN", DEFAULT_ADAPTIVE_CONCURRENCY_MIN, int
+        )
+    )
+    """Lower bound of the adaptive concurrency limit."""
+
+    adaptive_concurrency_max_factor: float = field(
+        default=get_env_value(
+            "ADAPTIVE_CONCURRENCY_MAX_FACTOR",
+            DEFAULT_ADAPTIVE_CONCURRENCY_MAX_FACTOR,
+            float,
+        )
+    )
+    """Upper bound of the adaptive limit, as a multiple of the configured max async."""
+
+    llm_requests_per_minute: int = field(
+        default=get_env_value(
+            "LLM_REQUESTS_PER_MINUTE", DEFAULT_LLM_REQUESTS_PER_MINUTE, int
+        )
+    )
+    """Provider request quota for LLM calls; 0 means unlimited."""
+
+    llm_tokens_per_minute: int = field(
+        default=get_env_value(
+            "LLM_TOKENS_PER_MINUTE", DEFAULT_LLM_TOKENS_PER_MINUTE, int
+        )
+    )
+    """Provider token quota for LLM calls, counted with `tokenizer` over prompt and completion; 0 means unlimited."""
+
+    embedding_requests_per_minute: int = field(
+        default=get_env_value(
+            "EMBEDDING_REQUESTS_PER_MINUTE", DEFAULT_EMBEDDING_REQUESTS_PER_MINUTE, int
+        )
+    )
+    """Provider request quota for embedding calls; 0 means unlimited."""
+
+    embedding_tokens_per_minute: int = field(
+        default=get_env_value(
+            "EMBEDDING_TOKENS_PER_MINUTE", DEFAULT_EMBEDDING_TOKENS_PER_MINUTE, int
+        )
+    )
+    """Provider token quota for embedding calls, counted with `tokenizer`; 0 means unlimited."""
+
     # Rerank Configuration
     # ---
 
@@ -376,6 +519,46 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    enable_query_response_cache: bool = field(
+        default=get_env_value(
+            "ENABLE_QUERY_RESPONSE_CACHE", DEFAULT_ENABLE_QUERY_RESPONSE_CACHE, bool
+        )
+    )
+    """Serve repeated queries from an in-process cache of complete results, checked before
+    any retrieval runs. Entries are invalidated by the workspace data version, which every
+    insert, delete and graph edit bumps."""
+
+    query_response_cache_max_entries: int = field(
+        default=get_env_value(
+            "QUERY_RESPONSE_CACHE_MAX_ENTRIES",
+            DEFAULT_QUERY_RESPONSE_CACHE_MAX_ENTRIES,
+            int,
+        )
+    )
+    """Maximum number of query results kept by the query response cache (LRU)."""
+
+    kv_lru_cache_namespaces: list[str] = field(
+        default_factory=lambda: get_env_value(
+            "KV_LRU_CACHE_NAMESPACES", list(DEFAULT_KV_LRU_CACHE_NAMESPACES), list
+        )
+    )
+    """KV storage namespaces (e.g. `llm_response_cache`, `text_chunks`, `entity_chunks`)
+    read through an in-process LRU, saving backend round trips for hot keys. Mainly
+    useful with networked KV backends such as Redis, PostgreSQL or MongoDB."""
+
+    kv_lru_cache_max_entries: int = field(
+        default=get_env_value(
+            "KV_LRU_CACHE_MAX_ENTRIES", DEFAULT_KV_LRU_CACHE_MAX_ENTRIES, int
+        )
+    )
+    """Maximum number of records kept per cached KV namespace."""
+
+    kv_lru_cache_ttl: float = field(
+        default=get_env_value("KV_LRU_CACHE_TTL", DEFAULT_KV_LRU_CACHE_TTL, float)
+    )
+    """Seconds a cached KV record is served before it is read again, bounding how long
+    writes made by other processes stay invisible. 0 disables expiry."""
+
     # Extensions
     # ---
 
@@ -384,6 +567,18 @@ class LightRAG:
     )
     """Maximum number of parallel insert operations."""
 
+    chunking_executor: str = field(
+        default=get_env_value("CHUNKING_EXECUTOR", DEFAULT_CHUNKING_EXECUTOR, str)
+    )
+    """Where the pipeline runs synchronous chunking functions: "none" (on the event loop),
+    "thread" (thread pool, for GIL-releasing tokenizers such as tiktoken) or "process"
+    (process pool; chunking_func and tokenizer must be picklable)."""
+
+    chunking_executor_workers: int = field(
+        default=get_env_value("CHUNKING_EXECUTOR_WORKERS", 0, int)
+    )
+    """Number of chunking workers. 0 uses `max_parallel_insert`."""
+
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
     )
@@ -476,6 +671,16 @@ class LightRAG:
 
         initialize_share_data()
 
+        # Created on first use; kept out of dataclass fields so asdict() never copies it
+        self._chunking_executor = None
+        # Priority-queue wrapped functions by role, for get_concurrency_status()
+        self._concurrency_limited_funcs: dict[str, Callable] = {}
+        self._query_response_cache = (
+            QueryResponseCache(self.query_response_cache_max_entries)
+            if self.enable_query_response_cache
+            else None
+        )
+
         if not os.path.exists(self.working_dir):
             logger.info(f"Creating working directory {self.working_dir}")
             os.makedirs(self.working_dir)
@@ -554,9 +759,37 @@ class LightRAG:
                 self.embedding_func_max_async,
                 llm_timeout=self.default_embedding_timeout,
                 queue_name="Embedding func",
+                **self._adaptive_concurrency_kwargs(self.embedding_func_max_async),
+                requests_per_minute=self.embedding_requests_per_minute,
+                tokens_per_minute=self.embedding_tokens_per_minute,
+                token_counter=self.tokenizer.count_tokens,
             )(self.embedding_func.func)
+            self._concurrency_limited_funcs["embedding"] = wrapped_func
+            # Coalesce concurrent small requests (e.g. per-entity upserts) into batched calls
+            if self.embedding_micro_batch_wait_ms > 0:
+                wrapped_func = EmbeddingMicroBatcher(
+                    wrapped_func,
+                    max_batch_size=self.embedding_batch_num,
+                    max_wait_ms=self.embedding_micro_batch_wait_ms,
+                )
+            embedding_cache = None
+            if self.enable_embedding_cache:
+                if self.embedding_func.model_name:
+                    embedding_cache = EmbeddingCache(
+                        self.working_dir,
+                        self.embedding_func.model_name,
+                        self.embedding_func.embedding_dim,
+                        workspace=self.workspace,
+                        max_entries=self.embedding_cache_max_entries,
+                    )
+                else:
+                    logger.warning(
+                        "Embedding cache disabled: embedding_func has no model_name to key cached vectors by"
+                    )
             # Use dataclasses.replace() to create a new instance, leaving the original unchanged
-            self.embedding_func = replace(self.embedding_func, func=wrapped_func)
+            self.embedding_func = replace(
+                self.embedding_func, func=wrapped_func, cache=embedding_cache
+            )
 
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
@@ -649,6 +882,21 @@ class LightRAG:
             meta_fields={"full_doc_id", "content", "file_path"},
         )
 
+        self._semantic_query_cache: SemanticQueryCache | None = None
+        if self.embedding_cache_config.get("enabled") and self.embedding_func:
+            self._semantic_query_cache = SemanticQueryCache(
+                self.embedding_func,
+                similarity_threshold=self.embedding_cache_config.get(
+                    "similarity_threshold", 0.95
+                ),
+                llm_check_func=self._semantic_cache_llm_check
+                if self.embedding_cache_config.get("use_llm_check")
+                else None,
+                max_entries=self.embedding_cache_config.get(
+                    "max_entries", DEFAULT_SEMANTIC_QUERY_CACHE_MAX_ENTRIES
+                ),
+            )
+
         # Initialize document status storage
         self.doc_status: DocStatusStorage = self.doc_status_storage_cls(
             namespace=NameSpace.DOC_STATUS,
@@ -657,6 +905,8 @@ class LightRAG:
             embedding_func=None,
         )
 
+        self._wrap_kv_lru_caches()
+
         # Directly use llm_response_cache, don't create a new object
         hashing_kv = self.llm_response_cache
 
@@ -665,6 +915,10 @@ class LightRAG:
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            **self._adaptive_concurrency_kwargs(self.llm_model_max_async),
+            requests_per_minute=self.llm_requests_per_minute,
+            tokens_per_minute=self.llm_tokens_per_minute,
+            token_counter=self.tokenizer.count_tokens,
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -672,6 +926,7 @@ class LightRAG:
                 **self.llm_model_kwargs,
             )
         )
+        self._concurrency_limited_funcs["llm"] = self.llm_model_func
 
         self._storages_status = StoragesStatus.CREATED
 
@@ -707,6 +962,7 @@ class LightRAG:
                 self.chunk_entity_relation_graph,
                 self.llm_response_cache,
                 self.doc_status,
+                self.embedding_func.cache if self.embedding_func else None,
             ):
                 if storage:
                     # logger.debug(f"Initializing storage: {storage}")
@@ -761,6 +1017,23 @@ class LightRAG:
             else:
                 logger.debug("All storages finalized successfully")
 
+            # Flush vectors embedded since the last pipeline persist
+            if self.embedding_func and self.embedding_func.cache:
+                try:
+                    await self.embedding_func.cache.index_done_callback()
+                except Exception as e:
+                    logger.error(f"Failed to persist embedding cache: {e}")
+
+            if self._chunking_executor is not None:
+                self._chunking_executor.shutdown(wait=False, cancel_futures=True)
+                self._chunking_executor = None
+
+            # Close pooled HTTP clients of the LLM and embedding bindings
+            try:
+                await close_cached_clients()
+            except Exception as e:
+                logger.error(f"Failed to close cached HTTP clients: {e}")
+
             self._storages_status = StoragesStatus.FINALIZED
 
     async def check_and_migrate_data(self):
@@ -1232,7 +1505,7 @@ class LightRAG:
             inserting_chunks: dict[str, Any] = {}
             for index, chunk_text in enumerate(text_chunks):
                 chunk_key = compute_mdhash_id(chunk_text, prefix="chunk-")
-                tokens = len(self.tokenizer.encode(chunk_text))
+                tokens = self.tokenizer.count_tokens(chunk_text)
                 inserting_chunks[chunk_key] = {
                     "content": chunk_text,
                     "full_doc_id": doc_key,
@@ -1845,23 +2118,33 @@ class LightRAG:
                             content = content_data["content"]
 
                             # Call chunking function, supporting both sync and async implementations
-                            chunking_result = self.chunking_func(
-                                self.tokenizer,
+                            chunking_args = (
                                 content,
                                 split_by_character,
                                 split_by_character_only,
                                 self.chunk_overlap_token_size,
                                 self.chunk_token_size,
                             )
+                            chunking_start = time.perf_counter()
+                            executor = self._get_chunking_executor()
+                            if executor is not None:
+                                # Keep tokenisation of large documents off the event loop
+                                chunking_result = await self._run_chunking_in_executor(
+                                    executor, chunking_args
+                                )
+                            else:
+                                chunking_result = self.chunking_func(
+                                    self.tokenizer, *chunking_args
+                                )
 
                             # If result is awaitable, await to get actual result
                             if inspect.isawaitable(chunking_result):
                                 chunking_result = await chunking_result
 
-                            # Validate return type
-                            if not isinstance(chunking_result, (list, tuple)):
+                            # Validate return type, iterators are consumed lazily below
+                            if not isinstance(chunking_result, (list, tuple, Iterator)):
                                 raise TypeError(
-                                    f"chunking_func must return a list or tuple of dicts, "
+                                    f"chunking_func must return a list, tuple or iterator of dicts, "
                                     f"got {type(chunking_result)}"
                                 )
 
@@ -1875,6 +2158,11 @@ class LightRAG:
                                 }
                                 for dp in chunking_result
                             }
+                            pipeline_metrics.observe_stage(
+                                "chunking",
+                                time.perf_counter() - chunking_start,
+                                items=len(chunks),
+                            )
 
                             if not chunks:
                                 logger.warning("No document chunks to process")
@@ -1914,7 +2202,11 @@ class LightRAG:
                                 )
                             )
                             chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
+                                pipeline_metrics.timed(
+                                    "chunk_vdb_upsert",
+                                    self.chunks_vdb.upsert(chunks),
+                                    items=len(chunks),
+                                )
                             )
                             text_chunks_task = asyncio.create_task(
                                 self.text_chunks.upsert(chunks)
@@ -2223,6 +2515,42 @@ class LightRAG:
                 pipeline_status["history_messages"].append(error_msg)
             raise e
 
+    def _get_chunking_executor(self) -> Executor | None:
+        """Return the chunking executor, creating it on first use"""
+        if (
+            self._chunking_executor is None
+            and (self.chunking_executor or "none").lower() != "none"
+            and not inspect.iscoroutinefunction(self.chunking_func)
+        ):
+            kind = self.chunking_executor.lower()
+            if kind == "process":
+                try:
+                    pickle.dumps(self.chunking_func)
+                except Exception as e:
+                    logger.warning(
+                        f"chunking_func cannot be sent to a process pool ({e}), chunking on the event loop"
+                    )
+                    self.chunking_executor = "none"
+                    return None
+            workers = self.chunking_executor_workers or self.max_parallel_insert
+            self._chunking_executor = create_chunking_executor(
+                kind, workers, self.tokenizer
+            )
+            logger.info(f"Chunking runs in a {kind} pool with {workers} workers")
+        return self._chunking_executor
+
+    async def _run_chunking_in_executor(
+        self, executor: Executor, chunking_args: tuple
+    ) -> list[dict[str, Any]]:
+        # Process workers already hold the tokenizer from the pool initializer
+        tokenizer = (
+            None if isinstance(executor, ProcessPoolExecutor) else self.tokenizer
+        )
+        return await asyncio.get_running_loop().run_in_executor(
+            executor,
+            partial(run_chunking_job, self.chunking_func, tokenizer, *chunking_args),
+        )
+
     async def _insert_done(
         self, pipeline_status=None, pipeline_status_lock=None
     ) -> None:
@@ -2241,10 +2569,15 @@ class LightRAG:
                 self.relationships_vdb,
                 self.chunks_vdb,
                 self.chunk_entity_relation_graph,
+                self.embedding_func.cache if self.embedding_func else None,
             ]
             if storage_inst is not None
         ]
-        await asyncio.gather(*tasks)
+        await pipeline_metrics.timed(
+            "index_flush", asyncio.gather(*tasks), items=len(tasks)
+        )
+        # Invalidate cached query results of every worker
+        await bump_data_version(self.workspace)
 
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
@@ -2274,7 +2607,7 @@ class LightRAG:
                 chunk_content = sanitize_text_for_encoding(chunk_data["content"])
                 source_id = chunk_data["source_id"]
                 file_path = chunk_data.get("file_path", "custom_kg")
-                tokens = len(self.tokenizer.encode(chunk_content))
+                tokens = self.tokenizer.count_tokens(chunk_content)
                 chunk_order_index = (
                     0
                     if "chunk_order_index" not in chunk_data.keys()
@@ -2587,6 +2920,19 @@ class LightRAG:
                         "relations_after_truncation": int,  # Relations after token truncation
                         "merged_chunks_count": int,          # Chunks before final processing
                         "final_chunks_count": int            # Final chunks in result
+                    },
+                    "stage_timings_ms": {                   # Retrieval stage wall-clock times (ms)
+                        "local_search": float,              # Entity retrieval from ll_keywords
+                        "global_search": float,             # Relation retrieval from hl_keywords
+                        "vector_search": float,             # Chunk retrieval (mix mode)
+                        "query_embedding": float,           # Query embedding
+                        "kg_search": float                  # All stages above, run concurrently
+                    },
+                    "trace": {                              # Only with QueryParam(trace=True)
+                        "trace_id": str,
+                        "duration_ms": float,
+                        "storage_round_trips": int,
+                        "spans": List[dict]                 # OpenTelemetry-style spans
                     }
                 }
             }
@@ -2643,47 +2989,59 @@ class LightRAG:
             model_func=param.model_func,
             user_prompt=param.user_prompt,
             enable_rerank=param.enable_rerank,
+            trace=param.trace,
         )
 
-        query_result = None
+        cache_scope = await self._query_cache_scope("data", param)
+        if (cached := await self._lookup_query_caches(query, cache_scope)) is not None:
+            return cached
 
-        if data_param.mode in ["local", "global", "hybrid", "mix"]:
-            logger.debug(f"[aquery_data] Using kg_query for mode: {data_param.mode}")
-            query_result = await kg_query(
-                query.strip(),
-                self.chunk_entity_relation_graph,
-                self.entities_vdb,
-                self.relationships_vdb,
-                self.text_chunks,
-                data_param,  # Use data_param with only_need_context=True
-                global_config,
-                hashing_kv=self.llm_response_cache,
-                system_prompt=None,
-                chunks_vdb=self.chunks_vdb,
-            )
-        elif data_param.mode == "naive":
-            logger.debug(f"[aquery_data] Using naive_query for mode: {data_param.mode}")
-            query_result = await naive_query(
-                query.strip(),
-                self.chunks_vdb,
-                data_param,  # Use data_param with only_need_context=True
-                global_config,
-                hashing_kv=self.llm_response_cache,
-                system_prompt=None,
-            )
-        elif data_param.mode == "bypass":
-            logger.debug("[aquery_data] Using bypass mode")
-            # bypass mode returns empty data using convert_to_user_format
-            empty_raw_data = convert_to_user_format(
-                [],  # no entities
-                [],  # no relationships
-                [],  # no chunks
-                [],  # no references
-                "bypass",
-            )
-            query_result = QueryResult(content="", raw_data=empty_raw_data)
-        else:
-            raise ValueError(f"Unknown mode {data_param.mode}")
+        with start_query_trace(
+            data_param.trace, "lightrag.aquery_data", mode=data_param.mode
+        ) as trace:
+            query_result = None
+
+            if data_param.mode in ["local", "global", "hybrid", "mix"]:
+                logger.debug(
+                    f"[aquery_data] Using kg_query for mode: {data_param.mode}"
+                )
+                query_result = await kg_query(
+                    query.strip(),
+                    self.chunk_entity_relation_graph,
+                    self.entities_vdb,
+                    self.relationships_vdb,
+                    self.text_chunks,
+                    data_param,  # Use data_param with only_need_context=True
+                    global_config,
+                    hashing_kv=self.llm_response_cache,
+                    system_prompt=None,
+                    chunks_vdb=self.chunks_vdb,
+                )
+            elif data_param.mode == "naive":
+                logger.debug(
+                    f"[aquery_data] Using naive_query for mode: {data_param.mode}"
+                )
+                query_result = await naive_query(
+                    query.strip(),
+                    self.chunks_vdb,
+                    data_param,  # Use data_param with only_need_context=True
+                    global_config,
+                    hashing_kv=self.llm_response_cache,
+                    system_prompt=None,
+                )
+            elif data_param.mode == "bypass":
+                logger.debug("[aquery_data] Using bypass mode")
+                # bypass mode returns empty data using convert_to_user_format
+                empty_raw_data = convert_to_user_format(
+                    [],  # no entities
+                    [],  # no relationships
+                    [],  # no chunks
+                    [],  # no references
+                    "bypass",
+                )
+                query_result = QueryResult(content="", raw_data=empty_raw_data)
+            else:
+                raise ValueError(f"Unknown mode {data_param.mode}")
 
         if query_result is None:
             no_result_message = "Query returned no results"
@@ -2715,6 +3073,11 @@ class LightRAG:
             else:
                 logger.warning("[aquery_data] No data section found in query result")
 
+        if trace is not None:
+            final_data.setdefault("metadata", {})["trace"] = trace.to_dict()
+        elif cache_scope is not None and final_data.get("status") == "success":
+            await self._store_query_caches(query, cache_scope, final_data)
+
         await self._query_done()
         return final_data
 
@@ -2743,73 +3106,84 @@ class LightRAG:
         global_config = asdict(self)
 
         try:
-            query_result = None
-
-            if param.mode in ["local", "global", "hybrid", "mix"]:
-                query_result = await kg_query(
-                    query.strip(),
-                    self.chunk_entity_relation_graph,
-                    self.entities_vdb,
-                    self.relationships_vdb,
-                    self.text_chunks,
-                    param,
-                    global_config,
-                    hashing_kv=self.llm_response_cache,
-                    system_prompt=system_prompt,
-                    chunks_vdb=self.chunks_vdb,
-                )
-            elif param.mode == "naive":
-                query_result = await naive_query(
-                    query.strip(),
-                    self.chunks_vdb,
-                    param,
-                    global_config,
-                    hashing_kv=self.llm_response_cache,
-                    system_prompt=system_prompt,
-                )
-            elif param.mode == "bypass":
-                # Bypass mode: directly use LLM without knowledge retrieval
-                use_llm_func = param.model_func or global_config["llm_model_func"]
-                # Apply higher priority (8) to entity/relation summary tasks
-                use_llm_func = partial(use_llm_func, _priority=8)
-
-                param.stream = True if param.stream is None else param.stream
-                response = await use_llm_func(
-                    query.strip(),
-                    system_prompt=system_prompt,
-                    history_messages=param.conversation_history,
-                    enable_cot=True,
-                    stream=param.stream,
-                )
-                if type(response) is str:
-                    return {
-                        "status": "success",
-                        "message": "Bypass mode LLM non streaming response",
-                        "data": {},
-                        "metadata": {},
-                        "llm_response": {
-                            "content": response,
-                            "response_iterator": None,
-                            "is_streaming": False,
-                        },
-                    }
+            cache_scope = await self._query_cache_scope("llm", param, system_prompt)
+            if (
+                cached := await self._lookup_query_caches(query, cache_scope)
+            ) is not None:
+                return cached
+
+            with start_query_trace(
+                param.trace, "lightrag.aquery_llm", mode=param.mode
+            ) as trace:
+                query_result = None
+
+                if param.mode in ["local", "global", "hybrid", "mix"]:
+                    query_result = await kg_query(
+                        query.strip(),
+                        self.chunk_entity_relation_graph,
+                        self.entities_vdb,
+                        self.relationships_vdb,
+                        self.text_chunks,
+                        param,
+                        global_config,
+                        hashing_kv=self.llm_response_cache,
+                        system_prompt=system_prompt,
+                        chunks_vdb=self.chunks_vdb,
+                    )
+                elif param.mode == "naive":
+                    query_result = await naive_query(
+                        query.strip(),
+                        self.chunks_vdb,
+                        param,
+                        global_config,
+                        hashing_kv=self.llm_response_cache,
+                        system_prompt=system_prompt,
+                    )
+                elif param.mode == "bypass":
+                    # Bypass mode: directly use LLM without knowledge retrieval
+                    use_llm_func = param.model_func or global_config["llm_model_func"]
+                    # Apply higher priority (8) to entity/relation summary tasks
+                    use_llm_func = partial(use_llm_func, _priority=8)
+
+                    param.stream = True if param.stream is None else param.stream
+                    response = await use_llm_func(
+                        query.strip(),
+                        system_prompt=system_prompt,
+                        history_messages=param.conversation_history,
+                        enable_cot=True,
+                        stream=param.stream,
+                    )
+                    if type(response) is str:
+                        return {
+                            "status": "success",
+                            "message": "Bypass mode LLM non streaming response",
+                            "data": {},
+                            "metadata": {},
+                            "llm_response": {
+                                "content": response,
+                                "response_iterator": None,
+                                "is_streaming": False,
+                            },
+                        }
+                    else:
+                        return {
+                            "status": "success",
+                            "message": "Bypass mode LLM streaming response",
+                            "data": {},
+                            "metadata": {},
+                            "llm_response": {
+                                "content": None,
+                                "response_iterator": response,
+                                "is_streaming": True,
+                            },
+                        }
                 else:
-                    return {
-                        "status": "success",
-                        "message": "Bypass mode LLM streaming response",
-                        "data": {},
-                        "metadata": {},
-                        "llm_response": {
-                            "content": None,
-                            "response_iterator": response,
-                            "is_streaming": True,
-                        },
-                    }
-            else:
-                raise ValueError(f"Unknown mode {param.mode}")
+                    raise ValueError(f"Unknown mode {param.mode}")
 
             await self._query_done()
 
+            trace_data = {"trace": trace.to_dict()} if trace is not None else {}
+
             # Check if query_result is None
             if query_result is None:
                 return {
@@ -2819,6 +3193,7 @@ class LightRAG:
                     "metadata": {
                         "failure_reason": "no_results",
                         "mode": param.mode,
+                        **trace_data,
                     },
                     "llm_response": {
                         "content": PROMPTS["fail_response"],
@@ -2829,6 +3204,8 @@ class LightRAG:
 
             # Extract structured data from query result
             raw_data = query_result.raw_data or {}
+            if trace_data:
+                raw_data.setdefault("metadata", {}).update(trace_data)
             raw_data["llm_response"] = {
                 "content": query_result.content
                 if not query_result.is_streaming
@@ -2838,6 +3215,12 @@ class LightRAG:
                 else None,
                 "is_streaming": query_result.is_streaming,
             }
+            if (
+                cache_scope is not None
+                and not query_result.is_streaming
+                and raw_data.get("status") == "success"
+            ):
+                await self._store_query_caches(query, cache_scope, raw_data)
 
             return raw_data
 
@@ -2882,6 +3265,71 @@ class LightRAG:
     async def _query_done(self):
         await self.llm_response_cache.index_done_callback()
 
+    async def _query_cache_scope(
+        self, kind: str, param: QueryParam, system_prompt: str | None = None
+    ) -> tuple[str, str] | None:
+        """(scope, data_version) under which the result is cached, or None if no query
+        cache applies"""
+        if self._query_response_cache is None and self._semantic_query_cache is None:
+            return None
+        scope = query_cache_scope(kind, param, system_prompt)
+        if scope is None:
+            return None
+        return scope, await get_data_version(self.workspace)
+
+    async def _lookup_query_caches(
+        self, query: str, cache_scope: tuple[str, str] | None
+    ) -> dict | None:
+        if cache_scope is None:
+            return None
+        scope, data_version = cache_scope
+        if self._query_response_cache is not None:
+            result = self._query_response_cache.get(
+                scoped_query_cache_key(scope, query, data_version)
+            )
+            if result is not None:
+                logger.info(" == Query response cache hit, skipping retrieval ==")
+                return result
+        if self._semantic_query_cache is not None:
+            try:
+                result = await self._semantic_query_cache.lookup(
+                    query, scope, data_version
+                )
+            except Exception as e:
+                logger.warning(f"Semantic query cache lookup failed: {e}")
+                return None
+            if result is not None:
+                logger.info(
+                    " == Semantic query cache hit "
+                    f"(similarity {result['metadata']['semantic_cache']['similarity']}), "
+                    "skipping retrieval =="
+                )
+            return result
+        return None
+
+    async def _store_query_caches(
+        self, query: str, cache_scope: tuple[str, str], result: dict
+    ) -> None:
+        scope, data_version = cache_scope
+        if self._query_response_cache is not None:
+            self._query_response_cache.put(
+                scoped_query_cache_key(scope, query, data_version), result
+            )
+        if self._semantic_query_cache is not None:
+            try:
+                await self._semantic_query_cache.store(
+                    query, scope, data_version, result
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store query in semantic cache: {e}")
+
+    async def _semantic_cache_llm_check(self, cached_query: str, query: str) -> bool:
+        prompt = PROMPTS["semantic_cache_check"].format(
+            cached_query=cached_query, query=query
+        )
+        response = await self.llm_model_func(prompt, _priority=5)
+        return response.strip().strip('".').lower().startswith("yes")
+
     async def aclear_cache(self) -> None:
         """Clear all cache data from the LLM response cache storage.
 
@@ -2905,6 +3353,11 @@ class LightRAG:
 
             await self.llm_response_cache.index_done_callback()
 
+            if self._query_response_cache is not None:
+                self._query_response_cache.clear()
+            if self._semantic_query_cache is not None:
+                self._semantic_query_cache.clear()
+
         except Exception as e:
             logger.error(f"Error while clearing cache: {e}")
 
@@ -2912,6 +3365,102 @@ class LightRAG:
         """Synchronous version of aclear_cache."""
         return always_get_an_event_loop().run_until_complete(self.aclear_cache())
 
+    def get_embedding_cache_stats(self) -> dict[str, Any] | None:
+        """Return size, hits, misses and hit_rate of the embedding cache, or None if disabled."""
+        if not self.embedding_func or not self.embedding_func.cache:
+            return None
+        return self.embedding_func.cache.stats()
+
+    def get_query_cache_stats(self) -> dict[str, Any] | None:
+        """Return size, hits, misses and hit_rate of the query response cache, or None if disabled."""
+        if self._query_response_cache is None:
+            return None
+        return self._query_response_cache.stats()
+
+    def get_semantic_cache_stats(self) -> dict[str, Any] | None:
+        """Return lookups, hits, near misses, LLM check rejections, reported false hits and
+        hit similarities of the semantic query cache, or None if disabled."""
+        if self._semantic_query_cache is None:
+            return None
+        return self._semantic_query_cache.stats()
+
+    async def areport_semantic_cache_false_hit(self, entry_id: str) -> None:
+        """Report that a semantic cache hit did not answer the query.
+
+        `entry_id` is `result["metadata"]["semantic_cache"]["entry_id"]` of the served
+        result; the entry is removed and counted in `false_hit_rate`.
+        """
+        if self._semantic_query_cache is None:
+            return
+        await self._semantic_query_cache.report_false_hit(entry_id)
+
+    def get_kv_cache_stats(self) -> dict[str, dict[str, Any]]:
+        """Return size, hits, misses, hit_rate, evictions and expirations of each KV
+        namespace read through the in-process LRU, keyed by namespace."""
+        return {
+            storage.namespace: storage.stats()
+            for storage in self._kv_storages().values()
+            if isinstance(storage, LRUCachedKVStorage)
+        }
+
+    def _kv_storages(self) -> dict[str, BaseKVStorage]:
+        return {
+            attr: getattr(self, attr)
+            for attr in (
+                "llm_response_cache",
+                "text_chunks",
+                "full_docs",
+                "full_entities",
+                "full_relations",
+                "entity_chunks",
+                "relation_chunks",
+            )
+        }
+
+    def _wrap_kv_lru_caches(self) -> None:
+        if not self.kv_lru_cache_namespaces:
+            return
+        wrapped = set()
+        for attr, storage in self._kv_storages().items():
+            if storage.namespace in self.kv_lru_cache_namespaces:
+                setattr(
+                    self,
+                    attr,
+                    LRUCachedKVStorage(
+                        storage,
+                        max_entries=self.kv_lru_cache_max_entries,
+                        ttl=self.kv_lru_cache_ttl,
+                    ),
+                )
+                wrapped.add(storage.namespace)
+        unknown = set(self.kv_lru_cache_namespaces) - wrapped
+        if unknown:
+            logger.warning(
+                f"KV_LRU_CACHE_NAMESPACES: unknown KV namespaces {sorted(unknown)} ignored"
+            )
+
+    def _adaptive_concurrency_kwargs(self, max_async: int) -> dict[str, Any]:
+        if not self.adaptive_concurrency:
+            return {}
+        return {
+            "adaptive": True,
+            "min_concurrency": self.adaptive_concurrency_min,
+            "max_concurrency": max(
+                max_async, int(max_async * self.adaptive_concurrency_max_factor)
+            ),
+        }
+
+    def get_concurrency_status(self) -> dict[str, dict[str, Any]]:
+        """Return the concurrency limit, load, adaptive controller and rate-limit state of the LLM and embedding queues."""
+        return {
+            name: func.concurrency_state()
+            for name, func in self._concurrency_limited_funcs.items()
+        }
+
+    def get_pipeline_metrics(self) -> dict[str, Any]:
+        """Return per-stage ingestion latency/throughput and LLM cache counters of this process."""
+        return pipeline_metrics.snapshot()
+
     async def get_docs_by_status(
         self, status: DocStatus
     ) -> dict[str, DocProcessingStatus]:
@@ -3016,6 +3565,8 @@ class LightRAG:
         - Prevents concurrent single deletions that could cause race conditions
         - Rejects operations when pipeline is busy with non-deletion tasks
 
+        Use `adelete_by_doc_ids` to delete many documents with a single graph/VDB rebuild pass.
+
         Args:
             doc_id (str): The unique identifier of the document to be deleted.
             delete_llm_cache (bool): Whether to delete cached LLM extraction results
@@ -3029,6 +3580,49 @@ class LightRAG:
                 - `status_code` (int): HTTP status code (e.g., 200, 404, 403, 500).
                 - `file_path` (str | None): The file path of the deleted document, if available.
         """
+        results = await self._delete_documents(
+            [doc_id], delete_llm_cache, job_name="Single document deletion"
+        )
+        return results[0]
+
+    async def adelete_by_doc_ids(
+        self, doc_ids: list[str], delete_llm_cache: bool = False
+    ) -> list[DeletionResult]:
+        """Delete several documents and their related data in one pass.
+
+        Affected entities and relations are collected across all documents, chunk tracking
+        data is read in batches, and each affected entity or relation is deleted or rebuilt
+        only once, so purging N documents costs one graph/VDB rebuild instead of N.
+
+        Uses the same pipeline concurrency control as `adelete_by_doc_id`: the pipeline is
+        acquired with a job name that does not start with "deleting", or the call joins a
+        batch deletion job already started by `background_delete_documents`.
+
+        Args:
+            doc_ids (list[str]): IDs of the documents to delete. Duplicates are ignored.
+            delete_llm_cache (bool): Whether to delete cached LLM extraction results
+                associated with the documents. Defaults to False.
+
+        Returns:
+            list[DeletionResult]: One result per unique document ID, in request order.
+                Documents are deleted together, so a failure while processing the graph
+                marks every found document as failed.
+        """
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return []
+        return await self._delete_documents(
+            doc_ids,
+            delete_llm_cache,
+            job_name=f"Bulk deletion of {len(doc_ids)} documents",
+        )
+
+    async def _delete_documents(
+        self, doc_ids: list[str], delete_llm_cache: bool, job_name: str
+    ) -> list[DeletionResult]:
+        """Shared implementation of adelete_by_doc_id and adelete_by_doc_ids"""
+        target = doc_ids[0] if len(doc_ids) == 1 else f"{len(doc_ids)} documents"
+
         # Get pipeline status shared data and lock for validation
         pipeline_status = await get_namespace_data(
             "pipeline_status", workspace=self.workspace
@@ -3037,6 +3631,12 @@ class LightRAG:
             "pipeline_status", workspace=self.workspace
         )
 
+        async def report(message: str) -> None:
+            logger.info(message)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = message
+                pipeline_status["history_messages"].append(message)
+
         # Track whether WE acquired the pipeline
         we_acquired_pipeline = False
 
@@ -3048,142 +3648,138 @@ class LightRAG:
                 pipeline_status.update(
                     {
                         "busy": True,
-                        "job_name": "Single document deletion",
+                        "job_name": job_name,
                         "job_start": datetime.now(timezone.utc).isoformat(),
-                        "docs": 1,
+                        "docs": len(doc_ids),
                         "batchs": 1,
                         "cur_batch": 0,
                         "request_pending": False,
                         "cancellation_requested": False,
-                        "latest_message": f"Starting deletion for document: {doc_id}",
+                        "latest_message": f"Starting deletion for document: {target}",
                     }
                 )
                 # Initialize history messages
                 pipeline_status["history_messages"][:] = [
-                    f"Starting deletion for document: {doc_id}"
+                    f"Starting deletion for document: {target}"
                 ]
             else:
                 # Pipeline already busy - verify it's a deletion job
-                job_name = pipeline_status.get("job_name", "").lower()
-                if not job_name.startswith("deleting") or "document" not in job_name:
-                    return DeletionResult(
-                        status="not_allowed",
-                        doc_id=doc_id,
-                        message=f"Deletion not allowed: current job '{pipeline_status.get('job_name')}' is not a document deletion job",
-                        status_code=403,
-                        file_path=None,
-                    )
+                current_job = pipeline_status.get("job_name", "").lower()
+                if (
+                    not current_job.startswith("deleting")
+                    or "document" not in current_job
+                ):
+                    return [
+                        DeletionResult(
+                            status="not_allowed",
+                            doc_id=doc_id,
+                            message=f"Deletion not allowed: current job '{pipeline_status.get('job_name')}' is not a document deletion job",
+                            status_code=403,
+                            file_path=None,
+                        )
+                        for doc_id in doc_ids
+                    ]
                 # Pipeline is busy with deletion - proceed without acquiring
 
         deletion_operations_started = False
         original_exception = None
         doc_llm_cache_ids: list[str] = []
+        results: dict[str, DeletionResult] = {}
+        file_paths: dict[str, str | None] = {}
+        log_message = ""
 
-        async with pipeline_status_lock:
-            log_message = f"Starting deletion process for document {doc_id}"
-            logger.info(log_message)
-            pipeline_status["latest_message"] = log_message
-            pipeline_status["history_messages"].append(log_message)
+        await report(f"Starting deletion process for document {target}")
 
         try:
             # 1. Get the document status and related data
-            doc_status_data = await self.doc_status.get_by_id(doc_id)
-            file_path = doc_status_data.get("file_path") if doc_status_data else None
-            if not doc_status_data:
-                logger.warning(f"Document {doc_id} not found")
-                return DeletionResult(
-                    status="not_found",
-                    doc_id=doc_id,
-                    message=f"Document {doc_id} not found.",
-                    status_code=404,
-                    file_path="",
-                )
-
-            # Check document status and log warning for non-completed documents
-            raw_status = doc_status_data.get("status")
-            try:
-                doc_status = DocStatus(raw_status)
-            except ValueError:
-                doc_status = raw_status
-
-            if doc_status != DocStatus.PROCESSED:
-                if doc_status == DocStatus.PENDING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PENDING)"
-                    )
-                elif doc_status == DocStatus.PROCESSING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PROCESSING)"
-                    )
-                elif doc_status == DocStatus.PREPROCESSED:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PREPROCESSED)"
-                    )
-                elif doc_status == DocStatus.FAILED:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: FAILED)"
+            doc_status_list = await self.doc_status.get_by_ids(doc_ids)
+            found_doc_ids: list[str] = []
+            chunkless_doc_ids: list[str] = []
+            chunk_ids: set[str] = set()
+
+            for doc_id, doc_status_data in zip(doc_ids, doc_status_list):
+                if not doc_status_data:
+                    logger.warning(f"Document {doc_id} not found")
+                    results[doc_id] = DeletionResult(
+                        status="not_found",
+                        doc_id=doc_id,
+                        message=f"Document {doc_id} not found.",
+                        status_code=404,
+                        file_path="",
                     )
-                else:
+                    continue
+
+                file_path = doc_status_data.get("file_path")
+                file_paths[doc_id] = file_path
+
+                # Check document status and log warning for non-completed documents
+                raw_status = doc_status_data.get("status")
+                try:
+                    doc_status = DocStatus(raw_status)
+                except ValueError:
+                    doc_status = raw_status
+
+                if doc_status != DocStatus.PROCESSED:
                     status_text = (
                         doc_status.value
                         if isinstance(doc_status, DocStatus)
                         else str(doc_status)
                     )
-                    warning_msg = (
+                    await report(
                         f"Deleting {doc_id} {file_path}(previous status: {status_text})"
                     )
-                logger.info(warning_msg)
-                # Update pipeline status for monitoring
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = warning_msg
-                    pipeline_status["history_messages"].append(warning_msg)
 
-            # 2. Get chunk IDs from document status
-            chunk_ids = set(doc_status_data.get("chunks_list", []))
+                # 2. Get chunk IDs from document status
+                doc_chunk_ids = set(doc_status_data.get("chunks_list", []))
+                if doc_chunk_ids:
+                    found_doc_ids.append(doc_id)
+                    chunk_ids.update(doc_chunk_ids)
+                else:
+                    logger.warning(f"No chunks found for document {doc_id}")
+                    chunkless_doc_ids.append(doc_id)
 
-            if not chunk_ids:
-                logger.warning(f"No chunks found for document {doc_id}")
+            if chunkless_doc_ids:
                 # Mark that deletion operations have started
                 deletion_operations_started = True
                 try:
                     # Still need to delete the doc status and full doc
-                    await self.full_docs.delete([doc_id])
-                    await self.doc_status.delete([doc_id])
+                    await self.full_docs.delete(chunkless_doc_ids)
+                    await self.doc_status.delete(chunkless_doc_ids)
                 except Exception as e:
                     logger.error(
-                        f"Failed to delete document {doc_id} with no chunks: {e}"
+                        f"Failed to delete documents {chunkless_doc_ids} with no chunks: {e}"
                     )
                     raise Exception(f"Failed to delete document entry: {e}") from e
 
-                async with pipeline_status_lock:
+                for doc_id in chunkless_doc_ids:
                     log_message = (
                         f"Document deleted without associated chunks: {doc_id}"
                     )
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
+                    await report(log_message)
+                    results[doc_id] = DeletionResult(
+                        status="success",
+                        doc_id=doc_id,
+                        message=log_message,
+                        status_code=200,
+                        file_path=file_paths[doc_id],
+                    )
 
-                return DeletionResult(
-                    status="success",
-                    doc_id=doc_id,
-                    message=log_message,
-                    status_code=200,
-                    file_path=file_path,
-                )
+            if not found_doc_ids:
+                return [results[doc_id] for doc_id in doc_ids]
 
             # Mark that deletion operations have started
             deletion_operations_started = True
 
-            if delete_llm_cache and chunk_ids:
+            if delete_llm_cache:
                 if not self.llm_response_cache:
                     logger.info(
                         "Skipping LLM cache collection for document %s because cache storage is unavailable",
-                        doc_id,
+                        target,
                     )
                 elif not self.text_chunks:
                     logger.info(
                         "Skipping LLM cache collection for document %s because text chunk storage is unavailable",
-                        doc_id,
+                        target,
                     )
                 else:
                     try:
@@ -3209,20 +3805,20 @@ class LightRAG:
                             logger.info(
                                 "Collected %d LLM cache entries for document %s",
                                 len(doc_llm_cache_ids),
-                                doc_id,
+                                target,
                             )
                         else:
                             logger.info(
-                                "No LLM cache entries found for document %s", doc_id
+                                "No LLM cache entries found for document %s", target
                             )
                     except Exception as cache_collect_error:
                         logger.error(
                             "Failed to collect LLM cache ids for document %s: %s",
-                            doc_id,
+                            target,
                             cache_collect_error,
                         )
                         raise Exception(
-                            f"Failed to collect LLM cache ids for document {doc_id}: {cache_collect_error}"
+                            f"Failed to collect LLM cache ids for document {target}: {cache_collect_error}"
                         ) from cache_collect_error
 
             # 4. Analyze entities and relationships that will be affected
@@ -3234,16 +3830,30 @@ class LightRAG:
             relation_chunk_updates: dict[tuple[str, str], list[str]] = {}
 
             try:
-                # Get affected entities and relations from full_entities and full_relations storage
-                doc_entities_data = await self.full_entities.get_by_id(doc_id)
-                doc_relations_data = await self.full_relations.get_by_id(doc_id)
+                # Union affected entities and relations of all documents from full_entities and full_relations storage
+                doc_entities_list = await self.full_entities.get_by_ids(found_doc_ids)
+                doc_relations_list = await self.full_relations.get_by_ids(found_doc_ids)
+
+                entity_names: list[str] = []
+                for doc_entities_data in doc_entities_list:
+                    if doc_entities_data and "entity_names" in doc_entities_data:
+                        entity_names.extend(doc_entities_data["entity_names"])
+                entity_names = list(dict.fromkeys(entity_names))
+
+                relation_pairs: list[tuple[str, str]] = []
+                for doc_relations_data in doc_relations_list:
+                    if doc_relations_data and "relation_pairs" in doc_relations_data:
+                        relation_pairs.extend(
+                            (pair[0], pair[1])
+                            for pair in doc_relations_data["relation_pairs"]
+                        )
+                relation_pairs = list(dict.fromkeys(relation_pairs))
 
                 affected_nodes = []
                 affected_edges = []
 
                 # Get entity data from graph storage using entity names from full_entities
-                if doc_entities_data and "entity_names" in doc_entities_data:
-                    entity_names = doc_entities_data["entity_names"]
+                if entity_names:
                     # get_nodes_batch returns dict[str, dict], need to convert to list[dict]
                     nodes_dict = await self.chunk_entity_relation_graph.get_nodes_batch(
                         entity_names
@@ -3257,20 +3867,17 @@ class LightRAG:
                             affected_nodes.append(node_data)
 
                 # Get relation data from graph storage using relation pairs from full_relations
-                if doc_relations_data and "relation_pairs" in doc_relations_data:
-                    relation_pairs = doc_relations_data["relation_pairs"]
+                if relation_pairs:
                     edge_pairs_dicts = [
-                        {"src": pair[0], "tgt": pair[1]} for pair in relation_pairs
+                        {"src": src, "tgt": tgt} for src, tgt in relation_pairs
                     ]
                     # get_edges_batch returns dict[tuple[str, str], dict], need to convert to list[dict]
                     edges_dict = await self.chunk_entity_relation_graph.get_edges_batch(
                         edge_pairs_dicts
                     )
 
-                    for pair in relation_pairs:
-                        src, tgt = pair[0], pair[1]
-                        edge_key = (src, tgt)
-                        edge_data = edges_dict.get(edge_key)
+                    for src, tgt in relation_pairs:
+                        edge_data = edges_dict.get((src, tgt))
                         if edge_data:
                             # Ensure compatibility with existing logic that expects "source" and "target" fields
                             if "source" not in edge_data:
@@ -3284,6 +3891,21 @@ class LightRAG:
                 raise Exception(f"Failed to analyze graph dependencies: {e}") from e
 
             try:
+                # Batch read chunk tracking data for all affected entities
+                node_labels = [
+                    node_data["entity_id"]
+                    for node_data in affected_nodes
+                    if node_data.get("entity_id")
+                ]
+                stored_entity_chunks: dict[str, Any] = {}
+                if self.entity_chunks and node_labels:
+                    stored_entity_chunks = dict(
+                        zip(
+                            node_labels,
+                            await self.entity_chunks.get_by_ids(node_labels),
+                        )
+                    )
+
                 # Process entities
                 for node_data in affected_nodes:
                     node_label = node_data.get("entity_id")
@@ -3291,14 +3913,13 @@ class LightRAG:
                         continue
 
                     existing_sources: list[str] = []
-                    if self.entity_chunks:
-                        stored_chunks = await self.entity_chunks.get_by_id(node_label)
-                        if stored_chunks and isinstance(stored_chunks, dict):
-                            existing_sources = [
-                                chunk_id
-                                for chunk_id in stored_chunks.get("chunk_ids", [])
-                                if chunk_id
-                            ]
+                    stored_chunks = stored_entity_chunks.get(node_label)
+                    if stored_chunks and isinstance(stored_chunks, dict):
+                        existing_sources = [
+                            chunk_id
+                            for chunk_id in stored_chunks.get("chunk_ids", [])
+                            if chunk_id
+                        ]
 
                     if not existing_sources and node_data.get("source_id"):
                         existing_sources = [
@@ -3326,11 +3947,28 @@ class LightRAG:
                     else:
                         logger.info(f"Untouch entity: {node_label}")
 
-                async with pipeline_status_lock:
-                    log_message = f"Found {len(entities_to_rebuild)} affected entities"
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
+                await report(f"Found {len(entities_to_rebuild)} affected entities")
+
+                # Batch read chunk tracking data for all affected relations
+                relation_storage_keys = list(
+                    dict.fromkeys(
+                        make_relation_chunk_key(
+                            edge_data["source"], edge_data["target"]
+                        )
+                        for edge_data in affected_edges
+                        if edge_data.get("source") and edge_data.get("target")
+                    )
+                )
+                stored_relation_chunks: dict[str, Any] = {}
+                if self.relation_chunks and relation_storage_keys:
+                    stored_relation_chunks = dict(
+                        zip(
+                            relation_storage_keys,
+                            await self.relation_chunks.get_by_ids(
+                                relation_storage_keys
+                            ),
+                        )
+                    )
 
                 # Process relationships
                 for edge_data in affected_edges:
@@ -3349,17 +3987,15 @@ class LightRAG:
                         continue
 
                     existing_sources: list[str] = []
-                    if self.relation_chunks:
-                        storage_key = make_relation_chunk_key(src, tgt)
-                        stored_chunks = await self.relation_chunks.get_by_id(
-                            storage_key
-                        )
-                        if stored_chunks and isinstance(stored_chunks, dict):
-                            existing_sources = [
-                                chunk_id
-                                for chunk_id in stored_chunks.get("chunk_ids", [])
-                                if chunk_id
-                            ]
+                    stored_chunks = stored_relation_chunks.get(
+                        make_relation_chunk_key(src, tgt)
+                    )
+                    if stored_chunks and isinstance(stored_chunks, dict):
+                        existing_sources = [
+                            chunk_id
+                            for chunk_id in stored_chunks.get("chunk_ids", [])
+                            if chunk_id
+                        ]
 
                     if not existing_sources:
                         existing_sources = [
@@ -3387,13 +4023,9 @@ class LightRAG:
                     else:
                         logger.info(f"Untouch relation: {edge_tuple}")
 
-                async with pipeline_status_lock:
-                    log_message = (
-                        f"Found {len(relationships_to_rebuild)} affected relations"
-                    )
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
+                await report(
+                    f"Found {len(relationships_to_rebuild)} affected relations"
+                )
 
                 current_time = int(time.time())
 
@@ -3611,18 +4243,18 @@ class LightRAG:
 
             # 9. Delete from full_entities and full_relations storage
             try:
-                await self.full_entities.delete([doc_id])
-                await self.full_relations.delete([doc_id])
+                await self.full_entities.delete(found_doc_ids)
+                await self.full_relations.delete(found_doc_ids)
             except Exception as e:
                 logger.error(f"Failed to delete from full_entities/full_relations: {e}")
                 raise Exception(
                     f"Failed to delete from full_entities/full_relations: {e}"
                 ) from e
 
-            # 10. Delete original document and status
+            # 10. Delete original documents and status
             try:
-                await self.full_docs.delete([doc_id])
-                await self.doc_status.delete([doc_id])
+                await self.full_docs.delete(found_doc_ids)
+                await self.doc_status.delete(found_doc_ids)
             except Exception as e:
                 logger.error(f"Failed to delete document and status: {e}")
                 raise Exception(f"Failed to delete document and status: {e}") from e
@@ -3630,40 +4262,36 @@ class LightRAG:
             if delete_llm_cache and doc_llm_cache_ids and self.llm_response_cache:
                 try:
                     await self.llm_response_cache.delete(doc_llm_cache_ids)
-                    cache_log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for document {doc_id}"
-                    logger.info(cache_log_message)
-                    async with pipeline_status_lock:
-                        pipeline_status["latest_message"] = cache_log_message
-                        pipeline_status["history_messages"].append(cache_log_message)
-                    log_message = cache_log_message
+                    log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for document {target}"
+                    await report(log_message)
                 except Exception as cache_delete_error:
-                    log_message = f"Failed to delete LLM cache for document {doc_id}: {cache_delete_error}"
-                    logger.error(log_message)
+                    log_message = f"Failed to delete LLM cache for document {target}: {cache_delete_error}"
                     logger.error(traceback.format_exc())
-                    async with pipeline_status_lock:
-                        pipeline_status["latest_message"] = log_message
-                        pipeline_status["history_messages"].append(log_message)
+                    await report(log_message)
 
-            return DeletionResult(
-                status="success",
-                doc_id=doc_id,
-                message=log_message,
-                status_code=200,
-                file_path=file_path,
-            )
+            for doc_id in found_doc_ids:
+                results[doc_id] = DeletionResult(
+                    status="success",
+                    doc_id=doc_id,
+                    message=log_message,
+                    status_code=200,
+                    file_path=file_paths[doc_id],
+                )
 
         except Exception as e:
             original_exception = e
-            error_message = f"Error while deleting document {doc_id}: {e}"
+            error_message = f"Error while deleting document {target}: {e}"
             logger.error(error_message)
             logger.error(traceback.format_exc())
-            return DeletionResult(
-                status="fail",
-                doc_id=doc_id,
-                message=error_message,
-                status_code=500,
-                file_path=file_path,
-            )
+            for doc_id in doc_ids:
+                if doc_id not in results:
+                    results[doc_id] = DeletionResult(
+                        status="fail",
+                        doc_id=doc_id,
+                        message=error_message,
+                        status_code=500,
+                        file_path=file_paths.get(doc_id),
+                    )
 
         finally:
             # ALWAYS ensure persistence if any deletion operations were started
@@ -3671,24 +4299,25 @@ class LightRAG:
                 try:
                     await self._insert_done()
                 except Exception as persistence_error:
-                    persistence_error_msg = f"Failed to persist data after deletion attempt for {doc_id}: {persistence_error}"
+                    persistence_error_msg = f"Failed to persist data after deletion attempt for {target}: {persistence_error}"
                     logger.error(persistence_error_msg)
                     logger.error(traceback.format_exc())
 
                     # If there was no original exception, this persistence error becomes the main error
-                    if original_exception is None:
-                        return DeletionResult(
-                            status="fail",
-                            doc_id=doc_id,
-                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
-                            status_code=500,
-                            file_path=file_path,
-                        )
                     # If there was an original exception, log the persistence error but don't override the original error
-                    # The original error result was already returned in the except block
+                    if original_exception is None:
+                        for doc_id, result in results.items():
+                            if result.status == "success":
+                                results[doc_id] = DeletionResult(
+                                    status="fail",
+                                    doc_id=doc_id,
+                                    message=f"Deletion completed but failed to persist changes: {persistence_error}",
+                                    status_code=500,
+                                    file_path=result.file_path,
+                                )
             else:
                 logger.debug(
-                    f"No deletion operations were started for document {doc_id}, skipping persistence"
+                    f"No deletion operations were started for document {target}, skipping persistence"
                 )
 
             # Release pipeline only if WE acquired it
@@ -3697,12 +4326,14 @@ class LightRAG:
                     pipeline_status["busy"] = False
                     pipeline_status["cancellation_requested"] = False
                     completion_msg = (
-                        f"Deletion process completed for document: {doc_id}"
+                        f"Deletion process completed for document: {target}"
                     )
                     pipeline_status["latest_message"] = completion_msg
                     pipeline_status["history_messages"].append(completion_msg)
                     logger.info(completion_msg)
 
+        return [results[doc_id] for doc_id in doc_ids]
+
     async def adelete_by_entity(self, entity_name: str) -> DeletionResult:
         """Asynchronously delete an entity and all its relationships.
 
@@ -0,0 +1,214 @@
+"""
+Process-wide cache of HTTP clients shared by the LLM and embedding bindings.
+
+Bindings used to create a new client for every request, paying TCP/TLS setup each
+time and losing keep-alive and HTTP/2 reuse. Clients are now cached per event loop
+and per configuration key, bounded by HTTP_CLIENT_CACHE_SIZE. Each request holds a
+lease on its client, so a client evicted from the cache (or closed by
+close_cached_clients) is only shut down once its in-flight requests are done.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from lightrag.constants import (
+    DEFAULT_HTTP_CLIENT_CACHE_SIZE,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from lightrag.utils import get_env_value, logger
+
+
+@dataclass
+class _CachedClient:
+    client: Any
+    aclose: Callable[[Any], Awaitable[Any]]
+    loop: asyncio.AbstractEventLoop
+    leases: int = 0
+    evicted: bool = False
+    closed: bool = False
+
+
+_client_cache: OrderedDict[tuple, _CachedClient] = OrderedDict()
+_client_cache_lock = threading.Lock()
+_client_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+class ClientLease:
+    """A cached client checked out for one request
+
+    Call `release()` (idempotent) or use `async with` once the request, including
+    any streamed response, is finished.
+    """
+
+    def __init__(self, entry: _CachedClient):
+        self._entry = entry
+        self._released = False
+
+    @property
+    def client(self) -> Any:
+        return self._entry.client
+
+    async def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        with _client_cache_lock:
+            self._entry.leases -= 1
+            should_close = self._entry.evicted and self._entry.leases == 0
+        if should_close:
+            await _close_entry(self._entry)
+
+    async def __aenter__(self) -> Any:
+        return self.client
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.release()
+
+
+def http_pool_limits() -> tuple[int, int]:
+    """Connection pool bounds for cached clients
+
+    Returns:
+        tuple: (max_connections, max_keepalive_connections)
+    """
+    return (
+        get_env_value("HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS, int),
+        get_env_value(
+            "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            int,
+        ),
+    )
+
+
+def make_client_key(binding: str, api_key: str | None, *parts: Any) -> tuple:
+    """Build a hashable cache key from client settings
+
+    The API key is hashed so that it does not show up in cache keys, and the
+    remaining parts (which may contain dicts such as client_configs) are
+    serialized deterministically.
+    """
+    key_digest = (
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None
+    )
+    return (
+        binding,
+        key_digest,
+        json.dumps(parts, sort_keys=True, default=repr),
+    )
+
+
+def acquire_client(
+    key: tuple,
+    factory: Callable[[], Any],
+    aclose: Callable[[Any], Awaitable[Any]],
+) -> ClientLease:
+    """Check out the cached client for `key`, creating it with `factory` on a miss
+
+    Must be called from a running event loop; clients are never shared across loops
+    because their connection pools are bound to the loop that created them.
+
+    Args:
+        key: Cache key, usually built with `make_client_key`
+        factory: Creates a new client
+        aclose: Coroutine function that closes a client
+
+    Returns:
+        ClientLease: Lease that must be released when the request is finished
+    """
+    loop = asyncio.get_running_loop()
+    cache_key = (id(loop), *key)
+    evicted = []
+    with _client_cache_lock:
+        entry = _client_cache.get(cache_key)
+        if entry is not None and entry.loop is loop:
+            _client_cache.move_to_end(cache_key)
+            _client_cache_stats["hits"] += 1
+        else:
+            _client_cache_stats["misses"] += 1
+            # Clients of closed event loops can no longer be used or closed cleanly
+            for stale_key in [
+                k for k, e in _client_cache.items() if e.loop.is_closed()
+            ]:
+                del _client_cache[stale_key]
+            entry = _CachedClient(client=factory(), aclose=aclose, loop=loop)
+            _client_cache[cache_key] = entry
+            max_size = max(
+                1,
+                get_env_value(
+                    "HTTP_CLIENT_CACHE_SIZE", DEFAULT_HTTP_CLIENT_CACHE_SIZE, int
+                ),
+            )
+            while len(_client_cache) > max_size:
+                _, oldest = _client_cache.popitem(last=False)
+                oldest.evicted = True
+                _client_cache_stats["evictions"] += 1
+                if oldest.leases == 0:
+                    evicted.append(oldest)
+        entry.leases += 1
+
+    for oldest in evicted:
+        _schedule_close(oldest)
+    return ClientLease(entry)
+
+
+async def _close_entry(entry: _CachedClient) -> None:
+    if entry.closed:
+        return
+    entry.closed = True
+    try:
+        await entry.aclose(entry.client)
+    except Exception as e:
+        logger.warning(f"Failed to close cached HTTP client: {e}")
+
+
+def _schedule_close(entry: _CachedClient) -> None:
+    if entry.loop.is_closed():
+        return
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if entry.loop is running_loop:
+        entry.loop.create_task(_close_entry(entry))
+    else:
+        asyncio.run_coroutine_threadsafe(_close_entry(entry), entry.loop)
+
+
+async def close_cached_clients() -> int:
+    """Close all cached clients created on the current event loop
+
+    Clients still serving a request are closed as soon as their lease is released.
+
+    Returns:
+        int: Number of clients removed from the cache
+    """
+    loop = asyncio.get_running_loop()
+    to_close = []
+    with _client_cache_lock:
+        keys = [k for k, e in _client_cache.items() if e.loop is loop]
+        for key in keys:
+            entry = _client_cache.pop(key)
+            entry.evicted = True
+            if entry.leases == 0:
+                to_close.append(entry)
+
+    for entry in to_close:
+        await _close_entry(entry)
+    if keys:
+        logger.debug(f"Closed {len(keys)} cached HTTP clients")
+    return len(keys)
+
+
+def get_client_cache_stats() -> dict[str, int]:
+    """Return cache size and hit/miss/eviction counters"""
+    with _client_cache_lock:
+        return {"size": len(_client_cache), **_client_cache_stats}
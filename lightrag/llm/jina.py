@@ -17,10 +17,20 @@ from tenacity import (
     retry_if_exception_type,
 )
 from lightrag.utils import wrap_embedding_func_with_attrs, logger
+from lightrag.llm.client_cache import acquire_client, http_pool_limits, make_client_key
+
+
+def _session_factory() -> aiohttp.ClientSession:
+    max_connections, _ = http_pool_limits()
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=max_connections))
 
 
 async def fetch_data(url, headers, data):
-    async with aiohttp.ClientSession() as session:
+    # Headers are sent per request, so one pooled session serves every endpoint and key
+    client_lease = acquire_client(
+        make_client_key("jina", None), _session_factory, lambda s: s.close()
+    )
+    async with client_lease as session:
         async with session.post(url, headers=headers, json=data) as response:
             if response.status != 200:
                 error_text = await response.text()
@@ -22,6 +22,12 @@ from lightrag.exceptions import (
     APITimeoutError,
 )
 from lightrag.api import __api_version__
+from lightrag.llm.client_cache import (
+    ClientLease,
+    acquire_client,
+    http_pool_limits,
+    make_client_key,
+)
 
 import numpy as np
 from typing import Optional, Union
@@ -51,6 +57,30 @@ def _coerce_host_for_cloud_model(host: Optional[str], model: object) -> Optional
     return host
 
 
+def _acquire_ollama_client(host, timeout, headers: dict[str, str]) -> ClientLease:
+    """Check out a shared Ollama client with a bounded keep-alive connection pool"""
+    public_headers = {k: v for k, v in headers.items() if k != "Authorization"}
+    key = make_client_key(
+        "ollama", headers.get("Authorization"), host, timeout, public_headers
+    )
+
+    def factory():
+        import httpx
+
+        max_connections, max_keepalive = http_pool_limits()
+        return ollama.AsyncClient(
+            host=host,
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+            ),
+        )
+
+    return acquire_client(key, factory, lambda client: client._client.aclose())
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -90,7 +120,8 @@ async def _ollama_model_if_cache(
 
     host = _coerce_host_for_cloud_model(host, model)
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    client_lease = _acquire_ollama_client(host, timeout, headers)
+    ollama_client = client_lease.client
 
     try:
         messages = []
@@ -111,11 +142,8 @@ async def _ollama_model_if_cache(
                     logger.error(f"Error in stream response: {str(e)}")
                     raise
                 finally:
-                    try:
-                        await ollama_client._client.aclose()
-                        logger.debug("Successfully closed Ollama client for streaming")
-                    except Exception as close_error:
-                        logger.warning(f"Failed to close Ollama client: {close_error}")
+                    # Return client to the shared pool once the stream is consumed
+                    await client_lease.release()
 
             return inner()
         else:
@@ -128,26 +156,12 @@ async def _ollama_model_if_cache(
             """
 
             return model_response
-    except Exception as e:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception: {close_error}"
-            )
-        raise e
+    except Exception:
+        await client_lease.release()
+        raise
     finally:
         if not stream:
-            try:
-                await ollama_client._client.aclose()
-                logger.debug(
-                    "Successfully closed Ollama client for non-streaming response"
-                )
-            except Exception as close_error:
-                logger.warning(
-                    f"Failed to close Ollama client in finally block: {close_error}"
-                )
+            await client_lease.release()
 
 
 async def ollama_model_complete(
@@ -218,26 +232,13 @@ async def ollama_embed(
 
     host = _coerce_host_for_cloud_model(host, embed_model)
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
-    try:
-        options = kwargs.pop("options", {})
-        data = await ollama_client.embed(
-            model=embed_model, input=texts, options=options
-        )
-        return np.array(data["embeddings"])
-    except Exception as e:
-        logger.error(f"Error in ollama_embed: {str(e)}")
+    async with _acquire_ollama_client(host, timeout, headers) as ollama_client:
         try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception in embed")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception in embed: {close_error}"
+            options = kwargs.pop("options", {})
+            data = await ollama_client.embed(
+                model=embed_model, input=texts, options=options
             )
-        raise e
-    finally:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after embed")
-        except Exception as close_error:
-            logger.warning(f"Failed to close Ollama client after embed: {close_error}")
+            return np.array(data["embeddings"])
+        except Exception as e:
+            logger.error(f"Error in ollama_embed: {str(e)}")
+            raise e
@@ -30,6 +30,12 @@ from lightrag.utils import (
 
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.api import __api_version__
+from lightrag.llm.client_cache import (
+    ClientLease,
+    acquire_client,
+    http_pool_limits,
+    make_client_key,
+)
 
 import numpy as np
 import base64
@@ -184,6 +190,66 @@ def create_openai_async_client(
         return AsyncOpenAI(**merged_configs)
 
 
+def acquire_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    use_azure: bool = False,
+    azure_deployment: str | None = None,
+    api_version: str | None = None,
+    timeout: int | None = None,
+    client_configs: dict[str, Any] | None = None,
+) -> ClientLease:
+    """Check out a shared AsyncOpenAI or AsyncAzureOpenAI client.
+
+    Clients are cached by (base_url, api_key, azure settings, timeout, client_configs)
+    and keep a bounded pool of keep-alive connections, so consecutive requests reuse
+    TCP/TLS connections instead of opening new ones. Arguments are the same as
+    create_openai_async_client.
+
+    Returns:
+        A ClientLease; release it (or use `async with`) once the request is finished.
+    """
+    client_configs = client_configs or {}
+    key = make_client_key(
+        "openai",
+        api_key,
+        base_url,
+        use_azure,
+        azure_deployment,
+        api_version,
+        timeout,
+        client_configs,
+    )
+
+    def factory():
+        configs = client_configs
+        if "http_client" not in configs:
+            import httpx
+            from openai import DefaultAsyncHttpxClient
+
+            max_connections, max_keepalive = http_pool_limits()
+            configs = {
+                **configs,
+                "http_client": DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive,
+                    )
+                ),
+            }
+        return create_openai_async_client(
+            api_key=api_key,
+            base_url=base_url,
+            use_azure=use_azure,
+            azure_deployment=azure_deployment,
+            api_version=api_version,
+            timeout=timeout,
+            client_configs=configs,
+        )
+
+    return acquire_client(key, factory, lambda client: client.close())
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -285,8 +351,8 @@ async def openai_complete_if_cache(
     if keyword_extraction:
         kwargs["response_format"] = GPTKeywordExtractionFormat
 
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Check out the shared OpenAI client (supports both OpenAI and Azure)
+    client_lease = acquire_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -295,6 +361,7 @@ async def openai_complete_if_cache(
         timeout=timeout,
         client_configs=client_configs,
     )
+    openai_async_client = client_lease.client
 
     # Prepare messages
     messages: list[dict[str, Any]] = []
@@ -336,21 +403,21 @@ async def openai_complete_if_cache(
             )
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
+        await client_lease.release()  # Return client to the shared pool
         raise
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
+        await client_lease.release()  # Return client to the shared pool
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
+        await client_lease.release()  # Return client to the shared pool
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
+        await client_lease.release()  # Return client to the shared pool
         raise
 
     if hasattr(response, "__aiter__"):
@@ -484,8 +551,8 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
+                # Return client to the shared pool in case of exception
+                await client_lease.release()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -517,16 +584,8 @@ async def openai_complete_if_cache(
                                 f"Unexpected error during stream response cleanup: {close_error}"
                             )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
+                # The caller doesn't handle the client, return it to the shared pool
+                await client_lease.release()
 
         return inner()
 
@@ -538,7 +597,7 @@ async def openai_complete_if_cache(
                 or not hasattr(response.choices[0], "message")
             ):
                 logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
+                await client_lease.release()  # Return client to the shared pool
                 raise InvalidResponseError("Invalid response from OpenAI API")
 
             message = response.choices[0].message
@@ -591,7 +650,7 @@ async def openai_complete_if_cache(
                 # Validate final content
                 if not final_content or final_content.strip() == "":
                     logger.error("Received empty content from OpenAI API")
-                    await openai_async_client.close()  # Ensure client is closed
+                    await client_lease.release()  # Return client to the shared pool
                     raise InvalidResponseError("Received empty content from OpenAI API")
 
             # Apply Unicode decoding to final content if needed
@@ -613,8 +672,8 @@ async def openai_complete_if_cache(
 
             return final_content
         finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+            # Return client to the shared pool in all cases for non-streaming responses
+            await client_lease.release()
 
 
 async def openai_complete(
@@ -801,8 +860,8 @@ async def openai_embed(
 
         texts = truncated_texts
 
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Check out the shared OpenAI client (supports both OpenAI and Azure)
+    client_lease = acquire_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -811,7 +870,7 @@ async def openai_embed(
         client_configs=client_configs,
     )
 
-    async with openai_async_client:
+    async with client_lease as openai_async_client:
         # Determine the correct model identifier to use
         # For Azure OpenAI, we must use the deployment name instead of the model name
         api_model = azure_deployment if use_azure and azure_deployment else model
@@ -0,0 +1,264 @@
+"""
+Per-stage latency and throughput metrics for the ingestion pipeline.
+
+Every stage of document ingestion (chunking, chunk VDB upsert, LLM extraction, gleaning,
+summarisation, graph upsert, entity/relation VDB upsert, storage flush) records its
+wall-clock latency into a histogram and the number of items it handled into a counter,
+and LLM calls record cache hits and misses. Metrics are process-local: with several API
+workers each worker reports its own values.
+
+Read them with `pipeline_metrics.snapshot()`, scrape them in the Prometheus text format
+from `render_prometheus()` (served at /metrics by the API server), or receive every
+observation as it happens with `add_metrics_hook()`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+logger = logging.getLogger("lightrag")
+
+T = TypeVar("T")
+
+INGEST_STAGES = (
+    "chunking",
+    "chunk_vdb_upsert",
+    "llm_extraction",
+    "gleaning",
+    "summarization",
+    "graph_upsert",
+    "entity_vdb_upsert",
+    "relation_vdb_upsert",
+    "index_flush",
+)
+
+# Upper bounds in seconds, from a single graph upsert to a slow LLM call
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+STAGE_SECONDS = "lightrag_ingest_stage_seconds"
+STAGE_ITEMS = "lightrag_ingest_stage_items_total"
+STAGE_ERRORS = "lightrag_ingest_stage_errors_total"
+LLM_CACHE_REQUESTS = "lightrag_llm_cache_requests_total"
+
+# hook(metric_name, value, labels)
+MetricsHook = Callable[[str, float, dict[str, str]], None]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class PipelineMetrics:
+    """Histograms and counters for every ingestion stage"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._hooks: list[MetricsHook] = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stage_seconds: dict[str, Histogram] = {}
+            self._stage_items: dict[str, float] = {}
+            self._stage_errors: dict[str, float] = {}
+            self._llm_cache: dict[tuple[str, str], float] = {}
+
+    def add_hook(self, hook: MetricsHook) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: MetricsHook) -> None:
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def _emit(self, name: str, value: float, labels: dict[str, str]) -> None:
+        for hook in list(self._hooks):
+            try:
+                hook(name, value, labels)
+            except Exception as e:
+                logger.warning(f"Metrics hook {hook!r} failed: {e}")
+
+    def observe_stage(
+        self, stage: str, seconds: float, items: int = 1, error: bool = False
+    ) -> None:
+        """Record one execution of a pipeline stage"""
+        with self._lock:
+            histogram = self._stage_seconds.get(stage)
+            if histogram is None:
+                histogram = self._stage_seconds[stage] = Histogram(self._buckets)
+            histogram.observe(seconds)
+            self._stage_items[stage] = self._stage_items.get(stage, 0) + items
+            if error:
+                self._stage_errors[stage] = self._stage_errors.get(stage, 0) + 1
+
+        labels = {"stage": stage}
+        self._emit(STAGE_SECONDS, seconds, labels)
+        self._emit(STAGE_ITEMS, items, labels)
+        if error:
+            self._emit(STAGE_ERRORS, 1, labels)
+
+    def record_llm_cache(self, cache_type: str, hit: bool) -> None:
+        """Record an LLM call that was served from (hit) or missed the response cache"""
+        result = "hit" if hit else "miss"
+        with self._lock:
+            key = (cache_type, result)
+            self._llm_cache[key] = self._llm_cache.get(key, 0) + 1
+        self._emit(LLM_CACHE_REQUESTS, 1, {"cache_type": cache_type, "result": result})
+
+    @contextmanager
+    def track(self, stage: str, items: int = 1) -> Iterator[None]:
+        """Time the enclosed block as one execution of `stage`"""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe_stage(stage, time.perf_counter() - start, items, error=True)
+            raise
+        self.observe_stage(stage, time.perf_counter() - start, items)
+
+    async def timed(self, stage: str, awaitable: Awaitable[T], items: int = 1) -> T:
+        """Await `awaitable` as one execution of `stage`"""
+        with self.track(stage, items):
+            return await awaitable
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current values as plain data"""
+        with self._lock:
+            stages = {}
+            for stage in sorted(
+                set(self._stage_seconds) | set(self._stage_items), key=_stage_order
+            ):
+                histogram = self._stage_seconds.get(stage)
+                count = histogram.count if histogram else 0
+                total = histogram.sum if histogram else 0.0
+                stages[stage] = {
+                    "count": count,
+                    "seconds_total": total,
+                    "seconds_avg": total / count if count else 0.0,
+                    "items_total": self._stage_items.get(stage, 0),
+                    "errors_total": self._stage_errors.get(stage, 0),
+                }
+            llm_cache: dict[str, dict[str, float]] = {}
+            for (cache_type, result), count in sorted(self._llm_cache.items()):
+                llm_cache.setdefault(cache_type, {"hit": 0, "miss": 0})[result] = count
+            return {"stages": stages, "llm_cache": llm_cache}
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)"""
+        lines = [
+            f"# HELP {STAGE_SECONDS} Wall-clock latency of ingestion pipeline stages",
+            f"# TYPE {STAGE_SECONDS} histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self._stage_seconds, key=_stage_order):
+                histogram = self._stage_seconds[stage]
+                for bound, count in zip(
+                    histogram.buckets, histogram.cumulative_counts()
+                ):
+                    lines.append(
+                        f'{STAGE_SECONDS}_bucket{{stage="{stage}",le="{bound:g}"}} {count}'
+                    )
+                lines.append(
+                    f'{STAGE_SECONDS}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f'{STAGE_SECONDS}_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(
+                    f'{STAGE_SECONDS}_count{{stage="{stage}"}} {histogram.count}'
+                )
+
+            lines.append(
+                f"# HELP {STAGE_ITEMS} Items (chunks, entities, relations, ...) processed by each stage"
+            )
+            lines.append(f"# TYPE {STAGE_ITEMS} counter")
+            for stage in sorted(self._stage_items, key=_stage_order):
+                lines.append(
+                    f'{STAGE_ITEMS}{{stage="{stage}"}} {self._stage_items[stage]:g}'
+                )
+
+            lines.append(f"# HELP {STAGE_ERRORS} Failed executions of each stage")
+            lines.append(f"# TYPE {STAGE_ERRORS} counter")
+            for stage in sorted(self._stage_errors, key=_stage_order):
+                lines.append(
+                    f'{STAGE_ERRORS}{{stage="{stage}"}} {self._stage_errors[stage]:g}'
+                )
+
+            lines.append(
+                f"# HELP {LLM_CACHE_REQUESTS} LLM calls served from or missing the response cache"
+            )
+            lines.append(f"# TYPE {LLM_CACHE_REQUESTS} counter")
+            for (cache_type, result), count in sorted(self._llm_cache.items()):
+                lines.append(
+                    f'{LLM_CACHE_REQUESTS}{{cache_type="{cache_type}",result="{result}"}} {count:g}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _stage_order(stage: str) -> tuple[int, str]:
+    # Pipeline order first, unknown stages alphabetically after
+    try:
+        return (INGEST_STAGES.index(stage), stage)
+    except ValueError:
+        return (len(INGEST_STAGES), stage)
+
+
+# Process-wide instance used by the pipeline
+pipeline_metrics = PipelineMetrics()
+
+
+def track_stage(stage: str, items: int = 1):
+    """Context manager timing one execution of an ingestion stage"""
+    return pipeline_metrics.track(stage, items)
+
+
+def add_metrics_hook(hook: MetricsHook) -> None:
+    """Call `hook(metric_name, value, labels)` for every metric observation"""
+    pipeline_metrics.add_hook(hook)
+
+
+def remove_metrics_hook(hook: MetricsHook) -> None:
+    pipeline_metrics.remove_hook(hook)
@@ -5,7 +5,8 @@ from pathlib import Path
 import asyncio
 import json
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
+import re
+from typing import Any, AsyncIterator, Iterator, overload, Literal
 from collections import Counter, defaultdict
 
 from lightrag.exceptions import (
@@ -26,10 +27,14 @@ from lightrag.utils import (
     save_to_cache,
     CacheData,
     use_llm_func_with_cache,
+    get_cached_llm_response,
+    record_llm_cache_miss,
+    save_llm_response_to_cache,
     update_chunk_cache_list,
     remove_think_tags,
     pick_by_weighted_polling,
     pick_by_vector_similarity,
+    embed_query_texts,
     process_chunks_unified,
     safe_vdb_operation_with_exception,
     create_prefixed_exception,
@@ -64,8 +69,12 @@ from lightrag.constants import (
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
+    DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS,
+    CHUNKING_WINDOW_CHARS_PER_TOKEN,
 )
 from lightrag.kg.shared_storage import get_storage_keyed_lock
+from lightrag.metrics import track_stage
+from lightrag.tracing import trace_span, traced_storage_call
 import time
 from dotenv import load_dotenv
 
@@ -96,70 +105,158 @@ def _truncate_entity_identifier(
     return display_value
 
 
-def chunking_by_token_size(
+def _iter_split_by_character(content: str, separator: str) -> Iterator[str]:
+    """Lazily yield the pieces of content.split(separator)"""
+    start = 0
+    while True:
+        index = content.find(separator, start)
+        if index == -1:
+            yield content[start:]
+            return
+        yield content[start:index]
+        start = index + len(separator)
+
+
+def _iter_token_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    chunk_overlap_token_size: int,
+    chunk_token_size: int,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token_count, text) windows of chunk_token_size tokens over content
+
+    Only a bounded text window is tokenized at a time: full windows that end well
+    before the window's end are emitted, then tokenization restarts at the next
+    window start. Texts shorter than the window are chunked exactly like a single
+    encode of the whole text. Tokenizers whose decoded output does not reproduce the
+    source text (e.g. normalizing ones) cannot be re-anchored, so the rest of the
+    text is then encoded at once.
+    """
+    step = chunk_token_size - chunk_overlap_token_size
+    if step <= 0:
+        raise ValueError(
+            f"chunk_overlap_token_size ({chunk_overlap_token_size}) must be smaller than chunk_token_size ({chunk_token_size})"
+        )
+    # Keep emitted windows at least one chunk away from the end of the encoded text
+    seam_margin = chunk_token_size
+    window_chars = max(chunk_token_size * CHUNKING_WINDOW_CHARS_PER_TOKEN, 1)
+    pos = 0
+
+    def _remaining_windows(tokens: list[int], first: int) -> Iterator[tuple[int, str]]:
+        for start in range(first, len(tokens), step):
+            yield (
+                min(chunk_token_size, len(tokens) - start),
+                tokenizer.decode(tokens[start : start + chunk_token_size]),
+            )
+
+    while True:
+        end = pos + window_chars
+        tokens = tokenizer.encode(content[pos:end])
+        if end >= len(content):
+            yield from _remaining_windows(tokens, 0)
+            return
+
+        start = 0
+        while start + chunk_token_size <= len(tokens) - seam_margin:
+            yield (
+                chunk_token_size,
+                tokenizer.decode(tokens[start : start + chunk_token_size]),
+            )
+            start += step
+
+        # Re-anchor at the text offset of the next window start. Decoding a token
+        # prefix can be lossy when it splits a multi-byte character, so back off a
+        # few tokens until the prefix matches the source text.
+        next_pos = None
+        for back_off in range(min(start, 8)):
+            prefix = tokenizer.decode(tokens[: start - back_off])
+            if prefix and content.startswith(prefix, pos):
+                next_pos = pos + len(prefix)
+                break
+        if next_pos is None:
+            if start == 0:
+                # Window too small for a full chunk, widen it
+                window_chars *= 2
+                continue
+            # No decoded prefix matches the source text, so there is no seam to restart
+            # from. Encode the rest once and continue after the windows already emitted.
+            yield from _remaining_windows(tokenizer.encode(content[pos:]), start)
+            return
+        pos = next_pos
+
+
+def iter_chunks_by_token_size(
     tokenizer: Tokenizer,
     content: str,
     split_by_character: str | None = None,
     split_by_character_only: bool = False,
     chunk_overlap_token_size: int = 100,
     chunk_token_size: int = 1200,
-) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
+) -> Iterator[dict[str, Any]]:
+    """Lazily split content into chunks of at most chunk_token_size tokens
+
+    Unlike encoding the whole document up front, pieces and token windows are
+    tokenized incrementally, so memory held for tokenization is bounded by the
+    chunk size rather than the document size.
+    """
     if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > chunk_token_size:
-                    logger.warning(
-                        "Chunk split_by_character exceeds token limit: len=%d limit=%d",
-                        len(_tokens),
-                        chunk_token_size,
-                    )
-                    raise ChunkTokenLimitExceededError(
-                        chunk_tokens=len(_tokens),
-                        chunk_token_limit=chunk_token_size,
-                        chunk_preview=chunk[:120],
-                    )
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > chunk_token_size:
-                    for start in range(
-                        0, len(_tokens), chunk_token_size - chunk_overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + chunk_token_size]
-                        )
-                        new_chunks.append(
-                            (min(chunk_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
+        pieces = _iter_split_by_character(content, split_by_character)
+    else:
+        pieces = iter([content])
+
+    index = 0
+    for piece in pieces:
+        if split_by_character:
+            _len = tokenizer.count_tokens(piece)
+            if _len <= chunk_token_size:
+                yield {
                     "tokens": _len,
-                    "content": chunk.strip(),
+                    "content": piece.strip(),
                     "chunk_order_index": index,
                 }
-            )
-    else:
-        for index, start in enumerate(
-            range(0, len(tokens), chunk_token_size - chunk_overlap_token_size)
+                index += 1
+                continue
+            if split_by_character_only:
+                logger.warning(
+                    "Chunk split_by_character exceeds token limit: len=%d limit=%d",
+                    _len,
+                    chunk_token_size,
+                )
+                raise ChunkTokenLimitExceededError(
+                    chunk_tokens=_len,
+                    chunk_token_limit=chunk_token_size,
+                    chunk_preview=piece[:120],
+                )
+
+        for _len, chunk_content in _iter_token_windows(
+            tokenizer, piece, chunk_overlap_token_size, chunk_token_size
         ):
-            chunk_content = tokenizer.decode(tokens[start : start + chunk_token_size])
-            results.append(
-                {
-                    "tokens": min(chunk_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    return results
+            yield {
+                "tokens": _len,
+                "content": chunk_content.strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+
+
+def chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    chunk_overlap_token_size: int = 100,
+    chunk_token_size: int = 1200,
+) -> list[dict[str, Any]]:
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            chunk_overlap_token_size,
+            chunk_token_size,
+        )
+    )
 
 
 async def _handle_entity_relation_summary(
@@ -203,12 +300,14 @@ async def _handle_entity_relation_summary(
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
 
     current_list = description_list[:]  # Copy the list to avoid modifying original
+    # Token counts of current_list, each description is only encoded once
+    current_token_counts = [tokenizer.count_tokens(desc) for desc in current_list]
     llm_was_used = False  # Track whether LLM was used during the entire process
 
     # Iterative map-reduce process
     while True:
         # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        total_tokens = sum(current_token_counts)
 
         # If total length is within limits, perform final summarization
         if total_tokens <= summary_context_size or len(current_list) <= 2:
@@ -241,15 +340,13 @@ async def _handle_entity_relation_summary(
         current_tokens = 0
 
         # Currently least 3 descriptions in current_list
-        for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
-
+        for desc, desc_tokens in zip(current_list, current_token_counts):
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
                 # Ensure we have at least 2 descriptions in the chunk (when possible)
                 if len(current_chunk) == 1:
                     # Force add one more description to ensure minimum 2 per chunk
-                    current_chunk.append(desc)
+                    current_chunk.append((desc, desc_tokens))
                     chunks.append(current_chunk)
                     logger.warning(
                         f"Summarizing {entity_or_relation_name}: Oversize description found"
@@ -258,10 +355,10 @@ async def _handle_entity_relation_summary(
                     current_tokens = 0
                 else:  # curren_chunk is ready for summary in reduce phase
                     chunks.append(current_chunk)
-                    current_chunk = [desc]  # leave it for next group
+                    current_chunk = [(desc, desc_tokens)]  # leave it for next group
                     current_tokens = desc_tokens
             else:
-                current_chunk.append(desc)
+                current_chunk.append((desc, desc_tokens))
                 current_tokens += desc_tokens
 
         # Add the last chunk if it exists
@@ -272,26 +369,44 @@ async def _handle_entity_relation_summary(
             f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups"
         )
 
-        # Reduce phase: summarize each group from chunks
-        new_summaries = []
-        for chunk in chunks:
+        # Reduce phase: summarize groups concurrently, bounded by the LLM concurrency limit
+        semaphore = asyncio.Semaphore(global_config.get("llm_model_max_async", 4))
+
+        async def _summarize_group(chunk: list[tuple[str, int]]) -> tuple[str, int]:
             if len(chunk) == 1:
                 # Optimization: single description chunks don't need LLM summarization
-                new_summaries.append(chunk[0])
-            else:
-                # Multiple descriptions need LLM summarization
+                return chunk[0]
+            async with semaphore:
                 summary = await _summarize_descriptions(
                     description_type,
                     entity_or_relation_name,
-                    chunk,
+                    [desc for desc, _ in chunk],
                     global_config,
                     llm_response_cache,
                 )
-                new_summaries.append(summary)
-                llm_was_used = True  # Mark that LLM was used in reduce phase
+            return summary, tokenizer.count_tokens(summary)
 
-        # Update current list with new summaries for next iteration
-        current_list = new_summaries
+        tasks = [asyncio.create_task(_summarize_group(chunk)) for chunk in chunks]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+
+        # If any group failed, cancel the remaining groups and raise the first exception
+        first_exception = next(
+            (task.exception() for task in done if task.exception() is not None), None
+        )
+        if first_exception is not None:
+            for pending_task in pending:
+                pending_task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            raise first_exception
+
+        if any(len(chunk) > 1 for chunk in chunks):
+            llm_was_used = True  # Mark that LLM was used in reduce phase
+
+        # Update current list with new summaries for next iteration (in group order)
+        new_summaries = [task.result() for task in tasks]
+        current_list = [summary for summary, _ in new_summaries]
+        current_token_counts = [tokens for _, tokens in new_summaries]
 
 
 async def _summarize_descriptions(
@@ -353,18 +468,19 @@ async def _summarize_descriptions(
     use_prompt = prompt_template.format(**context_base)
 
     # Use LLM function with cache (higher priority for summary generation)
-    summary, _ = await use_llm_func_with_cache(
-        use_prompt,
-        use_llm_func,
-        llm_response_cache=llm_response_cache,
-        cache_type="summary",
-    )
+    with track_stage("summarization"):
+        summary, _ = await use_llm_func_with_cache(
+            use_prompt,
+            use_llm_func,
+            llm_response_cache=llm_response_cache,
+            cache_type="summary",
+        )
 
     # Check summary token length against embedding limit
     embedding_token_limit = global_config.get("embedding_token_limit")
     if embedding_token_limit is not None and summary:
         tokenizer = global_config["tokenizer"]
-        summary_token_count = len(tokenizer.encode(summary))
+        summary_token_count = tokenizer.count_tokens(summary)
         threshold = int(embedding_token_limit)
 
         if summary_token_count > threshold:
@@ -907,6 +1023,34 @@ async def _get_cached_extraction_results(
     return sorted_cached_results  # each item: list(extraction_result, create_time)
 
 
+def _split_packed_extraction_result(
+    result: str, text_count: int, tuple_delimiter: str, completion_delimiter: str
+) -> dict[int, str]:
+    """Split a packed extraction response into one extraction result per input text id
+
+    Sections start with a `text<tuple_delimiter><id>` line. Texts without a section are
+    missing from the returned dict, so the caller can extract them on their own.
+    """
+    header = re.compile(
+        rf"^\s*text\s*{re.escape(tuple_delimiter)}\s*(\d+)\s*$", re.IGNORECASE
+    )
+    sections: dict[int, list[str]] = {}
+    current = None
+    for line in result.splitlines():
+        match = header.match(line)
+        if match:
+            text_id = int(match.group(1))
+            current = (
+                sections.setdefault(text_id, []) if 0 < text_id <= text_count else None
+            )
+        elif current is not None and line.strip() != completion_delimiter:
+            current.append(line.replace(completion_delimiter, ""))
+    return {
+        text_id: "\n".join(lines + [completion_delimiter])
+        for text_id, lines in sections.items()
+    }
+
+
 async def _process_extraction_result(
     result: str,
     chunk_key: str,
@@ -1841,10 +1985,11 @@ async def _merge_nodes_then_upsert(
         created_at=int(time.time()),
         truncate=truncation_info,
     )
-    await knowledge_graph_inst.upsert_node(
-        entity_name,
-        node_data=node_data,
-    )
+    with track_stage("graph_upsert"):
+        await knowledge_graph_inst.upsert_node(
+            entity_name,
+            node_data=node_data,
+        )
     node_data["entity_name"] = entity_name
     if entity_vdb is not None:
         entity_vdb_id = compute_mdhash_id(str(entity_name), prefix="ent-")
@@ -1858,13 +2003,14 @@ async def _merge_nodes_then_upsert(
                 "file_path": file_path,
             }
         }
-        await safe_vdb_operation_with_exception(
-            operation=lambda payload=data_for_vdb: entity_vdb.upsert(payload),
-            operation_name="entity_upsert",
-            entity_name=entity_name,
-            max_retries=3,
-            retry_delay=0.1,
-        )
+        with track_stage("entity_vdb_upsert"):
+            await safe_vdb_operation_with_exception(
+                operation=lambda payload=data_for_vdb: entity_vdb.upsert(payload),
+                operation_name="entity_upsert",
+                entity_name=entity_name,
+                max_retries=3,
+                retry_delay=0.1,
+            )
     return node_data
 
 
@@ -2179,7 +2325,10 @@ async def _merge_edges_then_upsert(
                 "created_at": node_created_at,
                 "truncate": "",
             }
-            await knowledge_graph_inst.upsert_node(need_insert_id, node_data=node_data)
+            with track_stage("graph_upsert"):
+                await knowledge_graph_inst.upsert_node(
+                    need_insert_id, node_data=node_data
+                )
 
             # Update entity_chunks_storage for the newly created entity
             if entity_chunks_storage is not None:
@@ -2206,13 +2355,14 @@ async def _merge_edges_then_upsert(
                         "file_path": file_path,
                     }
                 }
-                await safe_vdb_operation_with_exception(
-                    operation=lambda payload=vdb_data: entity_vdb.upsert(payload),
-                    operation_name="added_entity_upsert",
-                    entity_name=need_insert_id,
-                    max_retries=3,
-                    retry_delay=0.1,
-                )
+                with track_stage("entity_vdb_upsert"):
+                    await safe_vdb_operation_with_exception(
+                        operation=lambda payload=vdb_data: entity_vdb.upsert(payload),
+                        operation_name="added_entity_upsert",
+                        entity_name=need_insert_id,
+                        max_retries=3,
+                        retry_delay=0.1,
+                    )
 
             # Track entities added during edge processing
             if added_entities is not None:
@@ -2291,9 +2441,10 @@ async def _merge_edges_then_upsert(
                     **existing_node,
                     "source_id": limited_source_id_str,
                 }
-                await knowledge_graph_inst.upsert_node(
-                    need_insert_id, node_data=updated_node_data
-                )
+                with track_stage("graph_upsert"):
+                    await knowledge_graph_inst.upsert_node(
+                        need_insert_id, node_data=updated_node_data
+                    )
 
                 # Update vector database
                 if entity_vdb is not None:
@@ -2312,13 +2463,16 @@ async def _merge_edges_then_upsert(
                             ),
                         }
                     }
-                    await safe_vdb_operation_with_exception(
-                        operation=lambda payload=vdb_data: entity_vdb.upsert(payload),
-                        operation_name="existing_entity_update",
-                        entity_name=need_insert_id,
-                        max_retries=3,
-                        retry_delay=0.1,
-                    )
+                    with track_stage("entity_vdb_upsert"):
+                        await safe_vdb_operation_with_exception(
+                            operation=lambda payload=vdb_data: entity_vdb.upsert(
+                                payload
+                            ),
+                            operation_name="existing_entity_update",
+                            entity_name=need_insert_id,
+                            max_retries=3,
+                            retry_delay=0.1,
+                        )
 
             # 6. Log once at the end if any update occurred
             if updated:
@@ -2330,19 +2484,20 @@ async def _merge_edges_then_upsert(
                         pipeline_status["history_messages"].append(status_message)
 
     edge_created_at = int(time.time())
-    await knowledge_graph_inst.upsert_edge(
-        src_id,
-        tgt_id,
-        edge_data=dict(
-            weight=weight,
-            description=description,
-            keywords=keywords,
-            source_id=source_id,
-            file_path=file_path,
-            created_at=edge_created_at,
-            truncate=truncation_info,
-        ),
-    )
+    with track_stage("graph_upsert"):
+        await knowledge_graph_inst.upsert_edge(
+            src_id,
+            tgt_id,
+            edge_data=dict(
+                weight=weight,
+                description=description,
+                keywords=keywords,
+                source_id=source_id,
+                file_path=file_path,
+                created_at=edge_created_at,
+                truncate=truncation_info,
+            ),
+        )
 
     edge_data = dict(
         src_id=src_id,
@@ -2382,13 +2537,14 @@ async def _merge_edges_then_upsert(
                 "file_path": file_path,
             }
         }
-        await safe_vdb_operation_with_exception(
-            operation=lambda payload=vdb_data: relationships_vdb.upsert(payload),
-            operation_name="relationship_upsert",
-            entity_name=f"{src_id}-{tgt_id}",
-            max_retries=3,
-            retry_delay=0.2,
-        )
+        with track_stage("relation_vdb_upsert"):
+            await safe_vdb_operation_with_exception(
+                operation=lambda payload=vdb_data: relationships_vdb.upsert(payload),
+                operation_name="relationship_upsert",
+                entity_name=f"{src_id}-{tgt_id}",
+                max_retries=3,
+                retry_delay=0.2,
+            )
 
     return edge_data
 
@@ -2811,11 +2967,16 @@ async def extract_entities(
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
 
-    async def _process_single_content(chunk_key_dp: tuple[str, TextChunkSchema]):
+    async def _process_single_content(
+        chunk_key_dp: tuple[str, TextChunkSchema],
+        initial_result: tuple[str, int, str | None] | None = None,
+    ):
         """Process a single chunk
         Args:
             chunk_key_dp (tuple[str, TextChunkSchema]):
                 ("chunk-xxxxxx", {"tokens": int, "content": str, "full_doc_id": str, "chunk_order_index": int})
+            initial_result: (result, timestamp, cache_key) of the initial extraction when it
+                was already made by a packed call
         Returns:
             tuple: (maybe_nodes, maybe_edges) containing extracted entities and relationships
         """
@@ -2842,15 +3003,21 @@ async def extract_entities(
             "entity_continue_extraction_user_prompt"
         ].format(**{**context_base, "input_text": content})
 
-        final_result, timestamp = await use_llm_func_with_cache(
-            entity_extraction_user_prompt,
-            use_llm_func,
-            system_prompt=entity_extraction_system_prompt,
-            llm_response_cache=llm_response_cache,
-            cache_type="extract",
-            chunk_id=chunk_key,
-            cache_keys_collector=cache_keys_collector,
-        )
+        if initial_result is not None:
+            final_result, timestamp, cache_key = initial_result
+            if cache_key:
+                cache_keys_collector.append(cache_key)
+        else:
+            with track_stage("llm_extraction"):
+                final_result, timestamp = await use_llm_func_with_cache(
+                    entity_extraction_user_prompt,
+                    use_llm_func,
+                    system_prompt=entity_extraction_system_prompt,
+                    llm_response_cache=llm_response_cache,
+                    cache_type="extract",
+                    chunk_id=chunk_key,
+                    cache_keys_collector=cache_keys_collector,
+                )
 
         history = pack_user_ass_to_openai_messages(
             entity_extraction_user_prompt, final_result
@@ -2881,23 +3048,24 @@ async def extract_entities(
                 + history_str
                 + entity_continue_extraction_user_prompt
             )
-            token_count = len(tokenizer.encode(full_context_str))
+            token_count = tokenizer.count_tokens(full_context_str)
 
             if token_count > max_input_tokens:
                 logger.warning(
                     f"Gleaning stopped for chunk {chunk_key}: Input tokens ({token_count}) exceeded limit ({max_input_tokens})."
                 )
             else:
-                glean_result, timestamp = await use_llm_func_with_cache(
-                    entity_continue_extraction_user_prompt,
-                    use_llm_func,
-                    system_prompt=entity_extraction_system_prompt,
-                    llm_response_cache=llm_response_cache,
-                    history_messages=history,
-                    cache_type="extract",
-                    chunk_id=chunk_key,
-                    cache_keys_collector=cache_keys_collector,
-                )
+                with track_stage("gleaning"):
+                    glean_result, timestamp = await use_llm_func_with_cache(
+                        entity_continue_extraction_user_prompt,
+                        use_llm_func,
+                        system_prompt=entity_extraction_system_prompt,
+                        llm_response_cache=llm_response_cache,
+                        history_messages=history,
+                        cache_type="extract",
+                        chunk_id=chunk_key,
+                        cache_keys_collector=cache_keys_collector,
+                    )
 
                 # Process gleaning result separately with file path
                 glean_nodes, glean_edges = await _process_extraction_result(
@@ -2966,11 +3134,103 @@ async def extract_entities(
         # Return the extracted nodes and edges for centralized processing
         return maybe_nodes, maybe_edges
 
+    async def _extract_pack(
+        pack: list[tuple[str, TextChunkSchema]],
+    ) -> dict[str, tuple[str, int, str | None]]:
+        """Initial extraction of several small chunks with one LLM call
+
+        The response is split back per chunk and cached under each chunk's own
+        single-chunk prompt, so cache hits, llm_cache_list tracking and knowledge
+        rebuilds work exactly as for chunks extracted one by one.
+
+        Returns:
+            dict: chunk_key -> (result, timestamp, cache_key) for every chunk served from
+                cache or found in the packed response
+        """
+        system_prompt = PROMPTS["entity_extraction_system_prompt"].format(
+            **context_base
+        )
+        initial_results = {}
+        misses = []
+        for chunk_key, chunk_dp in pack:
+            user_prompt = PROMPTS["entity_extraction_user_prompt"].format(
+                **{**context_base, "input_text": chunk_dp["content"]}
+            )
+            cached = await get_cached_llm_response(
+                llm_response_cache, user_prompt, system_prompt, cache_type="extract"
+            )
+            if cached:
+                initial_results[chunk_key] = cached
+            else:
+                misses.append((chunk_key, user_prompt, chunk_dp["content"]))
+        if len(misses) < 2:
+            # Nothing to pack, a lone chunk takes the regular path
+            return initial_results
+
+        input_texts = "\n\n".join(
+            f'<Input Text id="{text_id}">\n```\n{content}\n```'
+            for text_id, (_, _, content) in enumerate(misses, start=1)
+        )
+        packed_user_prompt = PROMPTS["entity_extraction_packed_user_prompt"].format(
+            **context_base, text_count=len(misses), input_texts=input_texts
+        )
+        # One call for all misses; chunks missing from the response count their own call
+        record_llm_cache_miss("extract")
+        with track_stage("llm_extraction", items=len(misses)):
+            # The packed response is cached per chunk below, not as a whole
+            packed_result, timestamp = await use_llm_func_with_cache(
+                packed_user_prompt, use_llm_func, system_prompt=system_prompt
+            )
+
+        sections = _split_packed_extraction_result(
+            packed_result,
+            len(misses),
+            context_base["tuple_delimiter"],
+            context_base["completion_delimiter"],
+        )
+        for text_id, (chunk_key, user_prompt, _) in enumerate(misses, start=1):
+            if text_id not in sections:
+                logger.warning(
+                    f"Packed extraction returned no section for {chunk_key}, extracting it separately"
+                )
+                continue
+            cache_key = await save_llm_response_to_cache(
+                llm_response_cache,
+                user_prompt,
+                sections[text_id],
+                system_prompt,
+                cache_type="extract",
+                chunk_id=chunk_key,
+            )
+            initial_results[chunk_key] = (sections[text_id], timestamp, cache_key)
+        return initial_results
+
+    # Pack runs of small chunks into one extraction call when enabled
+    pack_max_tokens = global_config.get("entity_extract_pack_max_tokens", 0)
+    pack_max_chunks = global_config.get(
+        "entity_extract_pack_max_chunks", DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS
+    )
+    packs: list[list[tuple[str, TextChunkSchema]]] = []
+    pack_tokens = 0
+    for chunk in ordered_chunks:
+        chunk_tokens = chunk[1].get("tokens", 0)
+        if (
+            packs
+            and pack_max_tokens > 0
+            and len(packs[-1]) < pack_max_chunks
+            and pack_tokens + chunk_tokens <= pack_max_tokens
+        ):
+            packs[-1].append(chunk)
+            pack_tokens += chunk_tokens
+        else:
+            packs.append([chunk])
+            pack_tokens = chunk_tokens
+
     # Get max async tasks limit from global_config
     chunk_max_async = global_config.get("llm_model_max_async", 4)
     semaphore = asyncio.Semaphore(chunk_max_async)
 
-    async def _process_with_semaphore(chunk):
+    async def _process_with_semaphore(pack):
         async with semaphore:
             # Check for cancellation before processing chunk
             if pipeline_status is not None and pipeline_status_lock is not None:
@@ -2980,16 +3240,25 @@ async def extract_entities(
                             "User cancelled during chunk processing"
                         )
 
+            chunk_id = pack[0][0]
             try:
-                return await _process_single_content(chunk)
+                initial_results = await _extract_pack(pack) if len(pack) > 1 else {}
+                results = []
+                for chunk in pack:
+                    chunk_id = chunk[0]
+                    results.append(
+                        await _process_single_content(
+                            chunk, initial_results.get(chunk_id)
+                        )
+                    )
+                return results
             except Exception as e:
-                chunk_id = chunk[0]  # Extract chunk_id from chunk[0]
                 prefixed_exception = create_prefixed_exception(e, chunk_id)
                 raise prefixed_exception from e
 
     tasks = []
-    for c in ordered_chunks:
-        task = asyncio.create_task(_process_with_semaphore(c))
+    for pack in packs:
+        task = asyncio.create_task(_process_with_semaphore(pack))
         tasks.append(task)
 
     # Wait for tasks to complete or for the first exception to occur
@@ -3007,7 +3276,7 @@ async def extract_entities(
                 if first_exception is None:
                     first_exception = exception
             else:
-                chunk_results.append(task.result())
+                chunk_results.extend(task.result())
         except Exception as e:
             if first_exception is None:
                 first_exception = e
@@ -3086,9 +3355,10 @@ async def kg_query(
         # Apply higher priority (5) to query relation LLM function
         use_model_func = partial(use_model_func, _priority=5)
 
-    hl_keywords, ll_keywords = await get_keywords_from_query(
-        query, query_param, global_config, hashing_kv
-    )
+    with trace_span("keyword_extraction"):
+        hl_keywords, ll_keywords = await get_keywords_from_query(
+            query, query_param, global_config, hashing_kv
+        )
 
     logger.debug(f"High-level keywords: {hl_keywords}")
     logger.debug(f"Low-level  keywords: {ll_keywords}")
@@ -3154,9 +3424,9 @@ async def kg_query(
 
     # Call LLM
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
+    len_of_prompts = tokenizer.count_tokens(query + sys_prompt)
     logger.debug(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {tokenizer.count_tokens(query)}, System: {tokenizer.count_tokens(sys_prompt)})"
     )
 
     # Handle cache
@@ -3186,13 +3456,14 @@ async def kg_query(
         )
         response = cached_response
     else:
-        response = await use_model_func(
-            user_query,
-            system_prompt=sys_prompt,
-            history_messages=query_param.conversation_history,
-            enable_cot=True,
-            stream=query_param.stream,
-        )
+        with trace_span("llm", stream=bool(query_param.stream)):
+            response = await use_model_func(
+                user_query,
+                system_prompt=sys_prompt,
+                history_messages=query_param.conversation_history,
+                enable_cot=True,
+                stream=query_param.stream,
+            )
 
         if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
             queryparam_dict = {
@@ -3322,7 +3593,7 @@ async def extract_keywords_only(
     )
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
+    len_of_prompts = tokenizer.count_tokens(kw_prompt)
     logger.debug(
         f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
     )
@@ -3412,8 +3683,12 @@ async def _get_vector_context(
         search_top_k = query_param.chunk_top_k or query_param.top_k
         cosine_threshold = chunks_vdb.cosine_better_than_threshold
 
-        results = await chunks_vdb.query(
-            query, top_k=search_top_k, query_embedding=query_embedding
+        results = await traced_storage_call(
+            "chunks_vdb.query",
+            chunks_vdb.query(
+                query, top_k=search_top_k, query_embedding=query_embedding
+            ),
+            top_k=search_top_k,
         )
         if not results:
             logger.info(
@@ -3465,83 +3740,113 @@ async def _perform_kg_search(
     global_entities = []
     global_relations = []
     vector_chunks = []
-    chunk_tracking = {}
-
-    # Handle different query modes
 
     # Track chunk sources and metadata for final logging
     chunk_tracking = {}  # chunk_id -> {source, frequency, order}
 
-    # Pre-compute query embedding once for all vector operations
+    # Per-stage wall-clock time in milliseconds, stages run concurrently
+    stage_timings: dict[str, float] = {}
+    search_start = time.perf_counter()
+
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
-        actual_embedding_func = text_chunks_db.embedding_func
-        if actual_embedding_func:
-            try:
-                query_embedding = await actual_embedding_func([query])
-                query_embedding = query_embedding[
-                    0
-                ]  # Extract first embedding from batch result
-                logger.debug("Pre-computed query embedding for all vector operations")
-            except Exception as e:
-                logger.warning(f"Failed to pre-compute query embedding: {e}")
-                query_embedding = None
+    # local/global mode falls back to the other keyword list when its own one is empty
+    run_local = len(ll_keywords) > 0 and (
+        query_param.mode != "global" or len(hl_keywords) == 0
+    )
+    run_global = len(hl_keywords) > 0 and (
+        query_param.mode != "local" or len(ll_keywords) == 0
+    )
+    run_vector = query_param.mode == "mix" and chunks_vdb is not None
 
-    # Handle local and global modes
-    if query_param.mode == "local" and len(ll_keywords) > 0:
-        local_entities, local_relations = await _get_node_data(
-            ll_keywords,
-            knowledge_graph_inst,
-            entities_vdb,
-            query_param,
-        )
+    async def _timed(stage: str, coro):
+        stage_start = time.perf_counter()
+        try:
+            with trace_span(stage):
+                return await coro
+        finally:
+            stage_timings[stage] = round((time.perf_counter() - stage_start) * 1000, 2)
+
+    # Embed the raw query and the ll/hl keyword strings with a single embedding call,
+    # then hand the vectors to every vector search of this query
+    embedding_texts = []
+    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
+        embedding_texts.append(query)
+    if run_local:
+        embedding_texts.append(ll_keywords)
+    if run_global:
+        embedding_texts.append(hl_keywords)
+    query_embeddings = {}
+    if embedding_texts and text_chunks_db.embedding_func:
+        try:
+            query_embeddings = await _timed(
+                "query_embedding",
+                embed_query_texts(text_chunks_db.embedding_func, embedding_texts),
+            )
+            logger.debug(
+                f"Pre-computed {len(query_embeddings)} query embeddings for all vector operations"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embeddings: {e}")
+    query_embedding = query_embeddings.get(query)
 
-    elif query_param.mode == "global" and len(hl_keywords) > 0:
-        global_relations, global_entities = await _get_edge_data(
-            hl_keywords,
-            knowledge_graph_inst,
-            relationships_vdb,
-            query_param,
+    async def _vector_search():
+        if not run_vector:
+            return []
+        return await _timed(
+            "vector_search",
+            _get_vector_context(query, chunks_vdb, query_param, query_embedding),
         )
 
-    else:  # hybrid or mix mode
-        if len(ll_keywords) > 0:
-            local_entities, local_relations = await _get_node_data(
+    async def _local_search():
+        if not run_local:
+            return [], []
+        return await _timed(
+            "local_search",
+            _get_node_data(
                 ll_keywords,
                 knowledge_graph_inst,
                 entities_vdb,
                 query_param,
-            )
-        if len(hl_keywords) > 0:
-            global_relations, global_entities = await _get_edge_data(
+                query_embedding=query_embeddings.get(ll_keywords),
+            ),
+        )
+
+    async def _global_search():
+        if not run_global:
+            return [], []
+        return await _timed(
+            "global_search",
+            _get_edge_data(
                 hl_keywords,
                 knowledge_graph_inst,
                 relationships_vdb,
                 query_param,
-            )
+                query_embedding=query_embeddings.get(hl_keywords),
+            ),
+        )
 
-        # Get vector chunks for mix mode
-        if query_param.mode == "mix" and chunks_vdb:
-            vector_chunks = await _get_vector_context(
-                query,
-                chunks_vdb,
-                query_param,
-                query_embedding,
-            )
-            # Track vector chunks with source metadata
-            for i, chunk in enumerate(vector_chunks):
-                chunk_id = chunk.get("chunk_id") or chunk.get("id")
-                if chunk_id:
-                    chunk_tracking[chunk_id] = {
-                        "source": "C",
-                        "frequency": 1,  # Vector chunks always have frequency 1
-                        "order": i + 1,  # 1-based order in vector search results
-                    }
-                else:
-                    logger.warning(f"Vector chunk missing chunk_id: {chunk}")
+    # Local entities, global relations and vector chunks are independent retrievals,
+    # run them concurrently so latency is bounded by the slowest stage
+    (
+        vector_chunks,
+        (local_entities, local_relations),
+        (global_relations, global_entities),
+    ) = await asyncio.gather(_vector_search(), _local_search(), _global_search())
+    stage_timings["kg_search"] = round((time.perf_counter() - search_start) * 1000, 2)
+
+    # Track vector chunks with source metadata
+    for i, chunk in enumerate(vector_chunks):
+        chunk_id = chunk.get("chunk_id") or chunk.get("id")
+        if chunk_id:
+            chunk_tracking[chunk_id] = {
+                "source": "C",
+                "frequency": 1,  # Vector chunks always have frequency 1
+                "order": i + 1,  # 1-based order in vector search results
+            }
+        else:
+            logger.warning(f"Vector chunk missing chunk_id: {chunk}")
 
     # Round-robin merge entities
     final_entities = []
@@ -3609,6 +3914,7 @@ async def _perform_kg_search(
         "vector_chunks": vector_chunks,
         "chunk_tracking": chunk_tracking,
         "query_embedding": query_embedding,
+        "stage_timings": stage_timings,
     }
 
 
@@ -3949,7 +4255,7 @@ async def _build_context_str(
         text_chunks_str="",
         reference_list_str="",
     )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
+    kg_context_tokens = tokenizer.count_tokens(pre_kg_context)
 
     # Calculate preliminary system prompt tokens
     pre_sys_prompt = sys_prompt_template.format(
@@ -3957,10 +4263,10 @@ async def _build_context_str(
         response_type=response_type,
         user_prompt=user_prompt,
     )
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
 
     # Calculate available tokens for text chunks
-    query_tokens = len(tokenizer.encode(query))
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + kg_context_tokens + query_tokens + buffer_tokens
@@ -4091,17 +4397,18 @@ async def _build_query_context(
         return None
 
     # Stage 1: Pure search
-    search_result = await _perform_kg_search(
-        query,
-        ll_keywords,
-        hl_keywords,
-        knowledge_graph_inst,
-        entities_vdb,
-        relationships_vdb,
-        text_chunks_db,
-        query_param,
-        chunks_vdb,
-    )
+    with trace_span("kg_search"):
+        search_result = await _perform_kg_search(
+            query,
+            ll_keywords,
+            hl_keywords,
+            knowledge_graph_inst,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks_db,
+            query_param,
+            chunks_vdb,
+        )
 
     if not search_result["final_entities"] and not search_result["final_relations"]:
         if query_param.mode != "mix":
@@ -4111,25 +4418,27 @@ async def _build_query_context(
                 return None
 
     # Stage 2: Apply token truncation for LLM efficiency
-    truncation_result = await _apply_token_truncation(
-        search_result,
-        query_param,
-        text_chunks_db.global_config,
-    )
+    with trace_span("truncation"):
+        truncation_result = await _apply_token_truncation(
+            search_result,
+            query_param,
+            text_chunks_db.global_config,
+        )
 
     # Stage 3: Merge chunks using filtered entities/relations
-    merged_chunks = await _merge_all_chunks(
-        filtered_entities=truncation_result["filtered_entities"],
-        filtered_relations=truncation_result["filtered_relations"],
-        vector_chunks=search_result["vector_chunks"],
-        query=query,
-        knowledge_graph_inst=knowledge_graph_inst,
-        text_chunks_db=text_chunks_db,
-        query_param=query_param,
-        chunks_vdb=chunks_vdb,
-        chunk_tracking=search_result["chunk_tracking"],
-        query_embedding=search_result["query_embedding"],
-    )
+    with trace_span("merge_chunks"):
+        merged_chunks = await _merge_all_chunks(
+            filtered_entities=truncation_result["filtered_entities"],
+            filtered_relations=truncation_result["filtered_relations"],
+            vector_chunks=search_result["vector_chunks"],
+            query=query,
+            knowledge_graph_inst=knowledge_graph_inst,
+            text_chunks_db=text_chunks_db,
+            query_param=query_param,
+            chunks_vdb=chunks_vdb,
+            chunk_tracking=search_result["chunk_tracking"],
+            query_embedding=search_result["query_embedding"],
+        )
 
     if (
         not merged_chunks
@@ -4140,17 +4449,18 @@ async def _build_query_context(
 
     # Stage 4: Build final LLM context with dynamic token processing
     # _build_context_str now always returns tuple[str, dict]
-    context, raw_data = await _build_context_str(
-        entities_context=truncation_result["entities_context"],
-        relations_context=truncation_result["relations_context"],
-        merged_chunks=merged_chunks,
-        query=query,
-        query_param=query_param,
-        global_config=text_chunks_db.global_config,
-        chunk_tracking=search_result["chunk_tracking"],
-        entity_id_to_original=truncation_result["entity_id_to_original"],
-        relation_id_to_original=truncation_result["relation_id_to_original"],
-    )
+    with trace_span("build_context"):
+        context, raw_data = await _build_context_str(
+            entities_context=truncation_result["entities_context"],
+            relations_context=truncation_result["relations_context"],
+            merged_chunks=merged_chunks,
+            query=query,
+            query_param=query_param,
+            global_config=text_chunks_db.global_config,
+            chunk_tracking=search_result["chunk_tracking"],
+            entity_id_to_original=truncation_result["entity_id_to_original"],
+            relation_id_to_original=truncation_result["relation_id_to_original"],
+        )
 
     # Convert keywords strings to lists and add complete metadata to raw_data
     hl_keywords_list = hl_keywords.split(", ") if hl_keywords else []
@@ -4177,6 +4487,7 @@ async def _build_query_context(
         "merged_chunks_count": len(merged_chunks),
         "final_chunks_count": len(raw_data.get("data", {}).get("chunks", [])),
     }
+    raw_data["metadata"]["stage_timings_ms"] = search_result["stage_timings"]
 
     logger.debug(
         f"[_build_query_context] Context length: {len(context) if context else 0}"
@@ -4193,13 +4504,20 @@ async def _get_node_data(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     # get similar entities
     logger.info(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    results = await traced_storage_call(
+        "entities_vdb.query",
+        entities_vdb.query(
+            query, top_k=query_param.top_k, query_embedding=query_embedding
+        ),
+        top_k=query_param.top_k,
+    )
 
     if not len(results):
         return [], []
@@ -4209,8 +4527,16 @@ async def _get_node_data(
 
     # Call the batch node retrieval and degree functions concurrently.
     nodes_dict, degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_nodes_batch(node_ids),
-        knowledge_graph_inst.node_degrees_batch(node_ids),
+        traced_storage_call(
+            "graph.get_nodes_batch",
+            knowledge_graph_inst.get_nodes_batch(node_ids),
+            batch_size=len(node_ids),
+        ),
+        traced_storage_call(
+            "graph.node_degrees_batch",
+            knowledge_graph_inst.node_degrees_batch(node_ids),
+            batch_size=len(node_ids),
+        ),
     )
 
     # Now, if you need the node data and degree in order:
@@ -4252,7 +4578,11 @@ async def _find_most_related_edges_from_entities(
     knowledge_graph_inst: BaseGraphStorage,
 ):
     node_names = [dp["entity_name"] for dp in node_datas]
-    batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
+    batch_edges_dict = await traced_storage_call(
+        "graph.get_nodes_edges_batch",
+        knowledge_graph_inst.get_nodes_edges_batch(node_names),
+        batch_size=len(node_names),
+    )
 
     all_edges = []
     seen = set()
@@ -4273,8 +4603,16 @@ async def _find_most_related_edges_from_entities(
 
     # Call the batched functions concurrently.
     edge_data_dict, edge_degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
-        knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
+        traced_storage_call(
+            "graph.get_edges_batch",
+            knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
+            batch_size=len(edge_pairs_dicts),
+        ),
+        traced_storage_call(
+            "graph.edge_degrees_batch",
+            knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
+            batch_size=len(edge_pairs_tuples),
+        ),
     )
 
     # Reconstruct edge_datas list in the same order as the deduplicated results.
@@ -4439,7 +4777,11 @@ async def _find_related_text_unit_from_entities(
     unique_chunk_ids = list(
         dict.fromkeys(selected_chunk_ids)
     )  # Remove duplicates while preserving order
-    chunk_data_list = await text_chunks_db.get_by_ids(unique_chunk_ids)
+    chunk_data_list = await traced_storage_call(
+        "text_chunks.get_by_ids",
+        text_chunks_db.get_by_ids(unique_chunk_ids),
+        batch_size=len(unique_chunk_ids),
+    )
 
     # Step 6: Build result chunks with valid data and update chunk tracking
     result_chunks = []
@@ -4466,12 +4808,19 @@ async def _get_edge_data(
     knowledge_graph_inst: BaseGraphStorage,
     relationships_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     logger.info(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    results = await traced_storage_call(
+        "relationships_vdb.query",
+        relationships_vdb.query(
+            keywords, top_k=query_param.top_k, query_embedding=query_embedding
+        ),
+        top_k=query_param.top_k,
+    )
 
     if not len(results):
         return [], []
@@ -4479,7 +4828,11 @@ async def _get_edge_data(
     # Prepare edge pairs in two forms:
     # For the batch edge properties function, use dicts.
     edge_pairs_dicts = [{"src": r["src_id"], "tgt": r["tgt_id"]} for r in results]
-    edge_data_dict = await knowledge_graph_inst.get_edges_batch(edge_pairs_dicts)
+    edge_data_dict = await traced_storage_call(
+        "graph.get_edges_batch",
+        knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
+        batch_size=len(edge_pairs_dicts),
+    )
 
     # Reconstruct edge_datas list in the same order as results.
     edge_datas = []
@@ -4534,7 +4887,11 @@ async def _find_most_related_entities_from_relationships(
             seen.add(e["tgt_id"])
 
     # Only get nodes data, no need for node degrees
-    nodes_dict = await knowledge_graph_inst.get_nodes_batch(entity_names)
+    nodes_dict = await traced_storage_call(
+        "graph.get_nodes_batch",
+        knowledge_graph_inst.get_nodes_batch(entity_names),
+        batch_size=len(entity_names),
+    )
 
     # Rebuild the list in the same order as entity_names
     node_datas = []
@@ -4731,7 +5088,11 @@ async def _find_related_text_unit_from_relations(
     unique_chunk_ids = list(
         dict.fromkeys(selected_chunk_ids)
     )  # Remove duplicates while preserving order
-    chunk_data_list = await text_chunks_db.get_by_ids(unique_chunk_ids)
+    chunk_data_list = await traced_storage_call(
+        "text_chunks.get_by_ids",
+        text_chunks_db.get_by_ids(unique_chunk_ids),
+        batch_size=len(unique_chunk_ids),
+    )
 
     # Step 6: Build result chunks with valid data and update chunk tracking
     result_chunks = []
@@ -4857,8 +5218,8 @@ async def naive_query(
     )
 
     # Calculate available tokens for chunks
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
-    query_tokens = len(tokenizer.encode(query))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + query_tokens + buffer_tokens
@@ -4869,14 +5230,15 @@ async def naive_query(
     )
 
     # Process chunks using unified processing with dynamic token limit
-    processed_chunks = await process_chunks_unified(
-        query=query,
-        unique_chunks=chunks,
-        query_param=query_param,
-        global_config=global_config,
-        source_type="vector",
-        chunk_token_limit=available_chunk_tokens,  # Pass dynamic limit
-    )
+    with trace_span("truncation"):
+        processed_chunks = await process_chunks_unified(
+            query=query,
+            unique_chunks=chunks,
+            query_param=query_param,
+            global_config=global_config,
+            source_type="vector",
+            chunk_token_limit=available_chunk_tokens,  # Pass dynamic limit
+        )
 
     # Generate reference list from processed chunks using the new common function
     reference_list, processed_chunks_with_ref_ids = generate_reference_list_from_chunks(
@@ -4969,13 +5331,14 @@ async def naive_query(
         )
         response = cached_response
     else:
-        response = await use_model_func(
-            user_query,
-            system_prompt=sys_prompt,
-            history_messages=query_param.conversation_history,
-            enable_cot=True,
-            stream=query_param.stream,
-        )
+        with trace_span("llm", stream=bool(query_param.stream)):
+            response = await use_model_func(
+                user_query,
+                system_prompt=sys_prompt,
+                history_messages=query_param.conversation_history,
+                enable_cot=True,
+                stream=query_param.stream,
+            )
 
         if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
             queryparam_dict = {
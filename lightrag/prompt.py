@@ -81,6 +81,25 @@ Extract entities and relationships from the input text in Data to be Processed b
 <Output>
 """
 
+PROMPTS["entity_extraction_packed_user_prompt"] = """---Task---
+Extract entities and relationships from each of the {text_count} input texts in Data to be Processed below. Treat every input text as a separate document.
+
+---Instructions---
+1.  **Strict Adherence to Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system prompt.
+2.  **One Section per Input Text:** For each input text, in order, first output the line `text{tuple_delimiter}<id>` with the id of that input text, followed by the entities and relationships extracted from that input text only. Output the section line even if an input text contains nothing to extract. Never output relationships between entities of different input texts.
+3.  **Output Content Only:** Output *only* the section lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text before or after the lists.
+4.  **Completion Signal:** Output `{completion_delimiter}` once, as the final line after the sections of all input texts.
+5.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+---Data to be Processed---
+<Entity_types>
+[{entity_types}]
+
+{input_texts}
+
+<Output>
+"""
+
 PROMPTS["entity_continue_extraction_user_prompt"] = """---Task---
 Based on the last extraction task, identify and extract any **missed or incorrectly formatted** entities and relationships from the input text.
 
@@ -430,3 +449,12 @@ Output:
 
 """,
 ]
+
+PROMPTS["semantic_cache_check"] = """---Task---
+Decide whether two user questions ask for the same information, so that the answer to the first one fully answers the second one.
+
+Question 1: {cached_query}
+Question 2: {query}
+
+Answer with exactly one word: "yes" or "no".
+"""
@@ -0,0 +1,299 @@
+"""
+Caches of complete query results.
+
+`aquery_llm` / `aquery_data` look results up here before keyword extraction, vector
+searches, graph calls, rerank or truncation run. `QueryResponseCache` is an in-process
+LRU for exact repeats (e.g. a dashboard refresh) that costs one dictionary lookup;
+`SemanticQueryCache` serves near-duplicate phrasings of an earlier query by embedding
+similarity. Both key results on the query scope (every QueryParam field that shapes
+the result) and the workspace data version from `shared_storage`, which is bumped on
+every insert, delete and graph edit, so stale results are never served.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+
+from lightrag.base import QueryParam
+from lightrag.utils import compute_args_hash, compute_mdhash_id
+
+# QueryParam fields that do not change the returned result or make it uncacheable
+_UNKEYED_PARAM_FIELDS = ("stream", "model_func", "trace")
+
+# Best candidates this far below the similarity threshold are counted as near misses
+SEMANTIC_CACHE_NEAR_MISS_MARGIN = 0.05
+# Query embeddings kept between a semantic lookup and storing its result
+SEMANTIC_CACHE_RECENT_VECTORS = 64
+
+
+def query_cache_scope(
+    kind: str, param: QueryParam, system_prompt: str | None = None
+) -> str | None:
+    """Hash of everything but the query text that shapes a query result, or None if the
+    result must not be cached"""
+    if param.stream or param.model_func is not None or param.trace:
+        return None
+    if param.mode == "bypass":
+        return None
+    fields = {
+        name: value
+        for name, value in asdict(param).items()
+        if name not in _UNKEYED_PARAM_FIELDS
+    }
+    return compute_args_hash(
+        kind,
+        system_prompt or "",
+        json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str),
+    )
+
+
+def query_cache_key(
+    kind: str,
+    query: str,
+    param: QueryParam,
+    data_version: str,
+    system_prompt: str | None = None,
+) -> str | None:
+    """Cache key of a query result, or None if the result must not be cached"""
+    scope = query_cache_scope(kind, param, system_prompt)
+    if scope is None:
+        return None
+    return scoped_query_cache_key(scope, query, data_version)
+
+
+def scoped_query_cache_key(scope: str, query: str, data_version: str) -> str:
+    return compute_args_hash(scope, query.strip(), data_version)
+
+
+class QueryResponseCache:
+    """LRU map of query cache key -> query result"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str | None) -> dict[str, Any] | None:
+        if key is None:
+            return None
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Callers own the returned dict and may annotate it
+        return copy.deepcopy(result)
+
+    def put(self, key: str | None, result: dict[str, Any]) -> None:
+        if key is None:
+            return
+        self._entries[key] = copy.deepcopy(result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class SemanticQueryCache:
+    """Serve near-duplicate queries with the results of earlier ones
+
+    Each answered query is kept in process memory with its normalized embedding, result,
+    scope and data version. A lookup returns the result of the most similar earlier query
+    of the same scope and data version when the cosine similarity reaches
+    `similarity_threshold`, optionally confirmed by `llm_check_func(cached_query, query)`.
+    At most `max_entries` queries are kept, least recently used first out, and entries of
+    an older data version are dropped as soon as a newer one is seen. Entries are not
+    persisted: data versions never repeat across restarts, so they could not be served
+    again anyway.
+    """
+
+    def __init__(
+        self,
+        embedding_func: Callable[..., Awaitable[np.ndarray]],
+        similarity_threshold: float = 0.95,
+        llm_check_func: Callable[[str, str], Awaitable[bool]] | None = None,
+        max_entries: int = 1000,
+    ):
+        self.embedding_func = embedding_func
+        self.similarity_threshold = similarity_threshold
+        self.llm_check_func = llm_check_func
+        self.max_entries = max(1, max_entries)
+        # (scope, query) -> {"id", "vector", "result"} of the current data version
+        self._entries: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._ids: dict[str, tuple[str, str]] = {}
+        # scope -> (queries, stacked vectors), rebuilt after the scope changed
+        self._scope_matrices: dict[str, tuple[list[str], np.ndarray]] = {}
+        self._data_version: str | None = None
+        # Embeddings of looked-up queries, reused when their results are stored
+        self._recent_vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+        # Running minimum and sum of hit similarities, averaged over counters["hits"]
+        self._min_hit_similarity: float | None = None
+        self._hit_similarity_sum = 0.0
+        self.counters = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "near_misses": 0,
+            "llm_check_rejections": 0,
+            "reported_false_hits": 0,
+            "evictions": 0,
+        }
+
+    def _use_data_version(self, data_version: str) -> None:
+        if data_version != self._data_version:
+            self.clear()
+            self._data_version = data_version
+
+    async def _embed(self, query: str) -> np.ndarray:
+        vector = self._recent_vectors.pop(query, None)
+        if vector is None:
+            # Same priority as the query embeddings of vector storages
+            embedding = await self.embedding_func([query], _priority=5)
+            vector = np.asarray(embedding[0], dtype=np.float32).reshape(-1)
+            vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+        self._recent_vectors[query] = vector
+        while len(self._recent_vectors) > SEMANTIC_CACHE_RECENT_VECTORS:
+            self._recent_vectors.popitem(last=False)
+        return vector
+
+    def _scope_matrix(self, scope: str) -> tuple[list[str], np.ndarray] | None:
+        matrix = self._scope_matrices.get(scope)
+        if matrix is None:
+            queries = [query for s, query in self._entries if s == scope]
+            if not queries:
+                return None
+            matrix = (
+                queries,
+                np.stack([self._entries[(scope, q)]["vector"] for q in queries]),
+            )
+            self._scope_matrices[scope] = matrix
+        return matrix
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._ids.pop(entry["id"], None)
+            self._scope_matrices.pop(key[0], None)
+
+    async def lookup(
+        self, query: str, scope: str, data_version: str
+    ) -> dict[str, Any] | None:
+        self.counters["lookups"] += 1
+        query = query.strip()
+        self._use_data_version(data_version)
+        vector = await self._embed(query)
+
+        best_query, similarity = None, None
+        scope_matrix = self._scope_matrix(scope)
+        if scope_matrix is not None:
+            queries, matrix = scope_matrix
+            scores = matrix @ vector
+            best = int(np.argmax(scores))
+            best_query, similarity = queries[best], float(scores[best])
+        if similarity is None or similarity < self.similarity_threshold:
+            if (
+                similarity is not None
+                and similarity
+                >= self.similarity_threshold - SEMANTIC_CACHE_NEAR_MISS_MARGIN
+            ):
+                self.counters["near_misses"] += 1
+            self.counters["misses"] += 1
+            return None
+
+        if self.llm_check_func is not None and best_query != query:
+            if not await self.llm_check_func(best_query, query):
+                self.counters["llm_check_rejections"] += 1
+                self.counters["misses"] += 1
+                return None
+
+        entry = self._entries.get((scope, best_query))
+        if entry is None or self._data_version != data_version:
+            # Removed or invalidated while the LLM check ran
+            self.counters["misses"] += 1
+            return None
+        self._entries.move_to_end((scope, best_query))
+        self.counters["hits"] += 1
+        self._hit_similarity_sum += similarity
+        if self._min_hit_similarity is None or similarity < self._min_hit_similarity:
+            self._min_hit_similarity = similarity
+        result = json.loads(entry["result"])
+        result.setdefault("metadata", {})["semantic_cache"] = {
+            "entry_id": entry["id"],
+            "cached_query": best_query,
+            "similarity": round(similarity, 4),
+        }
+        return result
+
+    async def store(
+        self, query: str, scope: str, data_version: str, result: dict[str, Any]
+    ) -> None:
+        query = query.strip()
+        vector = await self._embed(query)
+        self._use_data_version(data_version)
+        key = (scope, query)
+        self._remove(key)
+        entry_id = compute_mdhash_id(f"{scope}:{query}", prefix="qc-")
+        self._entries[key] = {
+            "id": entry_id,
+            "vector": vector,
+            # Serialized so callers cannot mutate the cached result
+            "result": json.dumps(result, ensure_ascii=False, default=str),
+        }
+        self._ids[entry_id] = key
+        self._scope_matrices.pop(scope, None)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.counters["evictions"] += 1
+
+    async def report_false_hit(self, entry_id: str) -> None:
+        """Count a served result that did not answer the query and forget its entry"""
+        self.counters["reported_false_hits"] += 1
+        key = self._ids.get(entry_id)
+        if key is not None:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._ids.clear()
+        self._scope_matrices.clear()
+
+    def stats(self) -> dict[str, Any]:
+        hits = self.counters["hits"]
+        lookups = self.counters["lookups"]
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "similarity_threshold": self.similarity_threshold,
+            "llm_check": self.llm_check_func is not None,
+            **self.counters,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "false_hit_rate": self.counters["reported_false_hits"] / hits
+            if hits
+            else 0.0,
+            "min_hit_similarity": round(self._min_hit_similarity, 4)
+            if self._min_hit_similarity is not None
+            else None,
+            "avg_hit_similarity": round(self._hit_similarity_sum / hits, 4)
+            if hits
+            else None,
+        }
@@ -0,0 +1,186 @@
+"""
+Opt-in tracing of the query path.
+
+With `QueryParam(trace=True)` every query stage (keyword extraction, query embedding,
+vector queries, graph batch calls, rerank, truncation, LLM call, ...) is recorded as a
+span with its wall time and the number of storage round trips made inside it. Spans use
+OpenTelemetry field names and are returned in `raw_data["metadata"]["trace"]`; when the
+`opentelemetry-api` package is installed they are also replayed to the `lightrag` tracer
+so an SDK exporter can ship them.
+
+Tracing state lives in context variables, so concurrent queries and the concurrent
+retrieval tasks of one query each see their own parent span. Without an active trace all
+helpers are no-ops.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Iterator, TypeVar
+
+logger = logging.getLogger("lightrag")
+
+T = TypeVar("T")
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent: Span | None
+    start_time_unix_nano: int
+    end_time_unix_nano: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    storage_round_trips: int = 0
+    status: str = "OK"
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time_unix_nano or time.time_ns()
+        return round((end - self.start_time_unix_nano) / 1e6, 3)
+
+
+class QueryTrace:
+    """Spans recorded for one query"""
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+
+    def to_dict(self) -> dict[str, Any]:
+        root = self.spans[0] if self.spans else None
+        return {
+            "trace_id": self.trace_id,
+            "duration_ms": root.duration_ms if root else 0.0,
+            "storage_round_trips": root.storage_round_trips if root else 0,
+            "spans": [
+                {
+                    "name": span.name,
+                    "trace_id": self.trace_id,
+                    "span_id": span.span_id,
+                    "parent_span_id": span.parent.span_id if span.parent else None,
+                    "start_time_unix_nano": span.start_time_unix_nano,
+                    "end_time_unix_nano": span.end_time_unix_nano,
+                    "duration_ms": span.duration_ms,
+                    "status": span.status,
+                    "attributes": {
+                        **span.attributes,
+                        "lightrag.storage_round_trips": span.storage_round_trips,
+                    },
+                }
+                for span in self.spans
+            ],
+        }
+
+
+_current_trace: ContextVar[QueryTrace | None] = ContextVar(
+    "lightrag_query_trace", default=None
+)
+_current_span: ContextVar[Span | None] = ContextVar("lightrag_query_span", default=None)
+
+
+@contextmanager
+def start_query_trace(
+    enabled: bool, name: str, **attributes: Any
+) -> Iterator[QueryTrace | None]:
+    """Record a trace rooted at span `name` if `enabled`, yielding the trace (or None)"""
+    if not enabled:
+        yield None
+        return
+
+    trace = QueryTrace()
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        with trace_span(name, **attributes):
+            yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        _export_to_opentelemetry(trace)
+
+
+@contextmanager
+def trace_span(
+    name: str, storage: bool = False, **attributes: Any
+) -> Iterator[Span | None]:
+    """Record the enclosed block as a child span of the current span
+
+    Storage spans count one round trip on themselves and every enclosing span.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    span = Span(
+        name=name,
+        span_id=os.urandom(8).hex(),
+        parent=_current_span.get(),
+        start_time_unix_nano=time.time_ns(),
+        attributes=dict(attributes),
+    )
+    trace.spans.append(span)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "ERROR"
+        span.attributes["exception.type"] = type(e).__name__
+        raise
+    finally:
+        span.end_time_unix_nano = time.time_ns()
+        _current_span.reset(token)
+        if storage:
+            node = span
+            while node is not None:
+                node.storage_round_trips += 1
+                node = node.parent
+
+
+async def traced_storage_call(name: str, awaitable: Awaitable[T], **attributes) -> T:
+    """Await one storage round trip, recorded as span `name` when tracing"""
+    if _current_trace.get() is None:
+        return await awaitable
+    with trace_span(name, storage=True, **attributes):
+        return await awaitable
+
+
+def _export_to_opentelemetry(trace: QueryTrace) -> None:
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        return
+
+    try:
+        tracer = otel_trace.get_tracer("lightrag")
+        otel_spans = {}
+        # Parents always start (and are appended) before their children
+        for span in trace.spans:
+            parent = otel_spans.get(id(span.parent))
+            otel_span = tracer.start_span(
+                span.name,
+                context=otel_trace.set_span_in_context(parent) if parent else None,
+                start_time=span.start_time_unix_nano,
+                attributes={
+                    **{
+                        key: value
+                        for key, value in span.attributes.items()
+                        if isinstance(value, (str, bool, int, float))
+                    },
+                    "lightrag.trace_id": trace.trace_id,
+                    "lightrag.storage_round_trips": span.storage_round_trips,
+                },
+            )
+            if span.status == "ERROR":
+                otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+            otel_spans[id(span)] = otel_span
+        for span in reversed(trace.spans):
+            otel_spans[id(span)].end(end_time=span.end_time_unix_nano)
+    except Exception as e:
+        logger.warning(f"Failed to export query trace to OpenTelemetry: {e}")
@@ -12,12 +12,15 @@ import logging
 import logging.handlers
 import os
 import re
+import threading
 import time
 import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
-from hashlib import md5
+from hashlib import blake2b, md5
 from typing import (
     Any,
     Protocol,
@@ -41,7 +44,11 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+    DEFAULT_CALL_PRIORITY,
 )
+from lightrag.metrics import pipeline_metrics
+from lightrag.tracing import trace_span, traced_storage_call
 
 # Precompile regex pattern for JSON sanitization (module-level, compiled once)
 _SURROGATE_PATTERN = re.compile(r"[\uD800-\uDFFF\uFFFE\uFFFF]")
@@ -436,6 +443,8 @@ class EmbeddingFunc:
         max_token_size: Enable embedding token limit checking for description summarization(Set embedding_token_limit in LightRAG)
         send_dimensions: Whether to inject embedding_dim argument to underlying function
         model_name: Model name for implementing workspace data isolation in vector DB
+        cache: Optional content-addressed vector cache (see lightrag.embedding_cache) consulted
+            before calling the underlying function
     """
 
     embedding_dim: int
@@ -445,6 +454,7 @@ class EmbeddingFunc:
     model_name: str | None = (
         None  # Model name for implementing workspace data isolation in vector DB
     )
+    cache: Any = None
 
     def __post_init__(self):
         """Unwrap nested EmbeddingFunc to prevent double wrapping issues.
@@ -499,6 +509,37 @@ class EmbeddingFunc:
             if "max_token_size" in sig.parameters:
                 kwargs["max_token_size"] = self.max_token_size
 
+        texts = args[0] if args else None
+        if (
+            self.cache is not None
+            and len(args) == 1
+            and isinstance(texts, (list, tuple))
+            and texts
+        ):
+            return await self._call_with_cache(texts, **kwargs)
+        return await self._call_func(*args, **kwargs)
+
+    async def _call_with_cache(self, texts, **kwargs) -> np.ndarray:
+        """Embed only the texts missing from the cache and merge with cached vectors"""
+        cached, keys = self.cache.lookup(texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if not missing:
+            return np.stack(cached)
+
+        fresh = await self._call_func([texts[i] for i in missing], **kwargs)
+        fresh = fresh.reshape(len(missing), self.embedding_dim)
+        self.cache.store([keys[i] for i in missing], fresh)
+        if len(missing) == len(texts):
+            return fresh
+
+        result = np.empty((len(texts), self.embedding_dim), dtype=fresh.dtype)
+        for i, vector in enumerate(cached):
+            if vector is not None:
+                result[i] = vector
+        result[missing] = fresh
+        return result
+
+    async def _call_func(self, *args, **kwargs) -> np.ndarray:
         # Call the actual embedding function
         result = await self.func(*args, **kwargs)
 
@@ -613,6 +654,361 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+class EmbeddingMicroBatcher:
+    """Coalesce concurrent small embedding requests into batched calls
+
+    Requests with fewer than `max_batch_size` texts are held for up to `max_wait_ms`
+    (or until `max_batch_size` texts are pending), sent to `func` as one batch of at
+    most `max_batch_size` texts, and
+    the resulting rows are fanned back out to each caller. Requests are only combined
+    when their keyword arguments (e.g. `_priority`, `embedding_dim`) are identical.
+    Priority-boosted requests (`_priority` below the queue default, e.g. query
+    embeddings) are latency sensitive and skip the wait window.
+    """
+
+    def __init__(self, func: Callable, max_batch_size: int, max_wait_ms: float):
+        self.func = func
+        # Let inspect.signature() see the wrapped function's parameters
+        self.__wrapped__ = func
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: dict[tuple, dict[str, Any]] = {}
+        # Strong references to running batch calls, the event loop only keeps weak ones
+        self._tasks: set[asyncio.Future] = set()
+        self.stats = {"requests": 0, "calls": 0}
+
+    def __deepcopy__(self, memo):
+        # Shared as-is by dataclasses.asdict(LightRAG): pending batches hold futures
+        # and timer handles that cannot be copied, and copies must batch together
+        return self
+
+    async def __call__(self, texts, *args, **kwargs) -> np.ndarray:
+        if args or not isinstance(texts, (list, tuple)):
+            return await self.func(texts, *args, **kwargs)
+
+        self.stats["requests"] += 1
+        if (
+            len(texts) >= self.max_batch_size
+            or kwargs.get("_priority", DEFAULT_CALL_PRIORITY) < DEFAULT_CALL_PRIORITY
+        ):
+            self.stats["calls"] += 1
+            return await self.func(texts, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), repr(sorted(kwargs.items())))
+        batch = self._pending.get(key)
+        if batch is not None and batch["size"] + len(texts) > self.max_batch_size:
+            # Never exceed the per-call cap: send what is pending, start a new batch
+            self._flush(key, batch)
+            batch = None
+        if batch is None:
+            batch = {"kwargs": kwargs, "items": [], "size": 0, "timer": None}
+            self._pending[key] = batch
+            batch["timer"] = loop.call_later(self.max_wait, self._flush, key, batch)
+
+        future = loop.create_future()
+        batch["items"].append((list(texts), future))
+        batch["size"] += len(texts)
+        if batch["size"] >= self.max_batch_size:
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key: tuple, batch: dict[str, Any]) -> None:
+        if self._pending.get(key) is not batch:
+            return  # Already flushed
+        del self._pending[key]
+        batch["timer"].cancel()
+        self.stats["calls"] += 1
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[str, Any]) -> None:
+        items = batch["items"]
+        all_texts = [text for texts, _ in items for text in texts]
+        try:
+            result = await self.func(all_texts, **batch["kwargs"])
+            result = np.asarray(result)
+            if len(result) != len(all_texts):
+                raise ValueError(
+                    f"Vector count mismatch: expected {len(all_texts)} vectors but got {len(result)} vectors (from batched embedding result)."
+                )
+        except BaseException as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        offset = 0
+        for texts, future in items:
+            if not future.done():
+                future.set_result(result[offset : offset + len(texts)])
+            offset += len(texts)
+
+
+def _is_rate_limit_error(error: BaseException) -> bool:
+    """Whether `error` (or the last tenacity attempt it wraps) signals HTTP 429 / throttling"""
+    last_attempt = getattr(error, "last_attempt", None)
+    if last_attempt is not None and last_attempt.failed:
+        error = last_attempt.exception()
+    status = getattr(error, "status_code", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+    return status == 429 or "RateLimit" in type(error).__name__
+
+
+def _is_timeout_error(error: BaseException) -> bool:
+    last_attempt = getattr(error, "last_attempt", None)
+    if last_attempt is not None and last_attempt.failed:
+        error = last_attempt.exception()
+    return (
+        isinstance(error, (asyncio.TimeoutError, TimeoutError, WorkerTimeoutError))
+        or "Timeout" in type(error).__name__
+    )
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the number of in-flight calls of a priority queue
+
+    The limit grows by one after `limit` consecutive healthy calls, is multiplied by
+    `decrease_factor` when a call is rate limited (429) or times out, and by
+    `latency_decrease_factor` when smoothed latency exceeds `latency_tolerance` times the
+    baseline latency. Like TCP congestion control, signals from calls that started before
+    the last decrease are ignored, so one burst of 429s counts as a single signal.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        latency_decrease_factor: float = 0.9,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(max_limit or initial_limit, self.min_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.latency_decrease_factor = latency_decrease_factor
+        self.permits = 0  # Held by workers, executing or waiting for a queued task
+        self.active_calls = 0
+        self._window_peak = 0  # Most concurrent calls seen since the last limit change
+        self._waiters: deque[asyncio.Future] = deque()
+        self._healthy_streak = 0
+        self._last_decrease = float("-inf")
+        self.latency_ewma: float | None = None
+        self.baseline_latency: float | None = None
+        self.stats = {
+            "calls": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "increases": 0,
+            "decreases": 0,
+        }
+
+    async def acquire(self) -> None:
+        if self.permits < int(self.limit) and not self._waiters:
+            self.permits += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # Permit was handed over just before cancellation
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        self.permits -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.permits < int(self.limit):
+            future = self._waiters.popleft()
+            if not future.done():
+                self.permits += 1
+                future.set_result(None)
+
+    def _decrease(self, factor: float, started: float, now: float) -> None:
+        if started < self._last_decrease:
+            return  # Issued under the previous, already reduced limit
+        self._last_decrease = now
+        self._healthy_streak = 0
+        self._window_peak = 0
+        new_limit = max(float(self.min_limit), self.limit * factor)
+        if int(new_limit) < int(self.limit):
+            self.stats["decreases"] += 1
+        self.limit = new_limit
+
+    def call_started(self) -> None:
+        self.active_calls += 1
+        self._window_peak = max(self._window_peak, self.active_calls)
+
+    def record(self, latency: float, error: BaseException | None = None) -> None:
+        """Feed the outcome of one call (begun with call_started) into the controller"""
+        now = time.monotonic()
+        started = now - latency
+        self.active_calls -= 1
+        self.stats["calls"] += 1
+        if error is not None:
+            if _is_rate_limit_error(error):
+                self.stats["rate_limited"] += 1
+                self._decrease(self.decrease_factor, started, now)
+            elif _is_timeout_error(error):
+                self.stats["timeouts"] += 1
+                self._decrease(self.decrease_factor, started, now)
+            else:
+                # Application errors say nothing about provider capacity
+                self.stats["errors"] += 1
+            return
+
+        if self.latency_ewma is None:
+            self.latency_ewma = self.baseline_latency = latency
+        else:
+            self.latency_ewma += 0.2 * (latency - self.latency_ewma)
+            # Slow drift so a steadily slower workload eventually becomes the baseline
+            self.baseline_latency += 0.01 * (latency - self.baseline_latency)
+            self.baseline_latency = min(self.baseline_latency, self.latency_ewma)
+
+        if self.latency_ewma > self.latency_tolerance * self.baseline_latency:
+            self._decrease(self.latency_decrease_factor, started, now)
+            return
+
+        self._healthy_streak += 1
+        if (
+            self._healthy_streak >= int(self.limit)
+            # Only a fully used window proves the current limit is sustainable
+            and self._window_peak >= int(self.limit)
+            and self.limit < self.max_limit
+        ):
+            self._healthy_streak = 0
+            self._window_peak = self.active_calls
+            self.limit = min(float(self.max_limit), self.limit + 1)
+            self.stats["increases"] += 1
+            self._wake()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "active_calls": self.active_calls,
+            "idle_permits": self.permits - self.active_calls,
+            "latency_ewma_s": round(self.latency_ewma, 4)
+            if self.latency_ewma is not None
+            else None,
+            "baseline_latency_s": round(self.baseline_latency, 4)
+            if self.baseline_latency is not None
+            else None,
+            **self.stats,
+        }
+
+
+class TokenBucketRateLimiter:
+    """Requests-per-minute and tokens-per-minute budget of a priority queue
+
+    Both budgets refill continuously at `limit / 60` per second up to one minute's worth.
+    A request is admitted once it fits in both budgets; tokens are charged up front from
+    the prompt estimate, and completion tokens can be charged afterwards with `charge()`,
+    which may drive the token budget into debt that later requests wait out.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+    ):
+        self.requests_per_minute = requests_per_minute or None
+        self.tokens_per_minute = tokens_per_minute or None
+        self._request_budget = float(self.requests_per_minute or 0)
+        self._token_budget = float(self.tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self.stats = {
+            "requests": 0,
+            "tokens": 0,
+            "throttled_requests": 0,
+            "throttled_seconds": 0.0,
+        }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._request_budget = min(
+                float(self.requests_per_minute),
+                self._request_budget + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute:
+            self._token_budget = min(
+                float(self.tokens_per_minute),
+                self._token_budget + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def try_acquire(self, tokens: int) -> float:
+        """Admit one request of `tokens` prompt tokens, or return the seconds until it fits"""
+        self._refill()
+        wait = 0.0
+        if self.requests_per_minute and self._request_budget < 1:
+            wait = (1 - self._request_budget) * 60 / self.requests_per_minute
+        if self.tokens_per_minute:
+            # A prompt larger than the whole budget would never fit, admit it on a full bucket
+            tokens = min(tokens, self.tokens_per_minute)
+            if self._token_budget < tokens:
+                wait = max(
+                    wait,
+                    (tokens - self._token_budget) * 60 / self.tokens_per_minute,
+                )
+        if wait > 0:
+            return wait
+
+        if self.requests_per_minute:
+            self._request_budget -= 1
+        self.stats["requests"] += 1
+        self.charge(tokens)
+        return 0.0
+
+    def charge(self, tokens: int) -> None:
+        """Consume `tokens` from the token budget, e.g. for completion tokens"""
+        self.stats["tokens"] += tokens
+        if self.tokens_per_minute:
+            self._token_budget -= tokens
+
+    def snapshot(self) -> dict[str, Any]:
+        self._refill()
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "request_budget": round(self._request_budget, 2)
+            if self.requests_per_minute
+            else None,
+            "token_budget": round(self._token_budget)
+            if self.tokens_per_minute
+            else None,
+            **self.stats,
+            "throttled_seconds": round(self.stats["throttled_seconds"], 3),
+        }
+
+
+def _count_call_tokens(count_tokens: Callable[[str], int], value: Any) -> int:
+    """Tokens of every string in a call's arguments (prompt, system prompt, history, texts)"""
+    if isinstance(value, str):
+        return count_tokens(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_count_call_tokens(count_tokens, item) for item in value)
+    if isinstance(value, dict):
+        return sum(_count_call_tokens(count_tokens, item) for item in value.values())
+    return 0
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -621,6 +1017,12 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    adaptive: bool = False,
+    min_concurrency: int = 1,
+    max_concurrency: int | None = None,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+    token_counter: Callable[[str], int] | None = None,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -639,9 +1041,19 @@ def priority_limit_async_func_call(
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        adaptive: Adjust the number of in-flight calls with an AdaptiveConcurrencyLimiter,
+            starting at max_size and moving between min_concurrency and max_concurrency
+        min_concurrency: Lower bound of the adaptive limit
+        max_concurrency: Upper bound of the adaptive limit (defaults to max_size)
+        requests_per_minute: Request budget per minute (None or 0 means unlimited)
+        tokens_per_minute: Token budget per minute (None or 0 means unlimited); prompt
+            tokens of every string argument are charged before dispatch and the tokens of
+            a string result after it
+        token_counter: Counts the tokens of a string for the token budget (defaults to
+            roughly 4 characters per token)
 
     Returns:
-        Decorator function
+        Decorator function with `shutdown()` and `concurrency_state()` attributes
     """
 
     def final_decro(func):
@@ -662,6 +1074,23 @@ def priority_limit_async_func_call(
                 )  # Reserved timeout buffer for health check phase
 
         queue = asyncio.PriorityQueue(maxsize=max_queue_size)
+        limiter = (
+            AdaptiveConcurrencyLimiter(
+                max_size, min_limit=min_concurrency, max_limit=max_concurrency
+            )
+            if adaptive
+            else None
+        )
+        # Adaptive mode keeps enough workers for the upper bound, the limiter gates them
+        worker_count = limiter.max_limit if limiter else max_size
+        rate_limiter = (
+            TokenBucketRateLimiter(requests_per_minute, tokens_per_minute)
+            if requests_per_minute or tokens_per_minute
+            else None
+        )
+        count_tokens = token_counter or (lambda text: len(text) // 4 + 1)
+        # Serializes budget admission so the most urgent queued task is always next
+        admission_lock = asyncio.Lock()
         tasks = set()
         initialization_lock = asyncio.Lock()
         counter = 0
@@ -675,11 +1104,53 @@ def priority_limit_async_func_call(
         active_futures = weakref.WeakSet()
         reinit_count = 0
 
+        def estimate_tokens(args, kwargs) -> int:
+            if not tokens_per_minute:
+                return 0
+            return _count_call_tokens(count_tokens, args) + _count_call_tokens(
+                count_tokens, kwargs
+            )
+
+        async def next_task():
+            """Take the most urgent queued task once it fits in the rate-limit budget"""
+            if rate_limiter is None:
+                return await asyncio.wait_for(queue.get(), timeout=1.0)
+
+            async with admission_lock:
+                item = await asyncio.wait_for(queue.get(), timeout=1.0)
+                tokens = estimate_tokens(item[3], item[4])
+                throttled_since = None
+                while (delay := rate_limiter.try_acquire(tokens)) > 0:
+                    if throttled_since is None:
+                        throttled_since = time.monotonic()
+                        rate_limiter.stats["throttled_requests"] += 1
+                    await asyncio.sleep(min(delay, 0.1))
+                    # Swap in a more urgent task (e.g. a query) queued while waiting
+                    try:
+                        queue.put_nowait(item)
+                    except asyncio.QueueFull:
+                        continue
+                    urgent = queue.get_nowait()
+                    queue.task_done()
+                    if urgent is not item:
+                        item = urgent
+                        tokens = estimate_tokens(item[3], item[4])
+                if throttled_since is not None:
+                    rate_limiter.stats["throttled_seconds"] += (
+                        time.monotonic() - throttled_since
+                    )
+                return item
+
         async def worker():
             """Enhanced worker that processes tasks with proper timeout and state management"""
             try:
                 while not shutdown_event.is_set():
+                    permit = False
                     try:
+                        if limiter is not None:
+                            await limiter.acquire()
+                            permit = True
+
                         # Get task from queue with timeout for shutdown checking
                         try:
                             (
@@ -688,7 +1159,7 @@ def priority_limit_async_func_call(
                                 task_id,
                                 args,
                                 kwargs,
-                            ) = await asyncio.wait_for(queue.get(), timeout=1.0)
+                            ) = await next_task()
                         except asyncio.TimeoutError:
                             continue
 
@@ -714,6 +1185,10 @@ def priority_limit_async_func_call(
                             queue.task_done()
                             continue
 
+                        call_start = time.monotonic()
+                        call_error = None
+                        if limiter is not None:
+                            limiter.call_started()
                         try:
                             # Execute function with timeout protection
                             if max_execution_timeout is not None:
@@ -723,11 +1198,16 @@ def priority_limit_async_func_call(
                             else:
                                 result = await func(*args, **kwargs)
 
+                            if rate_limiter is not None and isinstance(result, str):
+                                # Completion tokens count against the budget too
+                                rate_limiter.charge(estimate_tokens(result, {}))
+
                             # Set result if future is still valid
                             if not task_state.future.done():
                                 task_state.future.set_result(result)
 
-                        except asyncio.TimeoutError:
+                        except asyncio.TimeoutError as e:
+                            call_error = e
                             # Worker-level timeout (max_execution_timeout exceeded)
                             logger.warning(
                                 f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
@@ -746,6 +1226,7 @@ def priority_limit_async_func_call(
                                 f"{queue_name}: Task {task_id} cancelled during execution"
                             )
                         except Exception as e:
+                            call_error = e
                             # Function execution error
                             logger.error(
                                 f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
@@ -753,6 +1234,10 @@ def priority_limit_async_func_call(
                             if not task_state.future.done():
                                 task_state.future.set_exception(e)
                         finally:
+                            if limiter is not None:
+                                limiter.record(
+                                    time.monotonic() - call_start, call_error
+                                )
                             # Clean up task state
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
@@ -764,6 +1249,9 @@ def priority_limit_async_func_call(
                             f"{queue_name}: Critical error in worker: {str(e)}"
                         )
                         await asyncio.sleep(0.1)
+                    finally:
+                        if permit:
+                            limiter.release()
             finally:
                 logger.debug(f"{queue_name}: Worker exiting")
 
@@ -818,7 +1306,7 @@ def priority_limit_async_func_call(
                     tasks.difference_update(done_tasks)
 
                     active_tasks_count = len(tasks)
-                    workers_needed = max_size - active_tasks_count
+                    workers_needed = worker_count - active_tasks_count
 
                     if workers_needed > 0:
                         logger.info(
@@ -868,7 +1356,7 @@ def priority_limit_async_func_call(
                     )
 
                 # Create worker tasks
-                workers_needed = max_size - active_tasks_count
+                workers_needed = worker_count - active_tasks_count
                 for _ in range(workers_needed):
                     task = asyncio.create_task(worker())
                     tasks.add(task)
@@ -941,7 +1429,11 @@ def priority_limit_async_func_call(
 
         @wraps(func)
         async def wait_func(
-            *args, _priority=10, _timeout=None, _queue_timeout=None, **kwargs
+            *args,
+            _priority=DEFAULT_CALL_PRIORITY,
+            _timeout=None,
+            _queue_timeout=None,
+            **kwargs,
         ):
             """
             Execute function with enhanced priority-based concurrency control and timeout handling
@@ -1050,8 +1542,24 @@ def priority_limit_async_func_call(
                 async with task_states_lock:
                     task_states.pop(task_id, None)
 
+        def concurrency_state() -> dict[str, Any]:
+            """Current concurrency limit, load and (in adaptive mode) AIMD state"""
+            state = {
+                "queue_name": queue_name,
+                "adaptive": limiter is not None,
+                "max_async": max_size,
+                "workers": len(tasks),
+                "queued": queue.qsize(),
+            }
+            if limiter is not None:
+                state.update(limiter.snapshot())
+            if rate_limiter is not None:
+                state["rate_limit"] = rate_limiter.snapshot()
+            return state
+
         # Add shutdown method to decorated function
         wait_func.shutdown = shutdown
+        wait_func.concurrency_state = concurrency_state
 
         return wait_func
 
@@ -1259,18 +1767,37 @@ class TokenizerInterface(Protocol):
 class Tokenizer:
     """
     A wrapper around a tokenizer to provide a consistent interface for encoding and decoding.
+
+    Token counts are memoized in a bounded LRU cache keyed by content hash, so repeated
+    length checks of the same text (chunking, summarization, truncation) skip tokenization.
     """
 
-    def __init__(self, model_name: str, tokenizer: TokenizerInterface):
+    def __init__(
+        self,
+        model_name: str,
+        tokenizer: TokenizerInterface,
+        cache_size: int | None = None,
+    ):
         """
         Initializes the Tokenizer with a tokenizer model name and a tokenizer instance.
 
         Args:
             model_name: The associated model name for the tokenizer.
             tokenizer: An instance of a class implementing the TokenizerInterface.
+            cache_size: Max number of memoized token counts, 0 disables the cache.
+                Defaults to the TOKEN_COUNT_CACHE_SIZE environment variable.
         """
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        if cache_size is None:
+            cache_size = get_env_value(
+                "TOKEN_COUNT_CACHE_SIZE", DEFAULT_TOKEN_COUNT_CACHE_SIZE, int
+            )
+        self._count_cache_size = max(0, cache_size)
+        self._count_cache: OrderedDict[bytes, int] = OrderedDict()
+        self._count_cache_lock = threading.Lock()
+        self._count_cache_hits = 0
+        self._count_cache_misses = 0
 
     def encode(self, content: str) -> List[int]:
         """
@@ -1282,7 +1809,10 @@ class Tokenizer:
         Returns:
             A list of integer tokens.
         """
-        return self.tokenizer.encode(content)
+        tokens = self.tokenizer.encode(content)
+        if self._count_cache_size:
+            self._store_count(self._content_key(content), len(tokens))
+        return tokens
 
     def decode(self, tokens: List[int]) -> str:
         """
@@ -1296,6 +1826,71 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def count_tokens(self, content: str) -> int:
+        """
+        Returns the number of tokens of a string, memoized by content hash.
+
+        Args:
+            content: The string to measure.
+
+        Returns:
+            The token count, equal to len(encode(content)).
+        """
+        if not self._count_cache_size:
+            return len(self.tokenizer.encode(content))
+
+        key = self._content_key(content)
+        with self._count_cache_lock:
+            count = self._count_cache.get(key)
+            if count is not None:
+                self._count_cache.move_to_end(key)
+                self._count_cache_hits += 1
+                return count
+            self._count_cache_misses += 1
+
+        count = len(self.tokenizer.encode(content))
+        self._store_count(key, count)
+        return count
+
+    def token_cache_stats(self) -> dict[str, int]:
+        """Returns size, capacity and hit/miss counters of the token count cache."""
+        with self._count_cache_lock:
+            return {
+                "size": len(self._count_cache),
+                "max_size": self._count_cache_size,
+                "hits": self._count_cache_hits,
+                "misses": self._count_cache_misses,
+            }
+
+    def __deepcopy__(self, memo):
+        # Shared as-is (e.g. by dataclasses.asdict), so all copies of the global
+        # config use one token count cache
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Locks cannot be pickled, and the memoized counts are not worth shipping
+        del state["_count_cache_lock"]
+        state["_count_cache"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._count_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _content_key(content: str) -> bytes:
+        return blake2b(
+            content.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    def _store_count(self, key: bytes, count: int) -> None:
+        with self._count_cache_lock:
+            self._count_cache[key] = count
+            self._count_cache.move_to_end(key)
+            while len(self._count_cache) > self._count_cache_size:
+                self._count_cache.popitem(last=False)
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -1358,18 +1953,32 @@ def truncate_list_by_token_size(
         return []
     tokens = 0
     for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+        tokens += tokenizer.count_tokens(key(data))
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
 
 
 def cosine_similarity(v1, v2):
-    """Calculate cosine similarity between two vectors"""
-    dot_product = np.dot(v1, v2)
-    norm1 = np.linalg.norm(v1)
-    norm2 = np.linalg.norm(v2)
-    return dot_product / (norm1 * norm2)
+    """Calculate cosine similarity between two vectors
+
+    If v2 is a matrix, the similarities between v1 and each of its rows are computed
+    with one matrix-vector product. Zero vectors yield nan.
+    """
+    v1 = np.asarray(v1)
+    v2 = np.asarray(v2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (v2 @ v1) / (np.linalg.norm(v2, axis=-1) * np.linalg.norm(v1))
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, highest first; nan scores rank last"""
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    if k < len(scores):
+        # O(n) selection of the top k, then sort only those
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+    return np.argsort(-scores, kind="stable")
 
 
 async def handle_cache(
@@ -1396,7 +2005,11 @@ async def handle_cache(
 
     # Use flattened cache key format: {mode}:{cache_type}:{hash}
     flattened_key = generate_cache_key(mode, cache_type, args_hash)
-    cache_entry = await hashing_kv.get_by_id(flattened_key)
+    cache_entry = await traced_storage_call(
+        "llm_response_cache.get_by_id",
+        hashing_kv.get_by_id(flattened_key),
+        cache_type=cache_type,
+    )
     if cache_entry:
         logger.debug(f"Flattened cache hit(key:{flattened_key})")
         content = cache_entry["return"]
@@ -1520,6 +2133,53 @@ def always_get_an_event_loop() -> asyncio.AbstractEventLoop:
         return new_loop
 
 
+# Tokenizer installed once per chunking worker process, so it is not pickled per document
+_chunking_worker_tokenizer = None
+
+
+def _init_chunking_worker(tokenizer) -> None:
+    global _chunking_worker_tokenizer
+    _chunking_worker_tokenizer = tokenizer
+
+
+def run_chunking_job(chunking_func: Callable, tokenizer, *args) -> list[dict[str, Any]]:
+    """Run a synchronous chunking function to completion inside an executor worker
+
+    `tokenizer` may be None in process workers, which then use the tokenizer installed
+    by the pool initializer. The result is materialized so it can cross the executor boundary.
+    """
+    if tokenizer is None:
+        tokenizer = _chunking_worker_tokenizer
+    return list(chunking_func(tokenizer, *args))
+
+
+def create_chunking_executor(kind: str, max_workers: int, tokenizer) -> Executor | None:
+    """Create the executor used to run chunking off the event loop
+
+    Args:
+        kind: "thread" (for GIL-releasing tokenizers such as tiktoken), "process", or
+            "none"/"" to chunk on the event loop
+        max_workers: Number of worker threads or processes
+        tokenizer: Tokenizer installed once in each worker process
+    """
+    kind = (kind or "none").lower()
+    if kind == "none":
+        return None
+    if kind == "thread":
+        return ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lightrag-chunking"
+        )
+    if kind == "process":
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_chunking_worker,
+            initargs=(tokenizer,),
+        )
+    raise ValueError(
+        f"Invalid chunking executor '{kind}', expected 'none', 'thread' or 'process'"
+    )
+
+
 async def aexport_data(
     chunk_entity_relation_graph,
     entities_vdb,
@@ -1933,6 +2593,95 @@ def remove_think_tags(text: str) -> str:
     ).strip()
 
 
+def _build_llm_cache_prompt(
+    safe_user_prompt: str, safe_system_prompt: str | None, history: str | None
+) -> str:
+    """Text whose hash keys the LLM response cache for one (sanitized) LLM call"""
+    prompt_parts = []
+    if safe_user_prompt:
+        prompt_parts.append(safe_user_prompt)
+    if safe_system_prompt:
+        prompt_parts.append(safe_system_prompt)
+    if history:
+        prompt_parts.append(history)
+    return "\n".join(prompt_parts)
+
+
+def record_llm_cache_miss(cache_type: str) -> None:
+    """Count an LLM call made because its response was not cached"""
+    statistic_data["llm_call"] += 1
+    pipeline_metrics.record_llm_cache(cache_type, hit=False)
+
+
+async def get_cached_llm_response(
+    llm_response_cache: "BaseKVStorage | None",
+    user_prompt: str,
+    system_prompt: str | None = None,
+    cache_type: str = "extract",
+) -> tuple[str, int, str] | None:
+    """Look up the response use_llm_func_with_cache would serve from cache for this call
+
+    Hits are counted like use_llm_func_with_cache does. A miss is not counted here:
+    the caller counts it with record_llm_cache_miss when it actually calls the LLM.
+
+    Returns:
+        tuple[str, int, str] | None: (content, create_time, cache_key) on a hit
+    """
+    if llm_response_cache is None:
+        return None
+    _prompt = _build_llm_cache_prompt(
+        sanitize_text_for_encoding(user_prompt),
+        sanitize_text_for_encoding(system_prompt) if system_prompt else None,
+        None,
+    )
+    arg_hash = compute_args_hash(_prompt)
+    cached_result = await handle_cache(
+        llm_response_cache, arg_hash, _prompt, "default", cache_type=cache_type
+    )
+    if not cached_result:
+        return None
+    statistic_data["llm_cache"] += 1
+    pipeline_metrics.record_llm_cache(cache_type, hit=True)
+    content, timestamp = cached_result
+    return content, timestamp, generate_cache_key("default", cache_type, arg_hash)
+
+
+async def save_llm_response_to_cache(
+    llm_response_cache: "BaseKVStorage | None",
+    user_prompt: str,
+    content: str,
+    system_prompt: str | None = None,
+    cache_type: str = "extract",
+    chunk_id: str | None = None,
+) -> str | None:
+    """Cache `content` as the response to this call, under the key use_llm_func_with_cache uses
+
+    Returns:
+        str | None: The cache key, or None if extraction caching is disabled
+    """
+    if llm_response_cache is None or not llm_response_cache.global_config.get(
+        "enable_llm_cache_for_entity_extract"
+    ):
+        return None
+    _prompt = _build_llm_cache_prompt(
+        sanitize_text_for_encoding(user_prompt),
+        sanitize_text_for_encoding(system_prompt) if system_prompt else None,
+        None,
+    )
+    arg_hash = compute_args_hash(_prompt)
+    await save_to_cache(
+        llm_response_cache,
+        CacheData(
+            args_hash=arg_hash,
+            content=content,
+            prompt=_prompt,
+            cache_type=cache_type,
+            chunk_id=chunk_id,
+        ),
+    )
+    return generate_cache_key("default", cache_type, arg_hash)
+
+
 async def use_llm_func_with_cache(
     user_prompt: str,
     use_llm_func: callable,
@@ -1987,14 +2736,7 @@ async def use_llm_func_with_cache(
         history = None
 
     if llm_response_cache:
-        prompt_parts = []
-        if safe_user_prompt:
-            prompt_parts.append(safe_user_prompt)
-        if safe_system_prompt:
-            prompt_parts.append(safe_system_prompt)
-        if history:
-            prompt_parts.append(history)
-        _prompt = "\n".join(prompt_parts)
+        _prompt = _build_llm_cache_prompt(safe_user_prompt, safe_system_prompt, history)
 
         arg_hash = compute_args_hash(_prompt)
         # Generate cache key for this LLM call
@@ -2011,13 +2753,14 @@ async def use_llm_func_with_cache(
             content, timestamp = cached_result
             logger.debug(f"Found cache for {arg_hash}")
             statistic_data["llm_cache"] += 1
+            pipeline_metrics.record_llm_cache(cache_type, hit=True)
 
             # Add cache key to collector if provided
             if cache_keys_collector is not None:
                 cache_keys_collector.append(cache_key)
 
             return content, timestamp
-        statistic_data["llm_call"] += 1
+        record_llm_cache_miss(cache_type)
 
         # Call LLM with sanitized input
         kwargs = {}
@@ -2435,6 +3178,24 @@ def pick_by_weighted_polling(
     return selected_chunks
 
 
+async def embed_query_texts(embedding_func, texts: list[str]) -> dict[str, Any]:
+    """Embed the distinct texts of one query with a single embedding_func call
+
+    Args:
+        embedding_func: Embedding function accepting a list of texts
+        texts: Query strings (raw query, low/high-level keywords); duplicates and
+            empty strings are skipped
+
+    Returns:
+        Mapping from text to its embedding vector
+    """
+    unique_texts = list(dict.fromkeys(text for text in texts if text))
+    if not unique_texts:
+        return {}
+    embeddings = await embedding_func(unique_texts, _priority=5)  # query priority
+    return dict(zip(unique_texts, embeddings))
+
+
 async def pick_by_vector_similarity(
     query: str,
     text_chunks_storage: "BaseKVStorage",
@@ -2468,11 +3229,15 @@ async def pick_by_vector_similarity(
     if not entity_info or num_of_chunks <= 0:
         return []
 
-    # Collect all unique chunk IDs from entity info
-    all_chunk_ids = set()
-    for i, entity in enumerate(entity_info):
-        chunk_ids = entity.get("sorted_chunks", [])
-        all_chunk_ids.update(chunk_ids)
+    # Collect all unique chunk IDs from entity info, in first-seen order; backends'
+    # get_vectors_by_ids expect a list (Mongo "$in", Milvus id expressions)
+    all_chunk_ids = list(
+        dict.fromkeys(
+            chunk_id
+            for entity in entity_info
+            for chunk_id in entity.get("sorted_chunks", [])
+        )
+    )
 
     if not all_chunk_ids:
         logger.warning(
@@ -2484,8 +3249,6 @@ async def pick_by_vector_similarity(
         f"Vector similarity chunk selection: {len(all_chunk_ids)} unique chunk IDs collected"
     )
 
-    all_chunk_ids = list(all_chunk_ids)
-
     try:
         # Use pre-computed query embedding if provided, otherwise compute it
         if query_embedding is None:
@@ -2501,46 +3264,34 @@ async def pick_by_vector_similarity(
                 "Using pre-computed query embedding for vector similarity chunk selection"
             )
 
-        # Get chunk embeddings from vector database
-        chunk_vectors = await chunks_vdb.get_vectors_by_ids(all_chunk_ids)
+        # Get chunk embeddings from vector database as one matrix
+        vector_ids, chunk_vectors = await traced_storage_call(
+            "chunks_vdb.get_vectors_array_by_ids",
+            chunks_vdb.get_vectors_array_by_ids(all_chunk_ids),
+            batch_size=len(all_chunk_ids),
+        )
         logger.debug(
-            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors Retrieved"
+            f"Vector similarity chunk selection: {len(vector_ids)} chunk vectors Retrieved"
         )
 
-        if not chunk_vectors or len(chunk_vectors) != len(all_chunk_ids):
-            if not chunk_vectors:
+        if not vector_ids or len(vector_ids) != len(all_chunk_ids):
+            if not vector_ids:
                 logger.warning(
                     "Vector similarity chunk selection: no vectors retrieved from chunks_vdb"
                 )
             else:
                 logger.warning(
-                    f"Vector similarity chunk selection: found {len(chunk_vectors)} but expecting {len(all_chunk_ids)}"
+                    f"Vector similarity chunk selection: found {len(vector_ids)} but expecting {len(all_chunk_ids)}"
                 )
             return []
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
-
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Score all chunks with one matrix-vector product and keep the top num_of_chunks
+        similarities = cosine_similarity(
+            np.asarray(query_embedding, dtype=np.float32), chunk_vectors
+        )
+        selected_chunks = [
+            vector_ids[i] for i in top_k_indices(similarities, num_of_chunks)
+        ]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
@@ -2729,13 +3480,14 @@ async def process_chunks_unified(
     # 1. Apply reranking if enabled and query is provided
     if query_param.enable_rerank and query and unique_chunks:
         rerank_top_k = query_param.chunk_top_k or len(unique_chunks)
-        unique_chunks = await apply_rerank_if_enabled(
-            query=query,
-            retrieved_docs=unique_chunks,
-            global_config=global_config,
-            enable_rerank=query_param.enable_rerank,
-            top_n=rerank_top_k,
-        )
+        with trace_span("rerank", documents=len(unique_chunks), top_n=rerank_top_k):
+            unique_chunks = await apply_rerank_if_enabled(
+                query=query,
+                retrieved_docs=unique_chunks,
+                global_config=global_config,
+                enable_rerank=query_param.enable_rerank,
+                top_n=rerank_top_k,
+            )
 
     # 2. Filter by minimum rerank score if reranking is enabled
     if query_param.enable_rerank and unique_chunks:
@@ -5,7 +5,7 @@ import asyncio
 from typing import Any, cast
 
 from .base import DeletionResult
-from .kg.shared_storage import get_storage_keyed_lock
+from .kg.shared_storage import bump_data_version, get_storage_keyed_lock
 from .constants import GRAPH_FIELD_SEP
 from .utils import compute_mdhash_id, logger
 from .base import StorageNameSpace
@@ -52,6 +52,9 @@ async def _persist_graph_updates(
                 for storage_inst in storages  # type: ignore
             ]
         )
+        # Invalidate cached query results of every worker. Storages may rewrite their
+        # own workspace (e.g. PG and Mongo), so bump the LightRAG workspace the caches read.
+        await bump_data_version(storages[0].global_config.get("workspace", ""))
 
 
 async def adelete_by_entity(
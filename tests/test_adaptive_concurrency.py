@@ -0,0 +1,149 @@
+"""
+Test suite for adaptive (AIMD) concurrency in priority_limit_async_func_call
+
+This test verifies:
+1. Rate-limit and timeout errors shrink the limit once per burst, healthy calls that
+   fill the window grow it
+2. A provider that throttles above a concurrency cap drives the limit down to that cap
+3. A fast, healthy provider lets the limit grow up to max_concurrency
+4. Concurrency state is exposed on the decorated function
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.utils import AdaptiveConcurrencyLimiter, priority_limit_async_func_call
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.mark.offline
+def test_limiter_aimd_rules():
+    limiter = AdaptiveConcurrencyLimiter(8, min_limit=1, max_limit=16)
+    for _ in range(3):
+        limiter.call_started()
+
+    limiter.record(0.1, RateLimitError())
+    assert limiter.snapshot()["limit"] == 4
+    # Calls issued before the decrease belong to the same burst and count once
+    limiter.record(0.1, RateLimitError())
+    assert limiter.snapshot()["limit"] == 4
+
+    # Application errors are not a capacity signal
+    limiter.record(0.1, ValueError("bad input"))
+    assert limiter.snapshot()["limit"] == 4
+
+    # Healthy calls that never use the whole window do not grow it
+    for _ in range(8):
+        limiter.call_started()
+        limiter.record(0.1)
+    assert limiter.snapshot()["limit"] == 4
+
+    for _ in range(4):
+        limiter.call_started()
+    for _ in range(4):
+        limiter.record(0.1)
+    assert limiter.snapshot()["limit"] == 5
+
+    state = limiter.snapshot()
+    assert state["rate_limited"] == 2
+    assert state["errors"] == 1
+    assert state["increases"] == 1 and state["decreases"] == 1
+
+
+@pytest.mark.offline
+def test_limiter_latency_backoff():
+    limiter = AdaptiveConcurrencyLimiter(10, min_limit=2, max_limit=10)
+    for latency in [0.1] * 5 + [1.0] * 10:
+        limiter.call_started()
+        limiter.record(latency)
+    assert limiter.snapshot()["limit"] < 10
+
+
+@pytest.mark.offline
+async def test_throttling_provider_converges_to_capacity():
+    capacity = 3
+    in_flight = 0
+
+    async def provider(i):
+        nonlocal in_flight
+        in_flight += 1
+        try:
+            await asyncio.sleep(0.01)
+            if in_flight > capacity:
+                raise RateLimitError("429 Too Many Requests")
+            return i
+        finally:
+            in_flight -= 1
+
+    func = priority_limit_async_func_call(
+        8, adaptive=True, max_concurrency=8, queue_name="test"
+    )(provider)
+    try:
+        await asyncio.gather(*(func(i) for i in range(60)), return_exceptions=True)
+
+        state = func.concurrency_state()
+        assert state["adaptive"] is True
+        assert state["rate_limited"] > 0
+        assert state["limit"] <= capacity + 1
+
+        results = await asyncio.gather(
+            *(func(i) for i in range(20)), return_exceptions=True
+        )
+        failures = sum(isinstance(r, Exception) for r in results)
+        print(
+            f"\nThrottled provider: state={state}, failures after adapting={failures}"
+        )
+        # AIMD keeps probing one step above capacity, so an occasional 429 remains
+        assert failures <= 6
+    finally:
+        await func.shutdown()
+
+
+@pytest.mark.offline
+async def test_healthy_provider_grows_limit():
+    peak = 0
+    in_flight = 0
+
+    async def provider(i):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return i
+
+    func = priority_limit_async_func_call(
+        2, adaptive=True, max_concurrency=6, queue_name="test"
+    )(provider)
+    try:
+        results = await asyncio.gather(*(func(i) for i in range(200)))
+        assert results == list(range(200))
+        state = func.concurrency_state()
+        assert state["limit"] == 6
+        assert peak <= 6
+    finally:
+        await func.shutdown()
+
+
+@pytest.mark.offline
+async def test_fixed_mode_reports_state():
+    async def provider():
+        return "ok"
+
+    func = priority_limit_async_func_call(3, queue_name="fixed")(provider)
+    try:
+        assert await func() == "ok"
+        state = func.concurrency_state()
+        assert state == {
+            "queue_name": "fixed",
+            "adaptive": False,
+            "max_async": 3,
+            "workers": 3,
+            "queued": 0,
+        }
+    finally:
+        await func.shutdown()
@@ -0,0 +1,132 @@
+"""
+Test suite for LightRAG.adelete_by_doc_ids
+
+This test verifies:
+1. Entities and relations only referenced by the deleted documents are removed
+2. Entities shared with remaining documents are rebuilt in a single pass
+3. Chunk tracking data is read with batched KV calls
+4. Per-document results report not-found IDs alongside successful deletions
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+DOCS = {
+    "alpha": "Document alpha mentions Shared and AlphaThing.",
+    "beta": "Document beta mentions Shared and BetaThing.",
+    "gamma": "Document gamma mentions Shared and GammaThing.",
+}
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+async def _mock_llm(prompt, system_prompt=None, history_messages=[], **kwargs) -> str:
+    await asyncio.sleep(0)
+    text = f"{system_prompt or ''}\n{prompt}"
+    for name in DOCS:
+        if f"Document {name} mentions" in text:
+            thing = f"{name.capitalize()}Thing"
+            return (
+                f"entity<|#|>Shared<|#|>concept<|#|>Shared is mentioned by {name}.\n"
+                f"entity<|#|>{thing}<|#|>concept<|#|>{thing} only appears in {name}.\n"
+                f"relation<|#|>Shared<|#|>{thing}<|#|>mention<|#|>Shared relates to {thing}.\n"
+                "<|COMPLETE|>"
+            )
+    return ""
+
+
+async def _mock_embed(texts: list[str]) -> np.ndarray:
+    await asyncio.sleep(0)
+    return np.random.rand(len(texts), 8)
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.fixture
+async def rag(tmp_path):
+    from lightrag import LightRAG
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=_mock_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=_mock_embed),
+        tokenizer=Tokenizer("char", _CharTokenizer()),
+    )
+    await rag.initialize_storages()
+    await rag.ainsert(list(DOCS.values()), ids=list(DOCS))
+    yield rag
+    await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_bulk_delete_rebuilds_shared_entities_once(rag, monkeypatch):
+    import lightrag.lightrag as lightrag_module
+
+    rebuild_calls = []
+
+    async def fake_rebuild(entities_to_rebuild, relationships_to_rebuild, **kwargs):
+        rebuild_calls.append(
+            (dict(entities_to_rebuild), dict(relationships_to_rebuild))
+        )
+
+    monkeypatch.setattr(lightrag_module, "rebuild_knowledge_from_chunks", fake_rebuild)
+
+    single_reads = 0
+    for storage in (rag.entity_chunks, rag.relation_chunks):
+        original_get_by_id = storage.get_by_id
+
+        async def counting_get_by_id(id, _original=original_get_by_id):
+            nonlocal single_reads
+            single_reads += 1
+            return await _original(id)
+
+        monkeypatch.setattr(storage, "get_by_id", counting_get_by_id)
+
+    results = await rag.adelete_by_doc_ids(["alpha", "missing", "beta", "alpha"])
+
+    assert [r.doc_id for r in results] == ["alpha", "missing", "beta"]
+    assert [r.status for r in results] == ["success", "not_found", "success"]
+    assert single_reads == 0
+
+    graph = rag.chunk_entity_relation_graph
+    assert not await graph.has_node("AlphaThing")
+    assert not await graph.has_node("BetaThing")
+    assert await graph.has_node("GammaThing")
+    assert await graph.has_node("Shared")
+
+    assert len(rebuild_calls) == 1
+    entities_to_rebuild, _ = rebuild_calls[0]
+    assert list(entities_to_rebuild) == ["Shared"]
+    assert len(entities_to_rebuild["Shared"]) == 1
+
+    assert await rag.doc_status.get_by_id("alpha") is None
+    assert await rag.full_docs.get_by_id("beta") is None
+    gamma = await rag.doc_status.get_by_id("gamma")
+    assert gamma["status"] == DocStatus.PROCESSED
+
+
+@pytest.mark.offline
+async def test_single_delete_delegates_to_bulk_path(rag):
+    result = await rag.adelete_by_doc_id("missing")
+    assert result.status == "not_found"
+
+    result = await rag.adelete_by_doc_id("gamma")
+    assert result.status == "success"
+    assert not await rag.chunk_entity_relation_graph.has_node("GammaThing")
@@ -1,7 +1,11 @@
+import random
+import re
+import types
+
 import pytest
 
 from lightrag.exceptions import ChunkTokenLimitExceededError
-from lightrag.operate import chunking_by_token_size
+from lightrag.operate import chunking_by_token_size, iter_chunks_by_token_size
 from lightrag.utils import Tokenizer, TokenizerInterface
 
 
@@ -1064,3 +1068,143 @@ def test_decode_preserves_content():
         tokens = tokenizer.encode(original)
         decoded = tokenizer.decode(tokens)
         assert decoded == original, f"Failed to decode: {original}"
+
+
+# ============================================================================
+# Tests for the streaming chunker
+# ============================================================================
+
+
+class WordTokenizer(TokenizerInterface):
+    """Word/whitespace/punctuation tokens, like the pre-tokenizer of BPE models."""
+
+    def __init__(self):
+        self.vocab: dict[str, int] = {}
+        self.inverse: list[str] = []
+        self.max_encode_len = 0
+
+    def encode(self, content: str):
+        self.max_encode_len = max(self.max_encode_len, len(content))
+        tokens = []
+        for piece in re.findall(r"\s+|\w+|[^\w\s]", content):
+            if piece not in self.vocab:
+                self.vocab[piece] = len(self.inverse)
+                self.inverse.append(piece)
+            tokens.append(self.vocab[piece])
+        return tokens
+
+    def decode(self, tokens):
+        return "".join(self.inverse[token] for token in tokens)
+
+
+class Utf8ByteTokenizer(TokenizerInterface):
+    """One token per UTF-8 byte, so token windows can split characters."""
+
+    def encode(self, content: str):
+        return list(content.encode("utf-8"))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+
+class LowercasingWordTokenizer(WordTokenizer):
+    """Normalizes case, so decoded text never matches the source text."""
+
+    def encode(self, content: str):
+        return super().encode(content.lower())
+
+
+def _reference_chunks(tokenizer, content, overlap, size):
+    """Chunks from a single encode of the whole document."""
+    tokens = tokenizer.encode(content)
+    return [
+        {
+            "tokens": min(size, len(tokens) - start),
+            "content": tokenizer.decode(tokens[start : start + size]).strip(),
+            "chunk_order_index": index,
+        }
+        for index, start in enumerate(range(0, len(tokens), size - overlap))
+    ]
+
+
+@pytest.mark.offline
+def test_streaming_chunker_is_lazy():
+    tokenizer = make_tokenizer()
+    chunks = iter_chunks_by_token_size(
+        tokenizer, "abcdefghij", chunk_token_size=4, chunk_overlap_token_size=1
+    )
+
+    assert isinstance(chunks, types.GeneratorType)
+    assert next(chunks)["content"] == "abcd"
+
+
+@pytest.mark.offline
+def test_streaming_chunker_matches_whole_document_encoding():
+    random.seed(0)
+    words = [
+        "alpha",
+        "beta",
+        "gamma",
+        "检索增强",
+        "naïve",
+        "\n\n",
+        "  ",
+        "x1",
+        "(",
+        ")",
+        ".",
+    ]
+    content = " ".join(random.choice(words) for _ in range(20000))
+
+    backend = WordTokenizer()
+    tokenizer = Tokenizer(model_name="words", tokenizer=backend)
+    expected = _reference_chunks(tokenizer, content, overlap=10, size=50)
+    backend.max_encode_len = 0
+
+    chunks = chunking_by_token_size(
+        tokenizer, content, chunk_overlap_token_size=10, chunk_token_size=50
+    )
+
+    assert chunks == expected
+    # Only a bounded window of the document is tokenized at a time
+    assert backend.max_encode_len < len(content) / 10
+
+
+@pytest.mark.offline
+def test_streaming_chunker_with_normalizing_tokenizer():
+    content = " ".join(f"Word{i % 97}" for i in range(5000))
+    tokenizer = Tokenizer(model_name="lower", tokenizer=LowercasingWordTokenizer())
+    expected = _reference_chunks(tokenizer, content, overlap=0, size=100)
+
+    chunks = chunking_by_token_size(
+        tokenizer, content, chunk_overlap_token_size=0, chunk_token_size=100
+    )
+
+    # 5000 words and 4999 separators, never a window emitted twice
+    assert len(chunks) == 100
+    assert chunks == expected
+
+
+@pytest.mark.offline
+def test_streaming_chunker_handles_split_multibyte_characters():
+    content = "知识图谱😀" * 2000
+    tokenizer = Tokenizer(model_name="bytes", tokenizer=Utf8ByteTokenizer())
+
+    chunks = chunking_by_token_size(
+        tokenizer, content, chunk_overlap_token_size=7, chunk_token_size=40
+    )
+
+    assert all(chunk["tokens"] <= 40 for chunk in chunks)
+    assert [c["chunk_order_index"] for c in chunks] == list(range(len(chunks)))
+    # Every part of the document is covered by some chunk
+    covered = "".join(c["content"].replace("\ufffd", "") for c in chunks)
+    assert set(covered) == set(content)
+    assert chunks[-1]["content"].rstrip("\ufffd").endswith("😀")
+
+
+@pytest.mark.offline
+def test_streaming_chunker_rejects_overlap_not_smaller_than_size():
+    with pytest.raises(ValueError, match="must be smaller"):
+        chunking_by_token_size(
+            make_tokenizer(), "abcdef", chunk_overlap_token_size=4, chunk_token_size=4
+        )
@@ -0,0 +1,175 @@
+"""
+Test suite for running chunking in a thread or process pool
+
+This test verifies:
+1. Executor-based chunking returns the same chunks as chunking on the event loop
+2. Async chunking functions and unpicklable functions stay on the event loop
+3. Benchmark of event-loop lag while chunking a large document, before and after
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import chunking_by_token_size, iter_chunks_by_token_size
+from lightrag.utils import EmbeddingFunc, Tokenizer, create_chunking_executor
+
+
+class SlowWordTokenizer:
+    """Pure-Python tokenizer that holds the GIL, like a heavy BPE encode"""
+
+    def encode(self, content: str) -> list[int]:
+        tokens = []
+        for word in content.split(" "):
+            value = 0
+            for ch in word:
+                value = (value * 31 + ord(ch)) % 1_000_003
+            tokens.append(value)
+            self._words = getattr(self, "_words", {})
+            self._words[value] = word
+        return tokens
+
+    def decode(self, tokens: list[int]) -> str:
+        return " ".join(self._words[t] for t in tokens)
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+def _make_rag(tmp_path, chunking_executor: str, **kwargs):
+    from lightrag import LightRAG
+
+    async def embed(texts, **kwargs):
+        return np.zeros((len(texts), 4))
+
+    async def llm(*args, **kwargs):
+        return ""
+
+    return LightRAG(
+        working_dir=str(tmp_path),
+        embedding_func=EmbeddingFunc(embedding_dim=4, func=embed),
+        llm_model_func=llm,
+        tokenizer=Tokenizer("slow-word", SlowWordTokenizer()),
+        chunking_executor=chunking_executor,
+        chunking_executor_workers=2,
+        **kwargs,
+    )
+
+
+def _document(num_words: int) -> str:
+    return " ".join(f"word{i % 5000}x{i % 7}" for i in range(num_words))
+
+
+def _chunking_args(content: str) -> tuple:
+    return (content, None, False, 16, 128)
+
+
+async def _measure_max_lag(coro) -> tuple[float, object]:
+    """Run coro while a 1 ms ticker records the worst event-loop stall"""
+    max_lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal max_lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.001)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.005)
+    try:
+        result = await coro
+    finally:
+        done = True
+        await ticker_task
+    return max_lag, result
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_executor_chunks_match_inline(tmp_path, kind):
+    rag = _make_rag(tmp_path, kind, chunking_func=chunking_by_token_size)
+    content = _document(3000)
+    expected = chunking_by_token_size(rag.tokenizer, *_chunking_args(content))
+
+    executor = rag._get_chunking_executor()
+    assert executor is not None
+    try:
+        chunks = await rag._run_chunking_in_executor(executor, _chunking_args(content))
+    finally:
+        executor.shutdown()
+
+    assert chunks == expected
+
+
+@pytest.mark.offline
+async def test_unsupported_chunking_funcs_stay_on_event_loop(tmp_path):
+    async def async_chunking(*args):
+        return []
+
+    assert (
+        _make_rag(
+            tmp_path, "thread", chunking_func=async_chunking
+        )._get_chunking_executor()
+        is None
+    )
+
+    def local_chunking(*args):
+        return []
+
+    assert (
+        _make_rag(
+            tmp_path, "process", chunking_func=local_chunking
+        )._get_chunking_executor()
+        is None
+    )
+    assert _make_rag(tmp_path, "none")._get_chunking_executor() is None
+
+    with pytest.raises(ValueError):
+        create_chunking_executor("fiber", 1, None)
+
+
+@pytest.mark.offline
+async def test_chunking_event_loop_lag_benchmark(tmp_path, stress_test_mode):
+    num_words = 400_000 if stress_test_mode else 80_000
+    content = _document(num_words)
+    args = _chunking_args(content)
+
+    async def inline():
+        return list(
+            iter_chunks_by_token_size(
+                Tokenizer("slow-word", SlowWordTokenizer()), *args
+            )
+        )
+
+    lags = {}
+    inline_start = time.perf_counter()
+    lags["none"], expected = await _measure_max_lag(inline())
+    inline_time = time.perf_counter() - inline_start
+
+    for kind in ("thread", "process"):
+        rag = _make_rag(tmp_path, kind, chunking_func=iter_chunks_by_token_size)
+        executor = rag._get_chunking_executor()
+        try:
+            lags[kind], chunks = await _measure_max_lag(
+                rag._run_chunking_in_executor(executor, args)
+            )
+        finally:
+            executor.shutdown()
+        assert chunks == expected
+
+    print(
+        f"\nChunking event-loop lag ({num_words} words, {inline_time * 1000:.0f} ms inline)"
+    )
+    for kind, lag in lags.items():
+        print(f"  {kind:<8} max lag {lag * 1000:8.2f} ms")
+
+    assert lags["process"] < lags["none"]
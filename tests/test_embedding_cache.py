@@ -0,0 +1,212 @@
+"""
+Test suite for the persistent content-addressed embedding cache
+
+This test verifies:
+1. Only texts missing from the cache are sent to the embedding function
+2. Mixed hit/miss batches return vectors in input order
+3. Vectors survive a reload from disk and are keyed by model name and dimension
+4. Hit-rate statistics are reported
+5. Flushes append only new vectors, and the file is compacted once evictions leave it
+   much larger than the bounded in-memory cache
+6. Concurrent compactions of the shared file never pair a key with another vector
+7. LightRAG attaches the cache only when a model name is available
+"""
+
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from lightrag import embedding_cache
+from lightrag.embedding_cache import EmbeddingCache
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+def _make_func(calls: list, cache=None, dim: int = 3) -> EmbeddingFunc:
+    async def embed(texts, **kwargs):
+        calls.append(list(texts))
+        return np.array([[len(t), ord(t[0]), 1.0][:dim] for t in texts])
+
+    return EmbeddingFunc(embedding_dim=dim, func=embed, model_name="m", cache=cache)
+
+
+@pytest.mark.offline
+async def test_only_missing_texts_are_embedded(tmp_path):
+    calls = []
+    func = _make_func(calls, EmbeddingCache(str(tmp_path), "m", 3))
+
+    first = await func(["alpha", "beta"])
+    second = await func(["beta", "gamma", "alpha"])
+
+    assert calls == [["alpha", "beta"], ["gamma"]]
+    assert second.shape == (3, 3)
+    np.testing.assert_allclose(second[0], first[1])
+    np.testing.assert_allclose(second[1], [5, ord("g"), 1])
+    np.testing.assert_allclose(second[2], first[0])
+
+    stats = func.cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 3 and stats["size"] == 3
+    assert stats["hit_rate"] == pytest.approx(0.4)
+
+
+@pytest.mark.offline
+async def test_full_hit_makes_no_call(tmp_path):
+    calls = []
+    func = _make_func(calls, EmbeddingCache(str(tmp_path), "m", 3))
+
+    await func(["alpha", "beta"])
+    result = await func(["beta", "alpha"])
+
+    assert len(calls) == 1
+    assert result[:, 0].tolist() == [4, 5]
+
+
+@pytest.mark.offline
+async def test_cache_persists_and_is_keyed_by_model_and_dim(tmp_path):
+    calls = []
+    cache = EmbeddingCache(str(tmp_path), "org/model:v1", 3, workspace="ws")
+    await _make_func(calls, cache)(["alpha", "beta"])
+    await cache.index_done_callback()
+
+    reloaded = EmbeddingCache(str(tmp_path), "org/model:v1", 3, workspace="ws")
+    await reloaded.initialize()
+    calls.clear()
+    await _make_func(calls, reloaded)(["alpha", "beta"])
+    assert calls == []
+
+    other_model = EmbeddingCache(str(tmp_path), "other", 3, workspace="ws")
+    await _make_func(calls, other_model)(["alpha"])
+    assert calls == [["alpha"]]
+
+    other_dim = EmbeddingCache(str(tmp_path), "org/model:v1", 2, workspace="ws")
+    calls.clear()
+    await _make_func(calls, other_dim, dim=2)(["alpha"])
+    assert calls == [["alpha"]]
+
+
+@pytest.mark.offline
+async def test_save_merges_vectors_written_by_other_instances(tmp_path):
+    calls = []
+    cache_a = EmbeddingCache(str(tmp_path), "m", 3)
+    cache_b = EmbeddingCache(str(tmp_path), "m", 3)
+    await cache_a.initialize()
+    await cache_b.initialize()
+
+    await _make_func(calls, cache_a)(["alpha"])
+    await _make_func(calls, cache_b)(["beta"])
+    await cache_a.index_done_callback()
+    await cache_b.index_done_callback()
+
+    reloaded = EmbeddingCache(str(tmp_path), "m", 3)
+    await reloaded.initialize()
+    assert reloaded.stats()["size"] == 2
+    assert cache_b.stats()["size"] == 2
+
+    await reloaded.drop()
+    assert EmbeddingCache(str(tmp_path), "m", 3)._ensure_loaded() == {}
+
+
+@pytest.mark.offline
+async def test_flush_appends_and_compacts_bounded_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_COMPACT_MIN_RECORDS", 4)
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_COMPACT_RATIO", 1)
+    calls = []
+    cache = EmbeddingCache(str(tmp_path), "m", 3, max_entries=3)
+    func = _make_func(calls, cache)
+    record_size = cache._record_dtype.itemsize
+
+    await func(["a1", "b1"])
+    await cache.index_done_callback()
+    with open(cache._file_name, "rb") as f:
+        first_flush = f.read()
+    assert len(first_flush) == 2 * record_size
+
+    await func(["c1"])
+    await cache.index_done_callback()
+    with open(cache._file_name, "rb") as f:
+        assert f.read()[: len(first_flush)] == first_flush
+    assert os.path.getsize(cache._file_name) == 3 * record_size
+
+    # "a1" was used last, so "b1" and "c1" are evicted first
+    await func(["a1", "d1", "e1"])
+    assert cache.stats()["size"] == 3 and cache.stats()["evictions"] == 2
+    calls.clear()
+    await func(["a1", "d1", "e1"])
+    assert calls == []
+
+    # 5 records on disk for 3 cached vectors: rewritten with the cached vectors only
+    await cache.index_done_callback()
+    assert os.path.getsize(cache._file_name) == 3 * record_size
+    reloaded = EmbeddingCache(str(tmp_path), "m", 3, max_entries=3)
+    await reloaded.initialize()
+    await _make_func(calls, reloaded)(["a1", "d1", "e1"])
+    assert calls == []
+
+
+@pytest.mark.offline
+async def test_concurrent_compactions_keep_keys_and_vectors_paired(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_COMPACT_MIN_RECORDS", 0)
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_COMPACT_RATIO", 0)
+    calls = []
+    caches = [EmbeddingCache(str(tmp_path), "m", 3) for _ in range(2)]
+    texts = [
+        [f"{chr(97 + i)}{'x' * j}" for i in range(13) for j in range(20)],
+        [f"{chr(110 + i)}{'y' * j}" for i in range(13) for j in range(20)],
+    ]
+    for cache, batch in zip(caches, texts):
+        await cache.initialize()
+        await _make_func(calls, cache)(batch)
+
+    await asyncio.gather(*(cache.index_done_callback() for cache in caches))
+
+    assert not list(tmp_path.glob("*.tmp"))
+    reloaded = EmbeddingCache(str(tmp_path), "m", 3)
+    vectors, _ = reloaded.lookup(texts[0] + texts[1])
+    for text, vector in zip(texts[0] + texts[1], vectors):
+        np.testing.assert_allclose(vector, [len(text), ord(text[0]), 1])
+
+
+@pytest.mark.offline
+def test_lightrag_attaches_cache_when_model_name_is_set(tmp_path):
+    from lightrag import LightRAG
+
+    class _CharTokenizer:
+        def encode(self, content: str) -> list[int]:
+            return [ord(ch) for ch in content]
+
+        def decode(self, tokens: list[int]) -> str:
+            return "".join(chr(t) for t in tokens)
+
+    async def embed(texts, **kwargs):
+        return np.zeros((len(texts), 4))
+
+    async def llm(*args, **kwargs):
+        return ""
+
+    def make_rag(model_name):
+        return LightRAG(
+            working_dir=str(tmp_path),
+            embedding_func=EmbeddingFunc(
+                embedding_dim=4, func=embed, model_name=model_name
+            ),
+            llm_model_func=llm,
+            tokenizer=Tokenizer("char", _CharTokenizer()),
+            enable_embedding_cache=True,
+        )
+
+    rag = make_rag("embed-model")
+    assert isinstance(rag.embedding_func.cache, EmbeddingCache)
+    assert rag.get_embedding_cache_stats()["size"] == 0
+
+    assert make_rag(None).get_embedding_cache_stats() is None
@@ -0,0 +1,218 @@
+"""
+Test suite for EmbeddingMicroBatcher
+
+This test verifies:
+1. Concurrent single-text requests are coalesced into batches of `max_batch_size`, and
+   uneven multi-text requests never push a call past it
+2. Each caller receives the vectors for its own texts
+3. Requests with different keyword arguments are never mixed in one batch
+4. Errors from the batched call propagate to every waiting caller
+5. Deep copies of the global config share the batcher, even with batches pending
+6. Priority-boosted (query) requests skip the wait window, and running batch calls are
+   referenced until they complete
+7. A LightRAG instance routes embeddings through the batcher
+"""
+
+import asyncio
+import copy
+import inspect
+
+import numpy as np
+import pytest
+
+from lightrag.utils import EmbeddingFunc, EmbeddingMicroBatcher, Tokenizer
+
+
+def _make_embed(calls: list):
+    async def embed(texts, max_token_size=None, **kwargs):
+        calls.append((list(texts), dict(kwargs, max_token_size=max_token_size)))
+        await asyncio.sleep(0)
+        return np.array([[float(t.split("-")[1]), 1.0] for t in texts])
+
+    return embed
+
+
+@pytest.mark.offline
+async def test_concurrent_requests_are_coalesced():
+    calls = []
+    batcher = EmbeddingMicroBatcher(
+        _make_embed(calls), max_batch_size=32, max_wait_ms=20
+    )
+
+    results = await asyncio.gather(*[batcher([f"e-{i}"]) for i in range(2000)])
+
+    assert len(calls) == 63  # ceil(2000 / 32)
+    assert max(len(texts) for texts, _ in calls) == 32
+    for i, vectors in enumerate(results):
+        assert vectors.shape == (1, 2)
+        assert vectors[0, 0] == i
+    assert batcher.stats == {"requests": 2000, "calls": 63}
+
+
+@pytest.mark.offline
+async def test_multi_text_requests_keep_their_slices():
+    calls = []
+    batcher = EmbeddingMicroBatcher(
+        _make_embed(calls), max_batch_size=100, max_wait_ms=5
+    )
+
+    requests = [[f"e-{i}", f"e-{i + 1000}", f"e-{i + 2000}"] for i in range(10)]
+    results = await asyncio.gather(*[batcher(texts) for texts in requests])
+
+    assert len(calls) == 1
+    for i, vectors in enumerate(results):
+        assert vectors[:, 0].tolist() == [i, i + 1000, i + 2000]
+
+
+@pytest.mark.offline
+async def test_uneven_requests_never_exceed_max_batch_size():
+    calls = []
+    batcher = EmbeddingMicroBatcher(
+        _make_embed(calls), max_batch_size=10, max_wait_ms=20
+    )
+
+    sizes = [9, 9, 3, 7, 1, 5, 6, 2, 8, 4]
+    requests, start = [], 0
+    for size in sizes:
+        requests.append([f"e-{i}" for i in range(start, start + size)])
+        start += size
+    results = await asyncio.gather(*[batcher(texts) for texts in requests])
+
+    assert max(len(texts) for texts, _ in calls) <= 10
+    assert sum(len(texts) for texts, _ in calls) == sum(sizes)
+    for texts, vectors in zip(requests, results):
+        assert vectors[:, 0].tolist() == [int(t.split("-")[1]) for t in texts]
+
+
+@pytest.mark.offline
+async def test_large_requests_bypass_the_window():
+    calls = []
+    batcher = EmbeddingMicroBatcher(
+        _make_embed(calls), max_batch_size=4, max_wait_ms=1000
+    )
+
+    result = await asyncio.wait_for(batcher([f"e-{i}" for i in range(10)]), timeout=0.5)
+
+    assert len(result) == 10
+    assert len(calls) == 1
+
+
+@pytest.mark.offline
+async def test_different_kwargs_are_batched_separately():
+    calls = []
+    batcher = EmbeddingMicroBatcher(
+        _make_embed(calls), max_batch_size=10, max_wait_ms=5
+    )
+
+    await asyncio.gather(
+        batcher(["e-1"], _priority=15),
+        batcher(["e-2"], _priority=15),
+        batcher(["e-3"]),
+    )
+
+    assert sorted((len(texts), kw.get("_priority")) for texts, kw in calls) == [
+        (1, None),
+        (2, 15),
+    ]
+
+
+@pytest.mark.offline
+async def test_priority_requests_bypass_the_window():
+    calls = []
+    batcher = EmbeddingMicroBatcher(
+        _make_embed(calls), max_batch_size=8, max_wait_ms=1000
+    )
+    background = asyncio.ensure_future(batcher(["e-1"]))
+    await asyncio.sleep(0)
+
+    result = await asyncio.wait_for(batcher(["e-2"], _priority=5), timeout=0.5)
+
+    assert result[0, 0] == 2
+    assert calls == [(["e-2"], {"_priority": 5, "max_token_size": None})]
+    assert not background.done()
+
+    # The flushed batch call is held by the batcher until it completes
+    batcher._flush(*next(iter(batcher._pending.items())))
+    assert len(batcher._tasks) == 1
+    assert (await background)[0, 0] == 1
+    await asyncio.sleep(0)
+    assert not batcher._tasks
+
+
+@pytest.mark.offline
+async def test_errors_propagate_to_all_callers():
+    async def failing_embed(texts, **kwargs):
+        raise RuntimeError("embedding backend down")
+
+    batcher = EmbeddingMicroBatcher(failing_embed, max_batch_size=8, max_wait_ms=5)
+    results = await asyncio.gather(
+        *[batcher([f"e-{i}"]) for i in range(3)], return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.offline
+async def test_deepcopy_with_pending_batch_shares_the_batcher():
+    calls = []
+    batcher = EmbeddingMicroBatcher(_make_embed(calls), max_batch_size=8, max_wait_ms=5)
+    func = EmbeddingFunc(embedding_dim=2, func=batcher)
+    pending = asyncio.ensure_future(batcher(["e-1"]))
+    await asyncio.sleep(0)
+    assert batcher._pending
+
+    # LightRAG passes asdict(self) to the pipeline while embeddings are in flight
+    assert copy.deepcopy(func).func is batcher
+    assert (await pending)[0, 0] == 1
+
+
+@pytest.mark.offline
+async def test_embedding_func_still_injects_max_token_size():
+    calls = []
+    batcher = EmbeddingMicroBatcher(_make_embed(calls), max_batch_size=8, max_wait_ms=1)
+    assert "max_token_size" in inspect.signature(batcher).parameters
+
+    func = EmbeddingFunc(embedding_dim=2, func=batcher, max_token_size=512)
+    result = await func(["e-7"])
+
+    assert result[0, 0] == 7
+    assert calls[0][1]["max_token_size"] == 512
+
+
+@pytest.mark.offline
+def test_lightrag_wraps_embedding_func(tmp_path):
+    from lightrag import LightRAG
+
+    class _CharTokenizer:
+        def encode(self, content: str) -> list[int]:
+            return [ord(ch) for ch in content]
+
+        def decode(self, tokens: list[int]) -> str:
+            return "".join(chr(t) for t in tokens)
+
+    tokenizer = Tokenizer("char", _CharTokenizer())
+
+    async def embed(texts, **kwargs):
+        return np.zeros((len(texts), 4))
+
+    async def llm(*args, **kwargs):
+        return ""
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        embedding_func=EmbeddingFunc(embedding_dim=4, func=embed),
+        llm_model_func=llm,
+        tokenizer=tokenizer,
+        embedding_batch_num=16,
+    )
+    assert isinstance(rag.embedding_func.func, EmbeddingMicroBatcher)
+    assert rag.embedding_func.func.max_batch_size == 16
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        embedding_func=EmbeddingFunc(embedding_dim=4, func=embed),
+        llm_model_func=llm,
+        tokenizer=tokenizer,
+        embedding_micro_batch_wait_ms=0,
+    )
+    assert not isinstance(rag.embedding_func.func, EmbeddingMicroBatcher)
@@ -0,0 +1,97 @@
+"""Tests for the concurrent map phase of entity/relation description summaries."""
+
+import asyncio
+
+import pytest
+
+from lightrag.utils import Tokenizer, TokenizerInterface
+
+
+class CountingTokenizer(TokenizerInterface):
+    """One token per word, counting encode calls per text."""
+
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+
+    def encode(self, content: str):
+        self.calls[content] = self.calls.get(content, 0) + 1
+        return content.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def _make_global_config(llm_func, tokenizer, max_async: int = 2) -> dict:
+    return {
+        "llm_model_func": llm_func,
+        "tokenizer": Tokenizer("counting", tokenizer),
+        "summary_context_size": 20,
+        "summary_max_tokens": 50,
+        "force_llm_summary_on_merge": 4,
+        "summary_length_recommended": 10,
+        "addon_params": {},
+        "llm_model_max_async": max_async,
+    }
+
+
+@pytest.mark.offline
+@pytest.mark.asyncio
+async def test_map_phase_runs_groups_concurrently_within_limit():
+    from lightrag.operate import _handle_entity_relation_summary
+
+    active = 0
+    max_active = 0
+
+    async def llm_func(prompt, **kwargs):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return "short summary"
+
+    tokenizer = CountingTokenizer()
+    # 12 descriptions of 8 tokens each: 6 groups of 2 in the first round
+    descriptions = [f"description {i} " + "word " * 6 for i in range(12)]
+    summary, llm_used = await _handle_entity_relation_summary(
+        "Entity",
+        "HUB",
+        descriptions,
+        "<SEP>",
+        _make_global_config(llm_func, tokenizer, max_async=3),
+    )
+
+    assert llm_used
+    assert summary == "short summary"
+    assert 1 < max_active <= 3
+    # Each input description is tokenized once by the map-reduce loop
+    assert all(tokenizer.calls[desc] == 1 for desc in descriptions)
+
+
+@pytest.mark.offline
+@pytest.mark.asyncio
+async def test_map_phase_failure_cancels_other_groups():
+    from lightrag.operate import _handle_entity_relation_summary
+
+    started = 0
+
+    async def llm_func(prompt, **kwargs):
+        nonlocal started
+        started += 1
+        if started == 1:
+            raise RuntimeError("LLM failure")
+        await asyncio.sleep(10)
+        return "never"
+
+    descriptions = [f"description {i} " + "word " * 6 for i in range(12)]
+    with pytest.raises(RuntimeError, match="LLM failure"):
+        await asyncio.wait_for(
+            _handle_entity_relation_summary(
+                "Entity",
+                "HUB",
+                descriptions,
+                "<SEP>",
+                _make_global_config(llm_func, CountingTokenizer()),
+            ),
+            timeout=5,
+        )
@@ -0,0 +1,184 @@
+"""Tests for concurrent retrieval and shared query embeddings in _perform_kg_search."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+
+STAGE_DELAY = 0.2
+
+
+async def _slow_node_data(*args, **kwargs):
+    await asyncio.sleep(STAGE_DELAY)
+    return [{"entity_name": "A"}], [{"src_tgt": ("A", "B")}]
+
+
+async def _slow_edge_data(*args, **kwargs):
+    await asyncio.sleep(STAGE_DELAY)
+    return [{"src_tgt": ("B", "C")}], [{"entity_name": "B"}]
+
+
+async def _slow_vector_context(query, chunks_vdb, query_param, query_embedding):
+    assert query_embedding is not None
+    await asyncio.sleep(STAGE_DELAY)
+    return [{"chunk_id": "chunk-1", "content": "text"}]
+
+
+async def _embed(texts, **kwargs):
+    return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def _text_chunks_db():
+    return SimpleNamespace(
+        global_config={"kg_chunk_pick_method": "WEIGHT"}, embedding_func=_embed
+    )
+
+
+@pytest.mark.offline
+@pytest.mark.asyncio
+async def test_mix_mode_stages_run_concurrently():
+    from lightrag.operate import _perform_kg_search
+
+    with (
+        patch("lightrag.operate._get_node_data", _slow_node_data),
+        patch("lightrag.operate._get_edge_data", _slow_edge_data),
+        patch("lightrag.operate._get_vector_context", _slow_vector_context),
+    ):
+        start = time.perf_counter()
+        result = await _perform_kg_search(
+            "query",
+            "ll",
+            "hl",
+            None,
+            None,
+            None,
+            _text_chunks_db(),
+            QueryParam(mode="mix"),
+            chunks_vdb=object(),
+        )
+        elapsed = time.perf_counter() - start
+
+    # Bounded by the slowest stage rather than the sum of all three
+    assert elapsed < STAGE_DELAY * 2
+    assert [e["entity_name"] for e in result["final_entities"]] == ["A", "B"]
+    assert len(result["final_relations"]) == 2
+    assert result["chunk_tracking"]["chunk-1"]["source"] == "C"
+
+    timings = result["stage_timings"]
+    for stage in ("local_search", "global_search", "vector_search", "kg_search"):
+        assert timings[stage] >= STAGE_DELAY * 1000 * 0.9
+    assert "query_embedding" in timings
+
+
+@pytest.mark.offline
+@pytest.mark.asyncio
+async def test_local_mode_skips_other_stages():
+    from lightrag.operate import _perform_kg_search
+
+    with (
+        patch("lightrag.operate._get_node_data", _slow_node_data),
+        patch("lightrag.operate._get_edge_data", _slow_edge_data),
+        patch("lightrag.operate._get_vector_context", _slow_vector_context),
+    ):
+        result = await _perform_kg_search(
+            "query",
+            "ll",
+            "hl",
+            None,
+            None,
+            None,
+            _text_chunks_db(),
+            QueryParam(mode="local"),
+        )
+
+    assert [e["entity_name"] for e in result["final_entities"]] == ["A"]
+    assert result["vector_chunks"] == []
+    assert "global_search" not in result["stage_timings"]
+    assert "vector_search" not in result["stage_timings"]
+
+
+@pytest.mark.offline
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mode, ll_keywords, hl_keywords, stage",
+    [("local", "", "hl", "global_search"), ("global", "ll", "", "local_search")],
+)
+async def test_single_mode_falls_back_to_other_keywords(
+    mode, ll_keywords, hl_keywords, stage
+):
+    from lightrag.operate import _perform_kg_search
+
+    with (
+        patch("lightrag.operate._get_node_data", _slow_node_data),
+        patch("lightrag.operate._get_edge_data", _slow_edge_data),
+    ):
+        result = await _perform_kg_search(
+            "query",
+            ll_keywords,
+            hl_keywords,
+            None,
+            None,
+            None,
+            _text_chunks_db(),
+            QueryParam(mode=mode),
+        )
+
+    assert result["final_entities"] and result["final_relations"]
+    searches = {"local_search", "global_search"} & set(result["stage_timings"])
+    assert searches == {stage}
+
+
+class _RecordingVDB:
+    """Vector storage stub that records the embeddings passed to query()"""
+
+    cosine_better_than_threshold = 0.2
+
+    def __init__(self):
+        self.query_embeddings = []
+
+    async def query(self, query, top_k, query_embedding=None):
+        self.query_embeddings.append(query_embedding)
+        return []
+
+
+@pytest.mark.offline
+@pytest.mark.asyncio
+async def test_query_and_keywords_embedded_in_one_call():
+    from lightrag.operate import _perform_kg_search
+
+    calls = []
+
+    async def embed(texts, **kwargs):
+        calls.append(list(texts))
+        return np.arange(len(texts) * 4, dtype=np.float32).reshape(len(texts), 4)
+
+    entities_vdb, relationships_vdb, chunks_vdb = (
+        _RecordingVDB(),
+        _RecordingVDB(),
+        _RecordingVDB(),
+    )
+    text_chunks_db = SimpleNamespace(
+        global_config={"kg_chunk_pick_method": "VECTOR"}, embedding_func=embed
+    )
+    result = await _perform_kg_search(
+        "query",
+        "ll",
+        "hl",
+        None,
+        entities_vdb,
+        relationships_vdb,
+        text_chunks_db,
+        QueryParam(mode="mix"),
+        chunks_vdb=chunks_vdb,
+    )
+
+    assert calls == [["query", "ll", "hl"]]
+    assert list(chunks_vdb.query_embeddings[0]) == [0, 1, 2, 3]
+    assert list(entities_vdb.query_embeddings[0]) == [4, 5, 6, 7]
+    assert list(relationships_vdb.query_embeddings[0]) == [8, 9, 10, 11]
+    assert list(result["query_embedding"]) == [0, 1, 2, 3]
@@ -0,0 +1,228 @@
+"""
+Test suite for the in-process LRU in front of BaseKVStorage
+
+This test verifies:
+1. Reads are filled from the backend once, including known-missing keys
+2. Writes go through to the backend and invalidate the cache, so fields the backend
+   adds on write (create_time/update_time) are seen by the next read
+3. Size and TTL bounds are honoured
+4. A read overlapping a write never caches the value the write replaced
+5. LightRAG wraps only the configured namespaces and saves the duplicate-check read
+   of the LLM cache
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pytest
+
+from lightrag.base import BaseKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.kv_cache import LRUCachedKVStorage
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+
+@dataclass
+class _CountingKV(BaseKVStorage):
+    data: dict[str, dict[str, Any]] = field(default_factory=dict)
+    reads: int = 0
+    read_gate: asyncio.Event | None = None
+
+    async def _read(self, key):
+        self.reads += 1
+        value = self.data.get(key)
+        if self.read_gate is not None:
+            await self.read_gate.wait()
+        return dict(value) if value else None
+
+    async def get_by_id(self, id):
+        return await self._read(id)
+
+    async def get_by_ids(self, ids):
+        return [await self._read(key) for key in ids]
+
+    async def filter_keys(self, keys):
+        self.reads += 1
+        return set(keys) - set(self.data)
+
+    async def upsert(self, data):
+        self.data.update({k: dict(v) for k, v in data.items()})
+
+    async def delete(self, ids):
+        for key in ids:
+            self.data.pop(key, None)
+
+    async def is_empty(self):
+        return not self.data
+
+    async def index_done_callback(self):
+        pass
+
+    async def drop(self):
+        self.data.clear()
+        return {"status": "success", "message": "data dropped"}
+
+
+def _make_kv(**kwargs):
+    backend = _CountingKV(
+        namespace="llm_response_cache",
+        workspace="",
+        global_config={},
+        embedding_func=None,
+    )
+    return backend, LRUCachedKVStorage(backend, **kwargs)
+
+
+@pytest.mark.offline
+async def test_read_through_write_through_and_invalidation():
+    backend, kv = _make_kv()
+    assert await kv.get_by_id("a") is None
+    assert await kv.get_by_id("a") is None
+    assert backend.reads == 1
+
+    await kv.upsert({"a": {"return": "x"}})
+    assert await kv.get_by_id("a") == {"return": "x"}
+    assert await kv.get_by_id("a") == {"return": "x"}
+    assert backend.reads == 2
+
+    # Callers own returned records
+    (await kv.get_by_id("a"))["return"] = "mutated"
+    assert await kv.get_by_id("a") == {"return": "x"}
+
+    assert await kv.get_by_ids(["a", "b", "a"]) == [
+        {"return": "x"},
+        None,
+        {"return": "x"},
+    ]
+    assert backend.reads == 3
+    assert await kv.filter_keys({"a", "b", "c"}) == {"b", "c"}
+    assert backend.reads == 4
+
+    await kv.delete(["a"])
+    assert await kv.get_by_id("a") is None
+    assert backend.reads == 5
+
+    await kv.upsert({"c": {"return": "y"}})
+    assert await kv.get_by_id("c") == {"return": "y"}
+    await kv.drop()
+    assert await kv.get_by_id("c") is None
+    assert backend.reads == 7
+
+    stats = kv.stats()
+    assert stats["hits"] == 6 and stats["misses"] == 6
+    # Unknown attributes come from the backend
+    assert kv.read_gate is None
+
+
+@pytest.mark.offline
+async def test_size_and_ttl_bounds():
+    backend, kv = _make_kv(max_entries=2)
+    await kv.upsert({key: {"v": key} for key in "abc"})
+    assert kv.stats()["size"] == 0
+    await kv.get_by_ids(list("abc"))
+    assert await kv.get_by_id("a") == {"v": "a"}
+    assert backend.reads == 4
+    assert kv.stats()["evictions"] == 2
+
+    backend, kv = _make_kv(ttl=0.05)
+    await kv.upsert({"a": {"v": 1}})
+    assert await kv.get_by_id("a") == {"v": 1}
+    backend.data["a"] = {"v": 2}  # written by another process
+    assert await kv.get_by_id("a") == {"v": 1}
+    await asyncio.sleep(0.06)
+    assert await kv.get_by_id("a") == {"v": 2}
+    assert kv.stats()["expirations"] == 1
+
+
+@pytest.mark.offline
+async def test_read_after_write_sees_backend_timestamps():
+    class _TimestampingKV(_CountingKV):
+        async def upsert(self, data):
+            # Like PGKVStorage, which sets the timestamps in SQL only
+            for key, value in data.items():
+                stored = self.data.get(key, {})
+                self.data[key] = {
+                    **value,
+                    "create_time": stored.get("create_time", 100),
+                    "update_time": 200,
+                }
+
+    backend = _TimestampingKV(
+        namespace="llm_response_cache",
+        workspace="",
+        global_config={},
+        embedding_func=None,
+    )
+    kv = LRUCachedKVStorage(backend)
+    await kv.upsert({"a": {"return": "x"}})
+    assert await kv.get_by_id("a") == {
+        "return": "x",
+        "create_time": 100,
+        "update_time": 200,
+    }
+    await kv.upsert({"a": {"return": "y"}})
+    assert (await kv.get_by_ids(["a"]))[0]["create_time"] == 100
+
+
+@pytest.mark.offline
+async def test_read_overlapping_write_is_not_cached():
+    backend, kv = _make_kv()
+    await backend.upsert({"a": {"v": "old"}})
+    backend.read_gate = asyncio.Event()
+    read = asyncio.create_task(kv.get_by_id("a"))
+    await asyncio.sleep(0)
+
+    await kv.upsert({"a": {"v": "new"}})
+    backend.read_gate.set()
+    assert await read == {"v": "old"}
+    assert await kv.get_by_id("a") == {"v": "new"}
+
+
+@pytest.mark.offline
+async def test_lightrag_wraps_configured_namespaces(tmp_path):
+    from lightrag import LightRAG
+
+    class _CharTokenizer:
+        def encode(self, content: str) -> list[int]:
+            return [ord(ch) for ch in content]
+
+        def decode(self, tokens: list[int]) -> str:
+            return "".join(chr(t) for t in tokens)
+
+    async def mock_llm(prompt, system_prompt=None, history_messages=[], **kwargs):
+        return (
+            "entity<|#|>Alpha<|#|>concept<|#|>Alpha is a thing.\n"
+            "entity<|#|>Beta<|#|>concept<|#|>Beta is another thing.\n"
+            "relation<|#|>Alpha<|#|>Beta<|#|>links<|#|>Alpha links to Beta.\n"
+            "<|COMPLETE|>"
+        )
+
+    async def mock_embed(texts: list[str]) -> np.ndarray:
+        return np.ones((len(texts), 8))
+
+    initialize_share_data()
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=mock_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=mock_embed),
+        tokenizer=Tokenizer("char", _CharTokenizer()),
+        entity_extract_max_gleaning=0,
+        kv_lru_cache_namespaces=["llm_response_cache", "text_chunks"],
+    )
+    await rag.initialize_storages()
+    try:
+        assert isinstance(rag.llm_response_cache, LRUCachedKVStorage)
+        assert isinstance(rag.text_chunks, LRUCachedKVStorage)
+        assert not isinstance(rag.full_docs, LRUCachedKVStorage)
+
+        await rag.ainsert("Alpha meets Beta.", ids="doc-1")
+        assert await rag.chunk_entity_relation_graph.has_node("Alpha")
+        stats = rag.get_kv_cache_stats()
+        assert set(stats) == {"llm_response_cache", "text_chunks"}
+        # save_to_cache's duplicate check is answered by the miss recorded in handle_cache
+        assert stats["llm_response_cache"]["hits"] >= 1
+    finally:
+        await rag.finalize_storages()
+        finalize_share_data()
@@ -0,0 +1,128 @@
+"""
+Test suite for the shared HTTP client cache of LLM and embedding bindings
+
+This test verifies:
+1. Requests with the same settings reuse one client, different settings do not
+2. The cache is bounded and evicted clients are closed once their leases are released
+3. close_cached_clients closes idle clients and defers busy ones
+4. OpenAI clients are cached per (base_url, api_key, azure settings, client_configs)
+"""
+
+import pytest
+
+from lightrag.llm import client_cache
+from lightrag.llm.client_cache import (
+    acquire_client,
+    close_cached_clients,
+    get_client_cache_stats,
+    make_client_key,
+)
+
+
+class _FakeClient:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+
+async def _close(client):
+    client.closed = True
+
+
+@pytest.fixture(autouse=True)
+async def clean_cache():
+    await close_cached_clients()
+    client_cache._client_cache.clear()
+    yield
+    await close_cached_clients()
+
+
+@pytest.mark.offline
+async def test_same_key_reuses_client():
+    lease1 = acquire_client(
+        make_client_key("fake", "key", "url"), lambda: _FakeClient("a"), _close
+    )
+    lease2 = acquire_client(
+        make_client_key("fake", "key", "url"), lambda: _FakeClient("b"), _close
+    )
+    lease3 = acquire_client(
+        make_client_key("fake", "other-key", "url"), lambda: _FakeClient("c"), _close
+    )
+    assert lease1.client is lease2.client
+    assert lease3.client is not lease1.client
+
+    # The API key never appears in clear text in the cache key
+    assert "other-key" not in repr(make_client_key("fake", "other-key", "url"))
+
+    await lease1.release()
+    await lease1.release()  # Releasing twice is a no-op
+    await lease2.release()
+    await lease3.release()
+    assert not lease1.client.closed
+
+
+@pytest.mark.offline
+async def test_bounded_cache_evicts_after_release(monkeypatch):
+    monkeypatch.setenv("HTTP_CLIENT_CACHE_SIZE", "1")
+
+    async with acquire_client(
+        make_client_key("fake", None, 1), lambda: _FakeClient(1), _close
+    ) as first:
+        second_lease = acquire_client(
+            make_client_key("fake", None, 2), lambda: _FakeClient(2), _close
+        )
+        # Evicted while still in use: stays open until released
+        assert not first.closed
+    assert first.closed
+    assert get_client_cache_stats()["size"] == 1
+    assert get_client_cache_stats()["evictions"] == 1
+
+    await second_lease.release()
+    assert not second_lease.client.closed
+
+
+@pytest.mark.offline
+async def test_close_cached_clients_defers_busy_clients():
+    idle = acquire_client(
+        make_client_key("fake", None, 1), lambda: _FakeClient(1), _close
+    )
+    await idle.release()
+    busy = acquire_client(
+        make_client_key("fake", None, 2), lambda: _FakeClient(2), _close
+    )
+
+    assert await close_cached_clients() == 2
+    assert idle.client.closed
+    assert not busy.client.closed
+    await busy.release()
+    assert busy.client.closed
+    assert get_client_cache_stats()["size"] == 0
+
+
+@pytest.mark.offline
+async def test_openai_clients_are_shared():
+    from lightrag.llm.openai import acquire_openai_async_client
+
+    lease1 = acquire_openai_async_client(api_key="sk-test", base_url="http://a/v1")
+    lease2 = acquire_openai_async_client(api_key="sk-test", base_url="http://a/v1")
+    lease3 = acquire_openai_async_client(
+        api_key="sk-test",
+        base_url="http://a/v1",
+        client_configs={"max_retries": 1},
+    )
+    lease4 = acquire_openai_async_client(
+        api_key="sk-test",
+        base_url="http://a/",
+        use_azure=True,
+        azure_deployment="gpt",
+        api_version="2024-08-01-preview",
+    )
+    assert lease1.client is lease2.client
+    assert lease3.client is not lease1.client
+    assert lease4.client is not lease1.client
+    assert lease3.client.max_retries == 1
+
+    for lease in (lease1, lease2, lease3, lease4):
+        await lease.release()
+    assert await close_cached_clients() == 3
+    assert lease1.client.is_closed()
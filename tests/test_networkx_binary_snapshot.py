@@ -0,0 +1,227 @@
+"""
+Test suite for NetworkXStorage binary snapshot format
+
+This test verifies:
+1. Node and edge attributes of all column types round-trip through the npz snapshot
+2. Small changes are appended to the delta log and replayed on load
+3. Other processes only apply the delta tail when the snapshot is unchanged
+4. The delta log is compacted into a new snapshot once it grows too large
+5. Existing graphml files are migrated in both directions, the source format is renamed
+   so it is never loaded as a stale graph, and graphml export stays available
+6. Benchmark of binary snapshot load against graphml load
+"""
+
+import os
+import time
+
+import networkx as nx
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+def _create_storage(working_dir: str) -> NetworkXStorage:
+    return NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+
+
+async def _initialized_storage(working_dir: str) -> NetworkXStorage:
+    storage = _create_storage(working_dir)
+    await storage.initialize()
+    return storage
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data(monkeypatch):
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "binary")
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.offline
+def test_snapshot_round_trip_types(tmp_path):
+    graph = nx.Graph()
+    graph.add_node("A", entity_id="A", description="café \U0001f600", rank=3)
+    graph.add_node("B", entity_id="B", score=0.5, flag=True, tags=["x", "y"])
+    graph.add_node("C")
+    graph.add_edge("A", "B", weight=1.5, keywords="k1,k2")
+    graph.add_edge("B", "C", weight=2)
+
+    file_name = str(tmp_path / "graph.npz")
+    NetworkXStorage.write_nx_graph_binary(graph, file_name)
+    loaded = NetworkXStorage.load_nx_graph_binary(file_name)
+
+    assert dict(loaded.nodes(data=True)) == dict(graph.nodes(data=True))
+    assert {(u, v): d for u, v, d in loaded.edges(data=True)} == {
+        (u, v): d for u, v, d in graph.edges(data=True)
+    }
+    assert isinstance(loaded.nodes["A"]["rank"], int)
+    assert isinstance(loaded.edges["B", "C"]["weight"], float)
+    assert NetworkXStorage.load_nx_graph_binary(str(tmp_path / "missing.npz")) is None
+
+
+@pytest.mark.offline
+async def test_delta_log_append_and_replay(tmp_path, monkeypatch):
+    # Never compact so every save after the first snapshot goes to the delta log
+    monkeypatch.setenv("NETWORKX_DELTA_COMPACT_RATIO", "1000")
+    storage = await _initialized_storage(str(tmp_path))
+    await storage.upsert_node("A", {"entity_id": "A"})
+    await storage.upsert_node("B", {"entity_id": "B"})
+    await storage.upsert_edge("A", "B", {"weight": "1.0"})
+    assert await storage.index_done_callback()
+    assert os.path.exists(storage._binary_file)
+    assert not os.path.exists(storage._delta_file)
+
+    await storage.upsert_node("C", {"entity_id": "C"})
+    await storage.upsert_edge("B", "C", {"weight": "2.0"})
+    await storage.remove_edges([("A", "B")])
+    await storage.delete_node("A")
+    assert await storage.index_done_callback()
+    with open(storage._delta_file, encoding="utf-8") as f:
+        assert len(f.readlines()) == 4
+
+    # Torn record at the tail of the log is ignored
+    with open(storage._delta_file, "a", encoding="utf-8") as f:
+        f.write('["n", "D", {"entity')
+
+    finalize_share_data()
+    initialize_share_data()
+    reloaded = await _initialized_storage(str(tmp_path))
+    assert await reloaded.has_node("A") is False
+    assert await reloaded.has_node("D") is False
+    assert await reloaded.has_edge("B", "C")
+    assert not await reloaded.has_edge("A", "B")
+
+
+@pytest.mark.offline
+async def test_reload_applies_only_delta_tail(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_DELTA_COMPACT_RATIO", "1000")
+    storage = await _initialized_storage(str(tmp_path))
+    await storage.upsert_node("A", {"entity_id": "A"})
+    await storage.index_done_callback()
+
+    other = await _initialized_storage(str(tmp_path))
+    assert await other.has_node("A")
+
+    await storage.upsert_node("B", {"entity_id": "B"})
+    await storage.index_done_callback()
+    assert other.storage_updated.value
+
+    loads = 0
+    original_load = NetworkXStorage.load_nx_graph_binary
+
+    def counting_load(file_name):
+        nonlocal loads
+        loads += 1
+        return original_load(file_name)
+
+    monkeypatch.setattr(
+        NetworkXStorage, "load_nx_graph_binary", staticmethod(counting_load)
+    )
+    assert await other.has_node("B")
+    assert loads == 0
+
+    # Nothing changed since the last save: no write and no flags for other workers
+    assert await storage.index_done_callback()
+    assert not other.storage_updated.value
+
+
+@pytest.mark.offline
+async def test_delta_compaction(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_DELTA_COMPACT_RATIO", "0.01")
+    storage = await _initialized_storage(str(tmp_path))
+    await storage.upsert_node("A", {"entity_id": "A"})
+    await storage.index_done_callback()
+
+    await storage.upsert_node("B", {"entity_id": "B", "description": "x" * 1000})
+    await storage.index_done_callback()
+    assert os.path.exists(storage._delta_file)
+
+    await storage.upsert_node("C", {"entity_id": "C"})
+    await storage.index_done_callback()
+    assert not os.path.exists(storage._delta_file)
+
+    loaded = NetworkXStorage.load_nx_graph_binary(storage._binary_file)
+    assert set(loaded.nodes) == {"A", "B", "C"}
+
+
+@pytest.mark.offline
+async def test_graphml_migration_and_export(tmp_path, monkeypatch):
+    graph = nx.Graph()
+    graph.add_node("A", entity_id="A")
+    graph.add_node("B", entity_id="B")
+    graph.add_edge("A", "B", weight=1.0)
+    NetworkXStorage.write_nx_graph(
+        graph, str(tmp_path / "graph_chunk_entity_relation.graphml")
+    )
+
+    storage = await _initialized_storage(str(tmp_path))
+    assert await storage.has_edge("A", "B")
+    assert await storage.index_done_callback()
+    assert os.path.exists(storage._binary_file)
+    assert not os.path.exists(storage._graphml_xml_file)
+    assert os.path.exists(storage._graphml_xml_file + ".migrated")
+
+    # Switching back to graphml reads the binary snapshot, not the pre-migration graph
+    await storage.upsert_node("C", {"entity_id": "C"})
+    assert await storage.index_done_callback()
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "graphml")
+    graphml_storage = await _initialized_storage(str(tmp_path))
+    assert await graphml_storage.has_node("C")
+    assert await graphml_storage.index_done_callback()
+    assert set(nx.read_graphml(storage._graphml_xml_file).nodes) == {"A", "B", "C"}
+    assert not os.path.exists(storage._binary_file)
+    assert not os.path.exists(storage._delta_file)
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "binary")
+
+    export_file = await storage.export_graphml(str(tmp_path / "export.graphml"))
+    exported = nx.read_graphml(export_file)
+    assert set(exported.nodes) == {"A", "B", "C"}
+
+    assert (await storage.drop())["status"] == "success"
+    assert not os.path.exists(storage._binary_file)
+    assert not os.path.exists(storage._graphml_xml_file)
+    assert not os.path.exists(storage._graphml_xml_file + ".migrated")
+    assert await storage.get_all_nodes() == []
+
+
+@pytest.mark.offline
+def test_load_benchmark_against_graphml(tmp_path, stress_test_mode):
+    num_nodes = 50000 if stress_test_mode else 5000
+    graph = nx.Graph()
+    for i in range(num_nodes):
+        graph.add_node(
+            f"node{i}",
+            entity_id=f"node{i}",
+            entity_type="concept",
+            description=f"description of node {i}",
+            source_id=f"chunk-{i}",
+        )
+    for i in range(num_nodes - 1):
+        graph.add_edge(f"node{i}", f"node{i + 1}", weight=1.0, description=f"edge {i}")
+
+    graphml_file = str(tmp_path / "graph.graphml")
+    binary_file = str(tmp_path / "graph.npz")
+    NetworkXStorage.write_nx_graph(graph, graphml_file)
+    NetworkXStorage.write_nx_graph_binary(graph, binary_file)
+
+    start = time.perf_counter()
+    NetworkXStorage.load_nx_graph(graphml_file)
+    graphml_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = NetworkXStorage.load_nx_graph_binary(binary_file)
+    binary_time = time.perf_counter() - start
+
+    assert loaded.number_of_edges() == graph.number_of_edges()
+    print(
+        f"\nNetworkX load benchmark ({num_nodes} nodes): "
+        f"graphml {graphml_time * 1000:.1f} ms, binary {binary_time * 1000:.1f} ms, "
+        f"speedup {graphml_time / max(binary_time, 1e-9):.1f}x"
+    )
@@ -0,0 +1,225 @@
+"""
+Test suite for NumpyVectorDBStorage
+
+This test verifies:
+1. Upserted vectors are ranked by cosine similarity and filtered by threshold, with
+   scoring done outside the cross-process storage lock
+2. index_done_callback persists a matrix file that is memory-mapped on reload
+3. Deletions (by id, entity and entity relation) survive persistence
+4. Other processes re-map the storage when their update flag is set
+5. Dimension mismatches between stored matrix and embedding function are rejected
+6. An interrupted save keeps the previous matrix/metadata pair, and an inconsistent pair
+   raises instead of loading an empty storage
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from lightrag.kg.numpy_vector_db_impl import NumpyVectorDBStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc, compute_mdhash_id
+
+# Deterministic embeddings: each text maps to a fixed direction
+VECTORS = {
+    "apple": [1.0, 0.0, 0.0, 0.0],
+    "apricot": [0.9, 0.1, 0.0, 0.0],
+    "banana": [0.0, 1.0, 0.0, 0.0],
+    "cherry": [0.0, 0.0, 1.0, 0.0],
+}
+
+
+async def _mock_embed(texts: list[str], **kwargs) -> np.ndarray:
+    return np.array([VECTORS[t] for t in texts], dtype=np.float32)
+
+
+def _create_storage(working_dir: str, dim: int = 4, namespace: str = "chunks"):
+    return NumpyVectorDBStorage(
+        namespace=namespace,
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 2,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=dim, func=_mock_embed),
+        meta_fields={"content", "src_id", "tgt_id"},
+    )
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _populated_storage(working_dir: str) -> NumpyVectorDBStorage:
+    storage = _create_storage(working_dir)
+    await storage.initialize()
+    await storage.upsert({text: {"content": text} for text in VECTORS})
+    return storage
+
+
+@pytest.mark.offline
+async def test_query_ranking_and_threshold(tmp_path):
+    storage = await _populated_storage(str(tmp_path))
+
+    results = await storage.query("apple", top_k=3)
+    assert [r["id"] for r in results] == ["apple", "apricot"]
+    assert results[0]["distance"] == pytest.approx(1.0)
+    assert results[0]["content"] == "apple"
+
+    results = await storage.query("", top_k=1, query_embedding=[0.0, 1.0, 0.0, 0.0])
+    assert [r["id"] for r in results] == ["banana"]
+
+
+@pytest.mark.offline
+async def test_query_scores_outside_the_storage_lock(tmp_path):
+    storage = await _populated_storage(str(tmp_path))
+    lock_held = []
+
+    class _TrackingLock:
+        async def __aenter__(self):
+            lock_held.append(True)
+
+        async def __aexit__(self, *exc):
+            lock_held.pop()
+
+    class _CheckedMatrix(np.ndarray):
+        def __matmul__(self, other):
+            assert not lock_held, "matrix scored while holding the storage lock"
+            return np.asarray(self) @ other
+
+    storage._storage_lock = _TrackingLock()
+    storage._matrix = storage._matrix.view(_CheckedMatrix)
+    results = await storage.query("apple", top_k=3)
+    assert [r["id"] for r in results] == ["apple", "apricot"]
+
+
+@pytest.mark.offline
+async def test_persist_and_mmap_reload(tmp_path):
+    storage = await _populated_storage(str(tmp_path))
+    await storage.delete(["cherry"])
+    assert await storage.index_done_callback()
+
+    reloaded = _create_storage(str(tmp_path))
+    await reloaded.initialize()
+    assert isinstance(reloaded._matrix, np.memmap)
+    assert await reloaded.get_by_id("cherry") is None
+    assert (await reloaded.get_by_id("banana"))["content"] == "banana"
+
+    vectors = await reloaded.get_vectors_by_ids(["apple", "missing"])
+    assert list(vectors) == ["apple"]
+    assert vectors["apple"] == pytest.approx([1.0, 0.0, 0.0, 0.0])
+
+    ids, matrix = await reloaded.get_vectors_array_by_ids(
+        ["banana", "missing", "apple"]
+    )
+    assert ids == ["banana", "apple"]
+    assert matrix.dtype == np.float32 and not isinstance(matrix, np.memmap)
+    assert matrix == pytest.approx(np.array([VECTORS["banana"], VECTORS["apple"]]))
+
+    # Updating a mapped row must not write through to the file
+    await reloaded.upsert({"apple": {"content": "banana"}})
+    assert (await reloaded.query("banana", top_k=2))[0]["content"] == "banana"
+    assert np.load(reloaded._matrix_file)[0] == pytest.approx([1.0, 0.0, 0.0, 0.0])
+
+
+@pytest.mark.offline
+async def test_delete_entity_and_relations(tmp_path):
+    storage = _create_storage(str(tmp_path), namespace="relationships")
+    await storage.initialize()
+    entity_id = compute_mdhash_id("apple", prefix="ent-")
+    await storage.upsert(
+        {
+            entity_id: {"content": "apple"},
+            "rel-1": {"content": "banana", "src_id": "A", "tgt_id": "B"},
+            "rel-2": {"content": "cherry", "src_id": "C", "tgt_id": "A"},
+        }
+    )
+
+    await storage.delete_entity("apple")
+    await storage.delete_entity_relation("A")
+    assert await storage.get_by_ids([entity_id, "rel-1", "rel-2"]) == [
+        None,
+        None,
+        None,
+    ]
+    assert await storage.query("banana", top_k=5) == []
+
+
+@pytest.mark.offline
+async def test_reload_on_update_flag(tmp_path):
+    storage = await _populated_storage(str(tmp_path))
+    await storage.index_done_callback()
+
+    other = _create_storage(str(tmp_path))
+    await other.initialize()
+    assert await other.get_by_id("apple") is not None
+
+    await storage.delete(["apple"])
+    await storage.index_done_callback()
+    assert other.storage_updated.value
+    assert await other.get_by_id("apple") is None
+    assert not other.storage_updated.value
+
+    # Nothing changed since the last save: no rewrite and no flags for other workers
+    assert await storage.index_done_callback()
+    assert not other.storage_updated.value
+
+
+@pytest.mark.offline
+async def test_dimension_mismatch(tmp_path):
+    storage = await _populated_storage(str(tmp_path))
+    await storage.index_done_callback()
+
+    with pytest.raises(ValueError, match="Dimension mismatch"):
+        _create_storage(str(tmp_path), dim=8)
+
+
+@pytest.mark.offline
+async def test_interrupted_save_keeps_previous_generation(tmp_path):
+    storage = await _populated_storage(str(tmp_path))
+    assert await storage.index_done_callback()
+    committed_file = storage._matrix_file
+
+    # Crash after writing the next matrix file but before the sidecar was replaced
+    np.save(storage._matrix_path(storage._generation + 1), np.zeros((1, 4)))
+    reloaded = _create_storage(str(tmp_path))
+    await reloaded.initialize()
+    assert reloaded._matrix_file == committed_file
+    assert len(await reloaded.get_by_ids(list(VECTORS))) == len(VECTORS)
+
+    # The next save supersedes the uncommitted file and removes the old generation
+    await reloaded.delete(["cherry"])
+    assert await reloaded.index_done_callback()
+    assert [os.path.basename(f) for f in reloaded._matrix_files()] == [
+        os.path.basename(reloaded._matrix_file)
+    ]
+    assert np.load(reloaded._matrix_file).shape == (3, 4)
+
+    with open(reloaded._meta_file, encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["ids"].append("extra")
+    meta["data"].append({"__id__": "extra"})
+    with open(reloaded._meta_file, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    with pytest.raises(ValueError, match="out of sync"):
+        _create_storage(str(tmp_path))
+
+
+@pytest.mark.offline
+async def test_drop(tmp_path):
+    storage = await _populated_storage(str(tmp_path))
+    await storage.index_done_callback()
+
+    assert (await storage.drop())["status"] == "success"
+    assert await storage.query("apple", top_k=3) == []
+    assert storage._matrix_files() == []
+
+    reloaded = _create_storage(str(tmp_path))
+    await reloaded.initialize()
+    assert await reloaded.get_by_id("apple") is None
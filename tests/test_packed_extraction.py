@@ -0,0 +1,166 @@
+"""
+Test suite for packed entity extraction
+
+This test verifies:
+1. Packed responses are split per input text, tolerating stray completion markers and
+   unknown ids
+2. Small chunks of a document are extracted with one LLM call, yet every chunk gets its
+   own entities, llm_cache_list entry and per-chunk cache record
+3. Re-ingesting the same content is served from the per-chunk cache
+4. A chunk missing from the packed response is extracted on its own, and LLM calls
+   (cache misses) are counted once per call actually made
+"""
+
+import asyncio
+import re
+
+import numpy as np
+import pytest
+
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.metrics import pipeline_metrics
+from lightrag.operate import _split_packed_extraction_result
+from lightrag.utils import EmbeddingFunc, Tokenizer, statistic_data
+
+DOCUMENT = "Alpha meets Beta.\n\nGamma meets Delta.\n\nEpsilon meets Zeta."
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+def _extraction_lines(content: str) -> str:
+    source, _, target = content.strip().rstrip(".").split(" ")
+    return (
+        f"entity<|#|>{source}<|#|>concept<|#|>{source} is a thing.\n"
+        f"entity<|#|>{target}<|#|>concept<|#|>{target} is a thing.\n"
+        f"relation<|#|>{source}<|#|>{target}<|#|>meets<|#|>{source} meets {target}.\n"
+    )
+
+
+class _MockLLM:
+    def __init__(self, skip_text_ids=()):
+        self.skip_text_ids = set(skip_text_ids)
+        self.packed_calls = 0
+        self.single_calls = 0
+
+    async def __call__(self, prompt, system_prompt=None, history_messages=[], **kwargs):
+        await asyncio.sleep(0)
+        texts = re.findall(r'<Input Text id="(\d+)">\n```\n(.*?)\n```', prompt, re.S)
+        if texts:
+            self.packed_calls += 1
+            return (
+                "".join(
+                    f"text<|#|>{text_id}\n{_extraction_lines(content)}"
+                    for text_id, content in texts
+                    if int(text_id) not in self.skip_text_ids
+                )
+                + "<|COMPLETE|>"
+            )
+        self.single_calls += 1
+        content = re.search(r"<Input Text>\n```\n(.*?)\n```", prompt, re.S).group(1)
+        return _extraction_lines(content) + "<|COMPLETE|>"
+
+
+async def _mock_embed(texts: list[str]) -> np.ndarray:
+    await asyncio.sleep(0)
+    return np.ones((len(texts), 8))
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _make_rag(tmp_path, llm):
+    from lightrag import LightRAG
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=_mock_embed),
+        tokenizer=Tokenizer("char", _CharTokenizer()),
+        entity_extract_max_gleaning=0,
+        entity_extract_pack_max_tokens=1000,
+    )
+    await rag.initialize_storages()
+    return rag
+
+
+async def _insert(rag):
+    await rag.ainsert(
+        DOCUMENT, ids="doc-1", split_by_character="\n\n", split_by_character_only=True
+    )
+
+
+@pytest.mark.offline
+def test_split_packed_extraction_result():
+    result = (
+        "Here you go\n"
+        "text<|#|>1\nentity<|#|>A<|#|>concept<|#|>A.\n"
+        " TEXT <|#|> 2 \nentity<|#|>B<|#|>concept<|#|>B.<|COMPLETE|>\n"
+        "text<|#|>7\nentity<|#|>C<|#|>concept<|#|>C.\n"
+        "<|COMPLETE|>"
+    )
+    sections = _split_packed_extraction_result(result, 2, "<|#|>", "<|COMPLETE|>")
+    assert sections == {
+        1: "entity<|#|>A<|#|>concept<|#|>A.\n<|COMPLETE|>",
+        2: "entity<|#|>B<|#|>concept<|#|>B.\n<|COMPLETE|>",
+    }
+
+
+@pytest.mark.offline
+async def test_small_chunks_share_one_extraction_call(tmp_path):
+    llm = _MockLLM()
+    rag = await _make_rag(tmp_path, llm)
+    try:
+        await _insert(rag)
+        assert llm.packed_calls == 1
+        assert llm.single_calls == 0
+
+        chunk_ids = (await rag.doc_status.get_by_id("doc-1"))["chunks_list"]
+        assert len(chunk_ids) == 3
+        for chunk in await rag.text_chunks.get_by_ids(chunk_ids):
+            source, _, target = chunk["content"].rstrip(".").split(" ")
+            for name in (source, target):
+                node = await rag.chunk_entity_relation_graph.get_node(name)
+                assert node["source_id"] == chunk["_id"]
+
+            # The chunk's cache record holds only its own extraction result
+            (cache_key,) = chunk["llm_cache_list"]
+            cached = await rag.llm_response_cache.get_by_id(cache_key)
+            assert cached["chunk_id"] == chunk["_id"]
+            assert cached["return"] == _extraction_lines(chunk["content"]) + (
+                "<|COMPLETE|>"
+            )
+
+        await rag.adelete_by_doc_id("doc-1")
+        await _insert(rag)
+        assert llm.packed_calls == 1 and llm.single_calls == 0
+        assert await rag.chunk_entity_relation_graph.has_node("Zeta")
+    finally:
+        await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_missing_section_falls_back_to_single_extraction(tmp_path):
+    llm = _MockLLM(skip_text_ids={2})
+    rag = await _make_rag(tmp_path, llm)
+    try:
+        pipeline_metrics.reset()
+        llm_calls = statistic_data["llm_call"]
+        await _insert(rag)
+        assert llm.packed_calls == 1
+        assert llm.single_calls == 1
+        assert statistic_data["llm_call"] - llm_calls == 2
+        assert pipeline_metrics.snapshot()["llm_cache"]["extract"]["miss"] == 2
+        for name in ("Alpha", "Delta", "Zeta"):
+            assert await rag.chunk_entity_relation_graph.has_node(name)
+    finally:
+        await rag.finalize_storages()
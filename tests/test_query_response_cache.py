@@ -0,0 +1,201 @@
+"""
+Test suite for the query response cache
+
+This test verifies:
+1. Repeated queries are answered before keyword extraction or any retrieval runs
+2. Inserts and graph edits bump the workspace data version and invalidate results
+3. Different QueryParam fields, streaming and traced queries never share an entry
+4. Callers cannot corrupt cached results by mutating what they get back
+"""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from lightrag import QueryParam
+from lightrag.kg.shared_storage import (
+    bump_data_version,
+    finalize_share_data,
+    get_data_version,
+    initialize_share_data,
+)
+from lightrag.query_cache import QueryResponseCache, query_cache_key
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+QUESTION = "Which things does Alpha link to?"
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+class _Counters:
+    llm = 0
+    embed = 0
+
+
+async def _mock_llm(prompt, system_prompt=None, history_messages=[], **kwargs) -> str:
+    await asyncio.sleep(0)
+    _Counters.llm += 1
+    text = f"{system_prompt or ''}\n{prompt}"
+    if "high_level_keywords" in text:
+        return json.dumps(
+            {"high_level_keywords": ["links"], "low_level_keywords": ["Alpha"]}
+        )
+    if "---User Query---" in text or "Which things" in text:
+        return f"Answer {_Counters.llm}"
+    names = ["Alpha", "Beta"] if "Alpha" in prompt else ["Gamma", "Delta"]
+    return (
+        f"entity<|#|>{names[0]}<|#|>concept<|#|>{names[0]} is a thing.\n"
+        f"entity<|#|>{names[1]}<|#|>concept<|#|>{names[1]} is another thing.\n"
+        f"relation<|#|>{names[0]}<|#|>{names[1]}<|#|>links<|#|>{names[0]} links to {names[1]}.\n"
+        "<|COMPLETE|>"
+    )
+
+
+async def _mock_embed(texts: list[str]) -> np.ndarray:
+    await asyncio.sleep(0)
+    _Counters.embed += 1
+    return np.ones((len(texts), 8))
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.fixture
+async def rag(tmp_path):
+    from lightrag import LightRAG
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=_mock_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=_mock_embed),
+        tokenizer=Tokenizer("char", _CharTokenizer()),
+        enable_llm_cache=False,
+        entity_extract_max_gleaning=0,
+        enable_query_response_cache=True,
+    )
+    await rag.initialize_storages()
+    await rag.ainsert("Alpha meets Beta.", ids="doc-1")
+    yield rag
+    await rag.finalize_storages()
+
+
+def _counts():
+    return _Counters.llm, _Counters.embed
+
+
+@pytest.mark.offline
+async def test_data_version_changes_on_bump():
+    first = await get_data_version("ws")
+    assert await get_data_version("ws") == first
+    await bump_data_version("ws")
+    second = await get_data_version("ws")
+    assert second != first and second.split(":")[0] == first.split(":")[0]
+    assert await get_data_version("other") != second
+
+
+@pytest.mark.offline
+async def test_graph_updates_bump_the_lightrag_workspace():
+    from types import SimpleNamespace
+
+    from lightrag.utils_graph import _persist_graph_updates
+
+    async def index_done_callback():
+        return True
+
+    # Like PG storages, which replace their workspace with PG_WORKSPACE or "default"
+    storage = SimpleNamespace(
+        workspace="default",
+        global_config={"workspace": "ws"},
+        index_done_callback=index_done_callback,
+    )
+    first, other = await get_data_version("ws"), await get_data_version("default")
+    await _persist_graph_updates(entities_vdb=storage)
+    assert await get_data_version("ws") != first
+    assert await get_data_version("default") == other
+
+
+@pytest.mark.offline
+def test_cache_key_covers_result_shaping_fields():
+    base = query_cache_key("llm", QUESTION, QueryParam(mode="mix"), "v1")
+    assert base == query_cache_key("llm", f" {QUESTION} ", QueryParam(), "v1")
+    assert base != query_cache_key("llm", QUESTION, QueryParam(top_k=3), "v1")
+    assert base != query_cache_key("llm", QUESTION, QueryParam(), "v2")
+    assert base != query_cache_key("data", QUESTION, QueryParam(), "v1")
+    assert base != query_cache_key("llm", QUESTION, QueryParam(), "v1", "Be brief.")
+    assert base != query_cache_key(
+        "llm",
+        QUESTION,
+        QueryParam(conversation_history=[{"role": "user", "content": "hi"}]),
+        "v1",
+    )
+    assert query_cache_key("llm", QUESTION, QueryParam(stream=True), "v1") is None
+    assert query_cache_key("llm", QUESTION, QueryParam(trace=True), "v1") is None
+    assert query_cache_key("llm", QUESTION, QueryParam(mode="bypass"), "v1") is None
+
+    cache = QueryResponseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"key": key})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"key": "c"}
+    assert cache.stats()["size"] == 2
+
+
+@pytest.mark.offline
+async def test_repeated_query_skips_retrieval(rag):
+    first = await rag.aquery_llm(QUESTION, QueryParam(mode="mix"))
+    before = _counts()
+    second = await rag.aquery_llm(QUESTION, QueryParam(mode="mix"))
+    assert _counts() == before
+    assert second == first
+    assert second["llm_response"]["content"] == first["llm_response"]["content"]
+
+    # Mutating a returned result leaves the cached entry intact
+    second["data"]["entities"].clear()
+    third = await rag.aquery_llm(QUESTION, QueryParam(mode="mix"))
+    assert third["data"]["entities"]
+
+    data = await rag.aquery_data(QUESTION, QueryParam(mode="local"))
+    before = _counts()
+    assert await rag.aquery_data(QUESTION, QueryParam(mode="local")) == data
+    assert _counts() == before
+
+    # Other parameters are computed afresh
+    await rag.aquery_data(QUESTION, QueryParam(mode="local", top_k=5))
+    assert _counts() != before
+    stats = rag.get_query_cache_stats()
+    assert stats["hits"] == 3
+
+
+@pytest.mark.offline
+async def test_writes_invalidate_cached_results(rag):
+    data = await rag.aquery_data(QUESTION, QueryParam(mode="local"))
+    names = {e["entity_name"] for e in data["data"]["entities"]}
+    assert "Gamma" not in names
+
+    await rag.ainsert("Gamma meets Delta.", ids="doc-2")
+    before = _counts()
+    await rag.aquery_data(QUESTION, QueryParam(mode="local"))
+    assert _counts() != before
+
+    before = _counts()
+    await rag.aquery_data(QUESTION, QueryParam(mode="local"))
+    assert _counts() == before
+
+    await rag.aedit_entity("Alpha", {"description": "Alpha was edited."})
+    edited = await rag.aquery_data(QUESTION, QueryParam(mode="local"))
+    descriptions = {
+        e["entity_name"]: e["description"] for e in edited["data"]["entities"]
+    }
+    assert descriptions["Alpha"] == "Alpha was edited."
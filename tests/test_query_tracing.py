@@ -0,0 +1,148 @@
+"""
+Test suite for query-path tracing
+
+This test verifies:
+1. QueryParam(trace=True) returns spans for keyword extraction, vector queries, graph
+   batch calls, rerank, truncation and the LLM call in the result metadata
+2. Storage round trips are counted on the storage spans and rolled up to their parents
+3. Without tracing the metadata carries no trace and no spans are recorded
+"""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from lightrag import QueryParam
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.tracing import start_query_trace, trace_span, traced_storage_call
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+async def _mock_llm(prompt, system_prompt=None, history_messages=[], **kwargs) -> str:
+    await asyncio.sleep(0)
+    text = f"{system_prompt or ''}\n{prompt}"
+    if "high_level_keywords" in text:
+        return json.dumps(
+            {"high_level_keywords": ["links"], "low_level_keywords": ["Alpha"]}
+        )
+    if "---User Query---" in text or "Which things" in text:
+        return "Alpha links to Beta."
+    return (
+        "entity<|#|>Alpha<|#|>concept<|#|>Alpha is a thing.\n"
+        "entity<|#|>Beta<|#|>concept<|#|>Beta is another thing.\n"
+        "relation<|#|>Alpha<|#|>Beta<|#|>links<|#|>Alpha links to Beta.\n"
+        "<|COMPLETE|>"
+    )
+
+
+async def _mock_embed(texts: list[str]) -> np.ndarray:
+    await asyncio.sleep(0)
+    return np.ones((len(texts), 8))
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.fixture
+async def rag(tmp_path):
+    from lightrag import LightRAG
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=_mock_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=_mock_embed),
+        tokenizer=Tokenizer("char", _CharTokenizer()),
+    )
+    await rag.initialize_storages()
+    await rag.ainsert("Alpha meets Beta.", ids="doc-1")
+    yield rag
+    await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_nested_spans_count_round_trips():
+    async def storage_call():
+        await asyncio.sleep(0)
+        return "row"
+
+    with start_query_trace(True, "root") as trace:
+        with trace_span("stage"):
+            results = await asyncio.gather(
+                traced_storage_call("kv.get", storage_call()),
+                traced_storage_call("kv.get", storage_call()),
+            )
+    assert results == ["row", "row"]
+
+    data = trace.to_dict()
+    spans = {span["name"]: span for span in data["spans"]}
+    assert data["storage_round_trips"] == 2
+    assert spans["stage"]["attributes"]["lightrag.storage_round_trips"] == 2
+    assert spans["stage"]["parent_span_id"] == spans["root"]["span_id"]
+    assert spans["kv.get"]["parent_span_id"] == spans["stage"]["span_id"]
+    assert all(span["end_time_unix_nano"] for span in data["spans"])
+
+
+@pytest.mark.offline
+async def test_query_data_returns_trace(rag):
+    result = await rag.aquery_data(
+        "Which things does Alpha link to?", QueryParam(mode="mix", trace=True)
+    )
+
+    trace = result["metadata"]["trace"]
+    names = {span["name"] for span in trace["spans"]}
+    assert {
+        "lightrag.aquery_data",
+        "keyword_extraction",
+        "query_embedding",
+        "entities_vdb.query",
+        "relationships_vdb.query",
+        "chunks_vdb.query",
+        "graph.get_nodes_batch",
+        "graph.get_edges_batch",
+        "text_chunks.get_by_ids",
+        "rerank",
+        "truncation",
+    } <= names
+    storage_spans = [
+        span
+        for span in trace["spans"]
+        if span["attributes"]["lightrag.storage_round_trips"] == 1
+        and "." in span["name"]
+        and not span["name"].startswith("lightrag.")
+    ]
+    assert trace["storage_round_trips"] == len(storage_spans)
+    span_ids = {span["span_id"] for span in trace["spans"]}
+    assert all(
+        span["parent_span_id"] in span_ids
+        for span in trace["spans"]
+        if span["name"] != "lightrag.aquery_data"
+    )
+
+
+@pytest.mark.offline
+async def test_query_llm_traces_llm_call(rag):
+    result = await rag.aquery_llm(
+        "Which things does Alpha link to?", QueryParam(mode="local", trace=True)
+    )
+    names = [span["name"] for span in result["metadata"]["trace"]["spans"]]
+    assert names[0] == "lightrag.aquery_llm"
+    assert "llm" in names
+
+    untraced = await rag.aquery_data(
+        "Which things does Alpha link to?", QueryParam(mode="local")
+    )
+    assert "trace" not in untraced["metadata"]
@@ -0,0 +1,126 @@
+"""
+Test suite for RPM/TPM rate limiting in priority_limit_async_func_call
+
+This test verifies:
+1. The token bucket admits requests within budget and reports the wait otherwise
+2. Completion tokens charged after a call put the budget into debt
+3. A throttled queue still dispatches higher priority calls (queries) first
+4. LightRAG counts LLM and embedding tokens with its tokenizer
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import (
+    EmbeddingFunc,
+    Tokenizer,
+    TokenBucketRateLimiter,
+    priority_limit_async_func_call,
+)
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.mark.offline
+def test_token_bucket_budgets():
+    limiter = TokenBucketRateLimiter(requests_per_minute=2)
+    assert limiter.try_acquire(0) == 0
+    assert limiter.try_acquire(0) == 0
+    assert 29 < limiter.try_acquire(0) <= 30
+
+    limiter = TokenBucketRateLimiter(tokens_per_minute=100)
+    assert limiter.try_acquire(60) == 0
+    # 20 missing tokens at 100 tokens/min
+    assert 11.9 < limiter.try_acquire(60) <= 12
+
+    limiter.charge(50)
+    assert 5.9 < limiter.try_acquire(1) <= 6.6
+    state = limiter.snapshot()
+    assert state["requests"] == 1 and state["tokens"] == 110
+    assert state["token_budget"] < 0
+
+    # A prompt above the whole budget is admitted on a full bucket instead of starving
+    assert TokenBucketRateLimiter(tokens_per_minute=100).try_acquire(1000) == 0
+
+
+@pytest.mark.offline
+async def test_queries_preempt_throttled_ingestion():
+    order = []
+
+    async def provider(name, prompt):
+        order.append(name)
+        return ""
+
+    # 100 tokens/s, each call costs len(prompt) tokens
+    func = priority_limit_async_func_call(
+        1, tokens_per_minute=6000, token_counter=len, queue_name="test"
+    )(provider)
+    try:
+        # Drain the bucket so every following call has to wait for budget
+        await func("drain", "x" * 6000)
+        extraction = [
+            asyncio.create_task(func(f"extract-{i}", "x" * 5)) for i in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        await func("query", "x" * 5, _priority=5)
+        await asyncio.gather(*extraction)
+
+        assert order[:2] == ["drain", "query"]
+        state = func.concurrency_state()["rate_limit"]
+        assert state["tokens_per_minute"] == 6000
+        assert state["requests"] == 7
+        assert state["throttled_requests"] >= 5
+        assert state["throttled_seconds"] > 0.2
+    finally:
+        await func.shutdown()
+
+
+@pytest.mark.offline
+async def test_lightrag_counts_tokens_with_tokenizer(tmp_path):
+    from lightrag import LightRAG
+
+    async def mock_llm(prompt, system_prompt=None, history_messages=[], **kwargs):
+        return (
+            "entity<|#|>Alpha<|#|>concept<|#|>Alpha is a thing.\n"
+            "entity<|#|>Beta<|#|>concept<|#|>Beta is another thing.\n"
+            "relation<|#|>Alpha<|#|>Beta<|#|>links<|#|>Alpha links to Beta.\n"
+            "<|COMPLETE|>"
+        )
+
+    async def mock_embed(texts: list[str]) -> np.ndarray:
+        return np.ones((len(texts), 8))
+
+    initialize_share_data()
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=mock_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=8, func=mock_embed),
+        tokenizer=Tokenizer("char", _CharTokenizer()),
+        llm_tokens_per_minute=10**9,
+        embedding_requests_per_minute=10**6,
+    )
+    await rag.initialize_storages()
+    try:
+        await rag.ainsert("Alpha meets Beta.", ids="doc-1")
+        status = rag.get_concurrency_status()
+    finally:
+        await rag.finalize_storages()
+        finalize_share_data()
+
+    llm_state = status["llm"]["rate_limit"]
+    # Prompt and completion are counted in characters by the test tokenizer
+    assert llm_state["requests"] >= 1
+    assert llm_state["tokens"] > llm_state["requests"] * len("Alpha meets Beta.")
+    assert llm_state["requests_per_minute"] is None
+    embedding_state = status["embedding"]["rate_limit"]
+    assert embedding_state["requests"] >= 1
+    assert embedding_state["tokens_per_minute"] is None
@@ -0,0 +1,224 @@
+"""
+Test suite for the semantic query cache
+
+This test verifies:
+1. A rephrased query above the similarity threshold is answered from the cache without
+   keyword extraction, retrieval or generation
+2. Queries just below the threshold are counted as near misses and computed afresh
+3. Entries never cross query kinds, modes or data versions; stale entries are dropped
+4. The optional LLM check can veto a hit, and reported false hits remove the entry
+5. The cache holds at most max_entries queries, evicting the least recently used
+"""
+
+import asyncio
+import json
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from lightrag import QueryParam
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+QUESTION = "Which things does Alpha link to?"
+# Same words, different case and punctuation: similarity 1.0
+REPHRASED = "which things does alpha link to"
+# One of six words differs: similarity 6/7 (bag of words plus a bias dimension)
+NEAR_MISS = "What things does Alpha link to?"
+
+EMBEDDING_DIM = 256
+
+
+class _CharTokenizer:
+    def encode(self, content: str) -> list[int]:
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+class _MockLLM:
+    def __init__(self, same_question: bool = True):
+        self.same_question = same_question
+        self.calls = 0
+        self.checks = 0
+
+    async def __call__(self, prompt, system_prompt=None, history_messages=[], **kwargs):
+        await asyncio.sleep(0)
+        self.calls += 1
+        text = f"{system_prompt or ''}\n{prompt}"
+        if "Decide whether two user questions" in text:
+            self.checks += 1
+            return "Yes" if self.same_question else "No."
+        if "high_level_keywords" in text:
+            return json.dumps(
+                {"high_level_keywords": ["links"], "low_level_keywords": ["Alpha"]}
+            )
+        if "<Input Text>" not in text:
+            return f"Answer {self.calls}"
+        names = ["Alpha", "Beta"] if "Alpha" in prompt else ["Gamma", "Delta"]
+        return (
+            f"entity<|#|>{names[0]}<|#|>concept<|#|>{names[0]} is a thing.\n"
+            f"entity<|#|>{names[1]}<|#|>concept<|#|>{names[1]} is another thing.\n"
+            f"relation<|#|>{names[0]}<|#|>{names[1]}<|#|>links<|#|>{names[0]} links to {names[1]}.\n"
+            "<|COMPLETE|>"
+        )
+
+
+async def _mock_embed(texts: list[str]) -> np.ndarray:
+    """Bag of lowercased words plus a constant bias dimension"""
+    await asyncio.sleep(0)
+    vectors = np.zeros((len(texts), EMBEDDING_DIM))
+    for row, text in enumerate(texts):
+        vectors[row, 0] = 1.0
+        for word in re.findall(r"\w+", text.lower()):
+            vectors[row, 1 + zlib.crc32(word.encode()) % (EMBEDDING_DIM - 1)] += 1.0
+    return vectors
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _make_rag(tmp_path, llm, **cache_config):
+    from lightrag import LightRAG
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=llm,
+        embedding_func=EmbeddingFunc(embedding_dim=EMBEDDING_DIM, func=_mock_embed),
+        tokenizer=Tokenizer("char", _CharTokenizer()),
+        enable_llm_cache=False,
+        entity_extract_max_gleaning=0,
+        vector_db_storage_cls_kwargs={"cosine_better_than_threshold": 0.0},
+        embedding_cache_config={
+            "enabled": True,
+            "similarity_threshold": 0.9,
+            "use_llm_check": False,
+            **cache_config,
+        },
+    )
+    await rag.initialize_storages()
+    await rag.ainsert("Alpha meets Beta.", ids="doc-1")
+    return rag
+
+
+@pytest.mark.offline
+async def test_rephrased_query_is_served_from_cache(tmp_path):
+    llm = _MockLLM()
+    rag = await _make_rag(tmp_path, llm)
+    try:
+        first = await rag.aquery_llm(QUESTION, QueryParam(mode="mix"))
+        assert first["status"] == "success"
+        calls = llm.calls
+
+        second = await rag.aquery_llm(REPHRASED, QueryParam(mode="mix"))
+        assert llm.calls == calls
+        assert second["llm_response"] == first["llm_response"]
+        assert second["data"] == first["data"]
+        hit = second["metadata"]["semantic_cache"]
+        assert hit["cached_query"] == QUESTION
+        assert hit["similarity"] == pytest.approx(1.0)
+
+        near = await rag.aquery_llm(NEAR_MISS, QueryParam(mode="mix"))
+        assert llm.calls > calls
+        assert "semantic_cache" not in near["metadata"]
+
+        stats = rag.get_semantic_cache_stats()
+        assert stats["lookups"] == 3
+        assert stats["hits"] == 1
+        assert stats["near_misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+        assert stats["min_hit_similarity"] == pytest.approx(1.0)
+        assert stats["avg_hit_similarity"] == pytest.approx(1.0)
+        assert stats["size"] == 2
+        # Kept in process memory only
+        assert not list(tmp_path.glob("*query_cache*"))
+    finally:
+        await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_entries_are_scoped_to_kind_mode_and_data_version(tmp_path):
+    llm = _MockLLM()
+    rag = await _make_rag(tmp_path, llm)
+    try:
+        await rag.aquery_llm(QUESTION, QueryParam(mode="mix"))
+        data = await rag.aquery_data(REPHRASED, QueryParam(mode="mix"))
+        assert "semantic_cache" not in data["metadata"]
+        local = await rag.aquery_llm(REPHRASED, QueryParam(mode="local"))
+        assert "semantic_cache" not in local["metadata"]
+        assert rag.get_semantic_cache_stats()["hits"] == 0
+
+        cached = await rag.aquery_data(QUESTION, QueryParam(mode="mix"))
+        assert cached["metadata"]["semantic_cache"]["cached_query"] == REPHRASED
+
+        await rag.ainsert("Gamma meets Delta.", ids="doc-2")
+        fresh = await rag.aquery_data(QUESTION, QueryParam(mode="mix"))
+        assert "semantic_cache" not in fresh["metadata"]
+        # Entries of the previous data version were dropped on the way
+        assert rag.get_semantic_cache_stats()["size"] == 1
+    finally:
+        await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_llm_check_and_false_hit_reports(tmp_path):
+    llm = _MockLLM(same_question=False)
+    rag = await _make_rag(tmp_path, llm, use_llm_check=True)
+    try:
+        await rag.aquery_llm(QUESTION, QueryParam(mode="mix"))
+        rejected = await rag.aquery_llm(REPHRASED, QueryParam(mode="mix"))
+        assert llm.checks == 1
+        assert "semantic_cache" not in rejected["metadata"]
+        assert rag.get_semantic_cache_stats()["llm_check_rejections"] == 1
+
+        llm.same_question = True
+        hit = await rag.aquery_llm(QUESTION.upper(), QueryParam(mode="mix"))
+        entry_id = hit["metadata"]["semantic_cache"]["entry_id"]
+
+        await rag.areport_semantic_cache_false_hit(entry_id)
+        stats = rag.get_semantic_cache_stats()
+        assert stats["reported_false_hits"] == 1
+        assert stats["false_hit_rate"] == 1.0
+        assert stats["size"] == 1
+        again = await rag.aquery_llm(REPHRASED, QueryParam(mode="mix"))
+        assert again["metadata"]["semantic_cache"]["cached_query"] == REPHRASED
+
+        await rag.aclear_cache()
+        assert rag.get_semantic_cache_stats()["size"] == 0
+    finally:
+        await rag.finalize_storages()
+
+
+@pytest.mark.offline
+async def test_max_entries_evicts_least_recently_used(tmp_path):
+    llm = _MockLLM()
+    rag = await _make_rag(tmp_path, llm, max_entries=2)
+    try:
+        await rag.aquery_llm(QUESTION, QueryParam(mode="mix"))
+        await rag.aquery_llm("Alpha", QueryParam(mode="mix"))
+        # A hit refreshes QUESTION, so "Alpha" is the least recently used entry
+        hit = await rag.aquery_llm(REPHRASED, QueryParam(mode="mix"))
+        assert hit["metadata"]["semantic_cache"]["cached_query"] == QUESTION
+        await rag.aquery_llm("Beta", QueryParam(mode="mix"))
+
+        stats = rag.get_semantic_cache_stats()
+        assert stats["size"] == 2
+        assert stats["max_entries"] == 2
+        assert stats["evictions"] == 1
+        assert (
+            "semantic_cache"
+            in (await rag.aquery_llm(QUESTION, QueryParam(mode="mix")))["metadata"]
+        )
+        assert (
+            "semantic_cache"
+            not in (await rag.aquery_llm("Alpha", QueryParam(mode="mix")))["metadata"]
+        )
+    finally:
+        await rag.finalize_storages()
@@ -0,0 +1,110 @@
+"""Tests for the token count cache of Tokenizer."""
+
+import copy
+import pickle
+
+import pytest
+
+from lightrag.operate import chunking_by_token_size
+from lightrag.utils import Tokenizer, TokenizerInterface, truncate_list_by_token_size
+
+
+class CountingTokenizer(TokenizerInterface):
+    """One token per character, counting encode calls."""
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode(self, content: str):
+        self.encode_calls += 1
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+@pytest.mark.offline
+def test_count_tokens_memoizes_by_content():
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend, cache_size=10)
+
+    assert tokenizer.count_tokens("hello") == 5
+    assert tokenizer.count_tokens("hello") == 5
+    assert tokenizer.count_tokens("\ud800 lone surrogate") == 16
+    assert backend.encode_calls == 2
+    assert tokenizer.token_cache_stats() == {
+        "size": 2,
+        "max_size": 10,
+        "hits": 1,
+        "misses": 2,
+    }
+
+    # encode() also records the count of the encoded text
+    tokenizer.encode("world!")
+    assert tokenizer.count_tokens("world!") == 6
+    assert backend.encode_calls == 3
+
+
+@pytest.mark.offline
+def test_count_cache_is_bounded_lru():
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend, cache_size=2)
+
+    tokenizer.count_tokens("a")
+    tokenizer.count_tokens("bb")
+    tokenizer.count_tokens("a")  # "a" becomes most recently used
+    tokenizer.count_tokens("ccc")  # evicts "bb"
+    assert tokenizer.token_cache_stats()["size"] == 2
+
+    calls = backend.encode_calls
+    tokenizer.count_tokens("a")
+    assert backend.encode_calls == calls
+    tokenizer.count_tokens("bb")
+    assert backend.encode_calls == calls + 1
+
+
+@pytest.mark.offline
+def test_cache_disabled(monkeypatch):
+    monkeypatch.setenv("TOKEN_COUNT_CACHE_SIZE", "0")
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend)
+
+    tokenizer.count_tokens("abc")
+    tokenizer.count_tokens("abc")
+    assert backend.encode_calls == 2
+    assert tokenizer.token_cache_stats()["size"] == 0
+
+
+@pytest.mark.offline
+def test_chunking_and_truncation_reuse_counts():
+    backend = CountingTokenizer()
+    tokenizer = Tokenizer("counting", backend, cache_size=100)
+    content = "\n\n".join(f"paragraph {i}" for i in range(5))
+
+    chunks = chunking_by_token_size(
+        tokenizer, content, split_by_character="\n\n", chunk_token_size=50
+    )
+    assert [c["tokens"] for c in chunks] == [11] * 5
+    # Only the split paragraphs are tokenized, not the whole document as well
+    assert backend.encode_calls == 5
+
+    truncated = truncate_list_by_token_size(
+        [c["content"] for c in chunks],
+        key=lambda x: x,
+        max_token_size=30,
+        tokenizer=tokenizer,
+    )
+    assert len(truncated) == 2
+    assert backend.encode_calls == 5
+
+
+@pytest.mark.offline
+def test_copy_and_pickle():
+    tokenizer = Tokenizer("counting", CountingTokenizer(), cache_size=10)
+    tokenizer.count_tokens("abc")
+
+    assert copy.deepcopy(tokenizer) is tokenizer
+
+    restored = pickle.loads(pickle.dumps(tokenizer))
+    assert restored.count_tokens("abc") == 3
+    assert restored.token_cache_stats()["size"] == 1
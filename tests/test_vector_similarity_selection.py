@@ -0,0 +1,152 @@
+"""
+Test suite for batched vector similarity chunk selection
+
+This test verifies:
+1. cosine_similarity scores a whole matrix at once and matches the pairwise result
+2. top_k_indices returns the highest scores first and ranks nan last
+3. NanoVectorDBStorage returns stored vectors as one float32 matrix, and the default
+   BaseVectorStorage implementation stacks get_vectors_by_ids
+4. pick_by_vector_similarity selects the same chunks as a brute-force ranking and
+   still refuses to rank when chunk vectors are missing
+5. Backends are handed the candidate chunk IDs as an ordered, de-duplicated list
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.base import BaseVectorStorage
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import (
+    EmbeddingFunc,
+    cosine_similarity,
+    pick_by_vector_similarity,
+    top_k_indices,
+)
+
+DIM = 16
+RNG = np.random.default_rng(0)
+CHUNK_VECTORS = {f"chunk-{i:03d}": RNG.normal(size=DIM) for i in range(200)}
+
+
+async def _mock_embed(texts: list[str], **kwargs) -> np.ndarray:
+    return np.array([CHUNK_VECTORS[t] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.fixture
+async def chunks_vdb(tmp_path):
+    storage = NanoVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": str(tmp_path),
+            "embedding_batch_num": 64,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=DIM, func=_mock_embed),
+        meta_fields={"content"},
+    )
+    await storage.initialize()
+    await storage.upsert({cid: {"content": cid} for cid in CHUNK_VECTORS})
+    yield storage
+    await storage.finalize()
+
+
+@pytest.mark.offline
+def test_cosine_similarity_and_top_k():
+    query = RNG.normal(size=DIM)
+    matrix = np.stack(list(CHUNK_VECTORS.values()))
+    scores = cosine_similarity(query, matrix)
+    pairwise = [cosine_similarity(query, row) for row in matrix]
+    assert scores.shape == (len(matrix),)
+    assert scores == pytest.approx(pairwise)
+    assert np.isnan(cosine_similarity(query, np.zeros((1, DIM)))[0])
+
+    assert list(top_k_indices(scores, 5)) == list(np.argsort(-scores)[:5])
+    assert list(top_k_indices(scores, 500)) == list(np.argsort(-scores))
+    assert list(top_k_indices(np.array([0.1, np.nan, 0.9]), 3)) == [2, 0, 1]
+
+
+@pytest.mark.offline
+async def test_vectors_array_matches_vector_dict(chunks_vdb):
+    ids = ["chunk-007", "chunk-003", "missing", "chunk-007"]
+    found_ids, matrix = await chunks_vdb.get_vectors_array_by_ids(ids)
+    assert sorted(found_ids) == ["chunk-003", "chunk-007"]
+    assert matrix.dtype == np.float32 and matrix.shape == (2, DIM)
+
+    vectors = await chunks_vdb.get_vectors_by_ids(ids)
+    for chunk_id, row in zip(found_ids, matrix):
+        assert row == pytest.approx(vectors[chunk_id])
+
+    # Backends without an override fall back to stacking get_vectors_by_ids
+    default_ids, default_matrix = await BaseVectorStorage.get_vectors_array_by_ids(
+        chunks_vdb, ids
+    )
+    assert default_ids == ["chunk-007", "chunk-003"]
+    assert default_matrix == pytest.approx(np.stack([vectors[i] for i in default_ids]))
+
+
+@pytest.mark.offline
+async def test_backends_receive_an_ordered_id_list(chunks_vdb, monkeypatch):
+    received = []
+    get_vectors_by_ids = chunks_vdb.get_vectors_by_ids
+
+    async def recording_get_vectors_by_ids(ids):
+        received.append(ids)
+        return await get_vectors_by_ids(ids)
+
+    # Route through the base default, which hands the ids to get_vectors_by_ids
+    monkeypatch.setattr(
+        chunks_vdb,
+        "get_vectors_array_by_ids",
+        lambda ids: BaseVectorStorage.get_vectors_array_by_ids(chunks_vdb, ids),
+    )
+    monkeypatch.setattr(chunks_vdb, "get_vectors_by_ids", recording_get_vectors_by_ids)
+    entity_info = [
+        {"entity_name": "A", "sorted_chunks": ["chunk-002", "chunk-001"]},
+        {"entity_name": "B", "sorted_chunks": ["chunk-001", "chunk-000"]},
+    ]
+
+    await pick_by_vector_similarity(
+        "query", None, chunks_vdb, 2, entity_info, None, RNG.normal(size=DIM)
+    )
+    assert received == [["chunk-002", "chunk-001", "chunk-000"]]
+    assert type(received[0]) is list
+
+
+@pytest.mark.offline
+async def test_pick_by_vector_similarity_matches_brute_force(chunks_vdb):
+    query_embedding = RNG.normal(size=DIM)
+    chunk_ids = list(CHUNK_VECTORS)
+    entity_info = [
+        {"entity_name": "A", "sorted_chunks": chunk_ids[:120]},
+        {"entity_name": "B", "sorted_chunks": chunk_ids[80:]},
+    ]
+
+    selected = await pick_by_vector_similarity(
+        "query", None, chunks_vdb, 10, entity_info, None, query_embedding
+    )
+
+    # Stored vectors are float16, so rank against what the storage returns
+    vectors = await chunks_vdb.get_vectors_by_ids(chunk_ids)
+    expected = sorted(
+        chunk_ids,
+        key=lambda cid: cosine_similarity(query_embedding, vectors[cid]),
+        reverse=True,
+    )[:10]
+    assert selected == expected
+
+    entity_info.append({"entity_name": "C", "sorted_chunks": ["missing"]})
+    assert (
+        await pick_by_vector_similarity(
+            "query", None, chunks_vdb, 10, entity_info, None, query_embedding
+        )
+        == []
+    )